@@ -1,30 +1,17 @@
 import asyncio
-import os
 from dotenv import load_dotenv, find_dotenv
 
-from agents import Agent, AsyncOpenAI, OpenAIChatCompletionsModel, RunConfig, Runner, function_tool
+from agents import Agent, Runner, function_tool
+from agent_runtime import get_model, get_run_config
 
 # 0. Load environment variables
 load_dotenv(find_dotenv())
 
-# 1. Define the LLM Provider (Gemini via OpenAI-compatible API)
-external_client = AsyncOpenAI(
-    api_key=os.getenv("GEMINI_API_KEY"),
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
-
-# 2. Define the Model
-llm_model = OpenAIChatCompletionsModel(
-    model="gemini-2.5-flash",
-    openai_client=external_client
-)
+# 1. Shared Gemini model (pooled client, connects on first use)
+llm_model = get_model()
 
-# 3. Configure the Run settings
-run_config = RunConfig(
-    model=llm_model,
-    model_provider=external_client,
-    tracing_disabled=True
-)
+# 2. Configure the Run settings
+run_config = get_run_config()
 
 # 5. Create Agent
 agent = Agent(
@@ -1,7 +1,7 @@
-import os
 from dotenv import load_dotenv, find_dotenv
 
-from agents import Agent, AsyncOpenAI, OpenAIChatCompletionsModel, RunConfig, Runner, function_tool, set_tracing_disabled
+from agents import Agent, function_tool, set_tracing_disabled
+from agent_runtime import ToolCache, get_model, get_run_config, run_sync
 
 # 0. Load environment variables
 load_dotenv(find_dotenv())
@@ -9,31 +9,23 @@ load_dotenv(find_dotenv())
 # 🚫 Disable tracing for clean output (optional for beginners)
 set_tracing_disabled(disabled=True)
 
-# 1. Define the LLM Provider (Gemini via OpenAI-compatible API)
-external_client = AsyncOpenAI(
-    api_key=os.getenv("GEMINI_API_KEY"),
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
+# 1. Shared Gemini model (pooled client, connects on first use)
+llm_model = get_model()
 
-# 2. Define the Model
-llm_model = OpenAIChatCompletionsModel(
-    model="gemini-2.5-flash",
-    openai_client=external_client
-)
+# 2. Configure the Run settings
+run_config = get_run_config()
 
-# 3. Configure the Run settings
-run_config = RunConfig(
-    model=llm_model,
-    model_provider=external_client,
-    tracing_disabled=True
-)
+# 🗄️ Pure tools: same arguments → same answer, so results are memoized
+tool_cache = ToolCache()
 
 # 🛠️ 4) Define tools (functions wrapped for tool calling)
+@tool_cache.tool
 @function_tool
 def multiply(a: int, b: int) -> int:
     """🧮 Exact multiplication (use this instead of guessing math)."""
     return a * b
 
+@tool_cache.tool
 @function_tool
 def sum(a: int, b: int) -> int:
     """➕ Exact addition (use this instead of guessing math)."""
@@ -51,8 +43,9 @@ agent: Agent = Agent(
 )
 
 # 🧪 5) Run the agent with a prompt (tool calling expected)
+#    (run_sync keeps one background event loop, so later calls reuse the warm connection)
 prompt = "what is 19 + 23 * 2?"
-result = Runner.run_sync(agent, prompt,run_config=run_config)
+result = run_sync(agent, prompt,run_config=run_config)
 
 # 📤 Print the final result from the agent
 print("\n🤖 CALLING AGENT\n")
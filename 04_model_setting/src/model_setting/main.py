@@ -1,8 +1,8 @@
 import asyncio
-import os
 from dotenv import load_dotenv, find_dotenv
 
-from agents import Agent, AsyncOpenAI, ModelSettings, OpenAIChatCompletionsModel, RunConfig, Runner, function_tool, set_tracing_disabled
+from agents import Agent, ModelSettings, Runner, function_tool, set_tracing_disabled
+from agent_runtime import CachingModel, ResponseCache, ToolCache, get_model, get_run_config
 
 # 0. Load environment variables
 load_dotenv(find_dotenv())
@@ -10,26 +10,19 @@ load_dotenv(find_dotenv())
 # 🚫 Disable tracing for clean output (optional for beginners)
 set_tracing_disabled(disabled=True)
 
-# 1. Define the LLM Provider (Gemini via OpenAI-compatible API)
-external_client = AsyncOpenAI(
-    api_key=os.getenv("GEMINI_API_KEY"),
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
+# 1-2. Shared Gemini model (pooled client from ClientSettings, so GEMINI_BASE_URL applies)
+llm_model = get_model()
 
-# 2. Define the Model
-llm_model = OpenAIChatCompletionsModel(
-    model="gemini-2.5-flash",
-    openai_client=external_client
-)
+# 🗄️ Cache answers of low-temperature agents (agent_hot bypasses it)
+response_cache = ResponseCache(path="response_cache.sqlite3")
 
 # 3. Configure the Run settings
-run_config = RunConfig(
-    model=llm_model,
-    model_provider=external_client,
-    tracing_disabled=True
-)
+run_config = get_run_config(model=CachingModel(llm_model, response_cache))
+
+# 🛠️ Simple tool for learning (pure, so its results are memoized)
+tool_cache = ToolCache()
 
-# 🛠️ Simple tool for learning
+@tool_cache.tool
 @function_tool
 def calculate_area(length: float, width: float) -> str:
     """Calculate the area of a rectangle."""
@@ -101,5 +94,6 @@ async def main():
     print(result_none.final_output)
     
     print("\n💡 Notice: Auto = decides, Required = must use tool")
+    print(f"🗄️ Cache: {response_cache.stats}")
 
 asyncio.run(main())    
\ No newline at end of file
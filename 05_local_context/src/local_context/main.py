@@ -1,9 +1,9 @@
 import asyncio
 from dataclasses import dataclass
-import os
 from dotenv import load_dotenv, find_dotenv
 
-from agents import Agent, AsyncOpenAI, OpenAIChatCompletionsModel, RunConfig, RunContextWrapper, Runner, function_tool
+from agents import Agent, RunContextWrapper, Runner, function_tool
+from agent_runtime import ToolRuntime, cached_instructions, current_deadline, get_model, get_run_config
 
 # 0. Load environment variables
 load_dotenv(find_dotenv())
@@ -14,32 +14,27 @@ class UserContext:
     username: str
     email: str | None = None
 
-# 1. Define the LLM Provider (Gemini via OpenAI-compatible API)
-external_client = AsyncOpenAI(
-    api_key=os.getenv("GEMINI_API_KEY"),
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
-
-# 2. Define the Model
-llm_model = OpenAIChatCompletionsModel(
-    model="gemini-2.5-flash",
-    openai_client=external_client
-)
-
-# 3. Configure the Run settings
-run_config = RunConfig(
-    model=llm_model,
-    model_provider=external_client,
-    tracing_disabled=True
-)
+# 1. Shared Gemini model (pooled client, connects on first use)
+llm_model = get_model()
 
+# 2. Configure the Run settings
+run_config = get_run_config()
+
+# Run tools off the event loop: search blocks, so it goes to the thread pool
+# (after 5 s the model gets a timeout result and the run continues)
+tool_runtime = ToolRuntime()
+
+@tool_runtime.tool(offload=True, timeout=5)
 @function_tool()
 async def search(local_context: RunContextWrapper[UserContext], query: str) -> str:
-    import time
-    time.sleep(30)  # Simulating a delay for the search operation
+    # Simulating a delay for the search operation; the wait ends at the deadline,
+    # which frees the worker thread
+    current_deadline().wait(30)
     return "No results found."
 
 # A tool function that accesses local context via the wrapper
+# (rendered once per user and agent, then served from cache on later turns)
+@cached_instructions(key=lambda special_context, agent: (special_context.context.username, agent.name))
 async def special_prompt(special_context: RunContextWrapper[UserContext], agent: Agent[UserContext]) -> str:
     # who is user?
     # which agent
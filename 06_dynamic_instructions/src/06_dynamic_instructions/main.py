@@ -1,10 +1,10 @@
 import asyncio
 from dataclasses import dataclass
 import datetime
-import os
 from dotenv import load_dotenv, find_dotenv
 
-from agents import Agent, AsyncOpenAI, OpenAIChatCompletionsModel, RunConfig, RunContextWrapper, Runner, function_tool
+from agents import Agent, ModelSettings, RunContextWrapper, Runner, function_tool
+from agent_runtime import RunCoalescer, cached_instructions, get_model, get_run_config
 
 # 0. Load environment variables
 load_dotenv(find_dotenv())
@@ -15,33 +15,27 @@ class UserContext:
     username: str
     email: str | None = None
 
-# 1. Define the LLM Provider (Gemini via OpenAI-compatible API)
-external_client = AsyncOpenAI(
-    api_key=os.getenv("GEMINI_API_KEY"),
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
-
-# 2. Define the Model
-llm_model = OpenAIChatCompletionsModel(
-    model="gemini-2.5-flash",
-    openai_client=external_client
-)
+# 1-2. Shared Gemini model (pooled client from ClientSettings, so GEMINI_BASE_URL applies)
+llm_model = get_model()
 
 # 3. Configure the Run settings
-run_config = RunConfig(
-    model=llm_model,
-    model_provider=external_client,
-    tracing_disabled=True
-)
+run_config = get_run_config(model=llm_model)
 
+# Instructions that only depend on a few inputs are rendered once per key, not every turn
+@cached_instructions(key=lambda context, agent: agent.name)
 def basic_dynamic(context: RunContextWrapper, agent: Agent) -> str:
         """Basic dynamic instructions function."""
         return f"You are {agent.name}. Be helpful and friendly."
 
-agent_basic = Agent(
+# FAQ-like agent: identical questions asked at the same time share one run
+# (opted in, and deterministic thanks to temperature=0)
+coalescer = RunCoalescer()
+
+agent_basic = coalescer.agent(Agent(
         name="Dynamic Agent",
         instructions=basic_dynamic,
-    )
+        model_settings=ModelSettings(temperature=0),
+    ))
 
 def context_aware(context: RunContextWrapper, agent: Agent) -> str:
         """Context-aware instructions based on message count."""
@@ -59,6 +53,7 @@ agent_context = Agent(
         instructions=context_aware,
     )        
 
+@cached_instructions(key=lambda context, agent: (agent.name, datetime.datetime.now().hour))
 def time_based(context: RunContextWrapper, agent: Agent) -> str:
         """Time-based instructions based on current hour."""
         current_hour = datetime.datetime.now().hour
@@ -98,6 +93,9 @@ agent_stateful = Agent(
     instructions=instruction_gen,
 )
 
+@cached_instructions(
+    key=lambda context, agent: (agent.name, len(agent.tools), len(getattr(context, 'messages', [])))
+)
 def explore_context_and_agent(context: RunContextWrapper, agent: Agent) -> str:
     """Explore what's available in context and agent."""
     # Access conversation messages
@@ -122,8 +120,12 @@ async def main():
     # 🎯 Example 1: Basic Dynamic Instructions
     print("\n🎭 Example 1: Basic Dynamic Instructions")
     print("-" * 40)
-    result = await Runner.run(agent_basic, "Hello!", run_config=run_config)
-    print(result.final_output)
+    # Three users say "Hello!" at once: one model call answers all of them
+    results = await asyncio.gather(
+        *(coalescer.run(agent_basic, "Hello!", run_config=run_config) for _ in range(3))
+    )
+    print(results[0].final_output)
+    print(f"({len(results)} requests, {coalescer.stats.executed} run)")
 
 
     # 🎯 Example 2: Context-Aware Instructions
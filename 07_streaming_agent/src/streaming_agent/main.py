@@ -1,9 +1,9 @@
 import asyncio
 from dataclasses import dataclass
-import os
 from dotenv import load_dotenv, find_dotenv
 
-from agents import Agent, AsyncOpenAI, OpenAIChatCompletionsModel, RunConfig, RunContextWrapper, Runner, function_tool
+from agents import Agent, RunContextWrapper, Runner, function_tool
+from agent_runtime import MetricsHooks, TTFTModel, ToolRuntime, get_model, get_run_config
 
 # 0. Load environment variables
 load_dotenv(find_dotenv())
@@ -14,25 +14,19 @@ class UserContext:
     username: str
     email: str | None = None
 
-# 1. Define the LLM Provider (Gemini via OpenAI-compatible API)
-external_client = AsyncOpenAI(
-    api_key=os.getenv("GEMINI_API_KEY"),
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
+# 1-2. Shared Gemini model (pooled client from ClientSettings, so GEMINI_BASE_URL applies)
+llm_model = get_model()
 
-# 2. Define the Model
-llm_model = OpenAIChatCompletionsModel(
-    model="gemini-2.5-flash",
-    openai_client=external_client
-)
+# 📈 Latency metrics (time-to-first-token, model, tool, turn and run latency)
+metrics_hooks = MetricsHooks()
 
 # 3. Configure the Run settings
-run_config = RunConfig(
-    model=llm_model,
-    model_provider=external_client,
-    tracing_disabled=True
-)
+run_config = get_run_config(model=TTFTModel(llm_model, metrics_hooks))
 
+# Run tools off the event loop: search blocks, so it goes to the thread pool
+tool_runtime = ToolRuntime()
+
+@tool_runtime.tool(offload=True)
 @function_tool()
 async def search(local_context: RunContextWrapper[UserContext], query: str) -> str:
     import time
@@ -55,11 +49,14 @@ async def main():
         math_agent,
         "search for the best math tutor in my area",
         run_config=run_config,
-        context=user_info)
+        context=user_info,
+        hooks=metrics_hooks)
     
     async for event in result.stream_events():
         print(event)
 
+    print(metrics_hooks.registry.to_prometheus())
+
     # print(result.final_output)
 
 asyncio.run(main())    
\ No newline at end of file
@@ -1,28 +1,35 @@
 # 🧬 Agent Cloning: Create Agent Variants
 # Simple examples to learn agent cloning
 
-import os
 from dotenv import load_dotenv
-from agents import Agent, Runner, OpenAIChatCompletionsModel, AsyncOpenAI, set_tracing_disabled, ModelSettings, function_tool
+from agents import Agent, set_tracing_disabled, ModelSettings, function_tool
+from agent_runtime import (
+    BatchJob, CachingModel, ResponseCache, ToolCache, ToolRegistry, ToolRuntime, get_model, run_batch_sync, run_sync
+)
 
 # 🌿 Load environment variables
 load_dotenv()
 set_tracing_disabled(disabled=True)
 
-# 🔐 Setup Gemini client
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-BASE_URL = "https://generativelanguage.googleapis.com/v1beta/openai/"
+# 🔐 Shared Gemini model (pooled client, connects on first use)
+# 🗄️ Repeated prompts to low-temperature clones (e.g. PreciseAssistant) are served from cache
+response_cache = ResponseCache(path="response_cache.sqlite3")
+model = CachingModel(get_model(), response_cache)
 
-external_client = AsyncOpenAI(api_key=GEMINI_API_KEY, base_url=BASE_URL)
-model = OpenAIChatCompletionsModel(model="gemini-2.5-flash", openai_client=external_client)
+# 🛠️ Simple tools for learning (pure, so their results are memoized)
+tool_cache = ToolCache()
+# ⚡ Sync tools run on a thread pool, so tool calls from the same turn run side by side
+tool_runtime = ToolRuntime(max_workers=8)
 
-# 🛠️ Simple tools for learning
+@tool_cache.tool
+@tool_runtime.tool
 @function_tool
 def calculate_area(length: float, width: float) -> str:
     """Calculate the area of a rectangle."""
     area = length * width
     return f"Area = {length} × {width} = {area} square units"
 
+@tool_runtime.tool
 @function_tool
 def get_weather(city: str) -> str:
     """Get weather information for a city."""
@@ -52,10 +59,12 @@ def main():
     )
     
     # Test both agents
+    # (run_sync and run_batch_sync share one background event loop, so the client's
+    #  connections stay warm across every call below)
     query = "Hello, how are you?"
     
-    result_base = Runner.run_sync(base_agent, query)
-    result_friendly = Runner.run_sync(friendly_agent, query)
+    result_base = run_sync(base_agent, query)
+    result_friendly = run_sync(friendly_agent, query)
     
     print("Base Agent:")
     print(result_base.final_output)
@@ -82,8 +91,8 @@ def main():
     # Test creativity levels
     query = "Describe a sunset."
     
-    result_creative = Runner.run_sync(creative_agent, query)
-    result_precise = Runner.run_sync(precise_agent, query)
+    result_creative = run_sync(creative_agent, query)
+    result_precise = run_sync(precise_agent, query)
     
     print("Creative Agent:")
     print(result_creative.final_output)
@@ -95,9 +104,11 @@ def main():
     print("-" * 40)
     
     # Base agent with one tool
+    # (a ToolRegistry can't be changed in place and its tool schemas are built once,
+    #  so every clone that keeps these tools reuses them)
     base_agent_with_tools = Agent(
         name="BaseAssistant",
-        tools=[calculate_area],
+        tools=ToolRegistry([calculate_area]),
         instructions="You are a helpful assistant.",
         model=model
     )
@@ -105,22 +116,21 @@ def main():
     # Clone with additional tool
     weather_agent = base_agent_with_tools.clone(
         name="WeatherAssistant",
-        tools=[calculate_area, get_weather],  # New tools list
+        tools=base_agent_with_tools.tools.add(get_weather),  # New registry, base unchanged
         instructions="You are a weather and math assistant."
     )
     
-    # Clone with different tools
+    # Clone that keeps the base tools
     math_agent = base_agent_with_tools.clone(
         name="MathAssistant",
-        tools=[calculate_area],  # Same tools
-        instructions="You are a math specialist."
+        instructions="You are a math specialist."  # Same tools (shared registry)
     )
     
     # Test tool usage
     query = "What's the area of a 5x3 rectangle and the weather in Tokyo?"
     
-    result_weather = Runner.run_sync(weather_agent, query)
-    result_math = Runner.run_sync(math_agent, query)
+    result_weather = run_sync(weather_agent, query)
+    result_math = run_sync(math_agent, query)
     
     print("Weather Agent:")
     print(result_weather.final_output)
@@ -156,10 +166,11 @@ def main():
     # Test all variants
     query = "Tell me about artificial intelligence."
     
-    for name, agent in agents.items():
-        result = Runner.run_sync(agent, query)
-        print(f"\n{name} Agent:")
-        print(result.final_output[:150] + "...")
+    # ⚡ Run every variant at once; results arrive in completion order
+    jobs = [BatchJob(agent, query, id=name) for name, agent in agents.items()]
+    for item in run_batch_sync(jobs, max_concurrency=4):
+        print(f"\n{item.job.id} Agent:")
+        print(item.result.final_output[:150] + "..." if item.ok else f"❌ {item.error}")
     
     # 🎯 Example 5: Understanding Shared References
     print("\n🎯 Example 5: Understanding Shared References")
@@ -202,6 +213,14 @@ def main():
     
     print("\n💡 Notice: Shared clone has the same tools as original,")
     print("   while independent clone has its own tool list!")
+
+    # ✅ Registries are copy-on-write: "adding" a tool makes a new registry, so clones sharing
+    #    the old one are never changed behind their back
+    safe_original = Agent(name="SafeOriginal", tools=ToolRegistry([calculate_area]), model=model)
+    safe_clone = safe_original.clone(name="SafeClone")
+    safe_original.tools = safe_original.tools.add(new_tool)
+    print("Safe original tools:", len(safe_original.tools))  # 2
+    print("Safe clone tools:", len(safe_clone.tools))  # 1 (still its own!)
     
     # 🎯 Example 6: Practical Agent Family
     print("\n🎯 Example 6: Practical Agent Family")
@@ -236,11 +255,12 @@ def main():
     # Test all writing styles
     query = "What is love?"
     
-    for name, agent in writing_agents.items():
-        result = Runner.run_sync(agent, query)
-        print(f"\n{name}:")
-        print(result.final_output[:100] + "...")
+    jobs = [BatchJob(agent, query, id=name) for name, agent in writing_agents.items()]
+    for item in run_batch_sync(jobs, max_concurrency=3):
+        print(f"\n{item.job.id}:")
+        print(item.result.final_output[:100] + "..." if item.ok else f"❌ {item.error}")
     
+    print(f"\n🗄️ Cache: {response_cache.stats}")
     print("\n🎉 You've learned Agent Cloning!")
     print("💡 Try creating your own agent families!")
 
@@ -1,7 +1,8 @@
 import os
 import asyncio
 from dotenv import load_dotenv
-from agents import Agent, Runner, OpenAIChatCompletionsModel, AsyncOpenAI, set_tracing_disabled, ModelSettings, function_tool
+from agents import Agent, Runner, set_tracing_disabled, ModelSettings, function_tool
+from agent_runtime import AgentToolGroup, get_model
 
 # 🌿 Load environment variables
 load_dotenv()
@@ -9,12 +10,8 @@ set_tracing_disabled(disabled=True)
 
 os.environ["OPENAI_API_KEY"] = os.getenv("OPENAI_API_KEY", "")
 
-# 🔐 Setup Gemini client
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-BASE_URL = "https://generativelanguage.googleapis.com/v1beta/openai/"
-
-external_client = AsyncOpenAI(api_key=GEMINI_API_KEY, base_url=BASE_URL)
-llm_model = OpenAIChatCompletionsModel(model="gemini-2.5-flash", openai_client=external_client)
+# 🔐 Shared Gemini model (pooled client, connects on first use; one per server worker)
+llm_model = get_model()
 
 # 1) Two tiny specialists
 spanish = Agent(
@@ -30,13 +27,19 @@ summarizer = Agent(
 )
 
 # 2) Wrap specialists as TOOLS
-translate_to_spanish = spanish.as_tool(
+# (run side by side when called in the same turn; the summarizer is pure, so its answers are cached)
+agent_tools = AgentToolGroup(max_concurrency=4)
+
+translate_to_spanish = agent_tools.as_tool(
+    spanish,
     tool_name="translate_to_spanish",
     tool_description="Translate user text to Spanish."
 )
-summarize_text = summarizer.as_tool(
+summarize_text = agent_tools.as_tool(
+    summarizer,
     tool_name="summarize_text",
-    tool_description="Summarize text in 2 bullets."
+    tool_description="Summarize text in 2 bullets.",
+    cache=True,
 )
 
 # 3) Orchestrator (keeps the mic)
@@ -65,4 +68,5 @@ async def main():
     r3 = await Runner.run(coach, "How can I make my email more polite?")
     print("C) Final reply (plain COACH advice):", r3.final_output)
 
-asyncio.run(main())
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(main())
\ No newline at end of file
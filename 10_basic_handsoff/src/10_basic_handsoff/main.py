@@ -1,9 +1,9 @@
 import asyncio
 from dataclasses import dataclass
-import os
 from dotenv import load_dotenv, find_dotenv
 
-from agents import Agent, AsyncOpenAI, OpenAIChatCompletionsModel, RunConfig, RunContextWrapper, Runner, function_tool, handoff
+from agents import Agent, RunContextWrapper, Runner, function_tool, handoff
+from agent_runtime import HistoryManager, PreRouter, Route, SessionStore, get_model, get_run_config, run_in_session
 
 # 0. Load environment variables
 load_dotenv(find_dotenv())
@@ -14,24 +14,18 @@ class UserContext:
     username: str
     email: str | None = None
 
-# 1. Define the LLM Provider (Gemini via OpenAI-compatible API)
-external_client = AsyncOpenAI(
-    api_key=os.getenv("GEMINI_API_KEY"),
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
+# 1. Shared Gemini model (pooled client, connects on first use)
+llm_model = get_model()
 
-# 2. Define the Model
-llm_model = OpenAIChatCompletionsModel(
-    model="gemini-2.5-flash",
-    openai_client=external_client
-)
+# 2. Configure the Run settings
+# (the history manager keeps every model call under a token budget: handoff items are dropped
+#  and older turns are folded into a rolling summary)
+history = HistoryManager(max_tokens=2000)
+run_config = get_run_config(call_model_input_filter=history.filter)
 
-# 3. Configure the Run settings
-run_config = RunConfig(
-    model=llm_model,
-    model_provider=external_client,
-    tracing_disabled=True
-)
+# 3. Conversations are kept in an append-only SQLite log (history + who owns the conversation),
+#    so any process can continue them without holding the history in memory
+sessions = SessionStore("sessions.sqlite3")
 
 # Fitness Coach 
 fitness_coach = Agent(
@@ -63,21 +57,44 @@ router = Agent(
     handoffs=[study_coach, handoff(fitness_coach)],
 )
 
+# 4. Local pre-router: clear-cut first messages start with the specialist directly (no routing
+#    model call); unclear ones still go to the Coach Router above
+pre_router = PreRouter(
+    router,
+    [
+        Route(
+            fitness_coach,
+            keywords=["run", "running", "jog", "workout", "stamina", "5k", "fitness"],
+            examples=["I want to get fitter and train for a race"],
+        ),
+        Route(
+            study_coach,
+            keywords=["exam", "study plan", "studying", "focus", "notes", "homework"],
+            examples=["I need a schedule before my test"],
+        ),
+    ],
+)
+
 
 
 async def main():
-    # ---- Turn 1: user asks about running → should handoff to Fitness Coach
-    r1 = await Runner.run(router, "I want to run a 5Km in 8 weeks. Can you help?",run_config=run_config)
+    session = sessions.session("demo-user")
+    await session.clear_session()  # start fresh every time the lesson runs
+
+    # ---- Turn 1: user asks about running → starts with the Fitness Coach (pre-routed by keyword)
+    r1 = await run_in_session(session, pre_router, "I want to run a 5Km in 8 weeks. Can you help?", run_config=run_config)
     print("\nTurn 1 (specialist reply):\n", r1.final_output)
 
-     # Grab the specialist that actually replied (Fitness Coach)
-    specialist = r1.last_agent
+    # ---- Turn 2: user answers the coach's follow-up; the session remembers the history and
+    #      that the Fitness Coach owns the conversation, so it continues with the SAME specialist
+    #      (same as Runner.run(r1.last_agent, r1.to_input_list() + [new message]))
+    r2 = await run_in_session(session, pre_router, "Right now I can jog about 2 km, 3 days per week.", run_config=run_config)
+    print(f"\nTurn 2 ({r2.last_agent.name} reply):\n", r2.final_output)
 
-    # ---- Turn 2: user answers the coach's follow-up; continue with SAME specialist
-    t2_input = r1.to_input_list() + [
-        {"role": "user", "content": "Right now I can jog about 2 km, 3 days per week."}
-    ]
-    r2 = await Runner.run(specialist, t2_input,run_config=run_config)
-    print("\nTurn 2 (specialist reply):\n", r2.final_output)
+    # Input tokens each model call would have sent vs what was sent (estimated)
+    for before, after in history.stats.per_call:
+        print(f"📉 input tokens: {before} → {after}")
+    print(f"🔀 routing calls skipped: {pre_router.stats.skipped}/{pre_router.stats.decisions}")
 
-asyncio.run(main())   
\ No newline at end of file
+if __name__ == "__main__":
+    asyncio.run(main())
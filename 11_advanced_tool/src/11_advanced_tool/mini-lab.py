@@ -2,39 +2,24 @@ from dataclasses import dataclass
 from agents import (
     Agent,
     AgentBase,
-    OpenAIChatCompletionsModel,
-    RunConfig,
     RunContextWrapper,
     Runner,
     function_tool,
     StopAtTools,
-    AsyncOpenAI,
     set_tracing_disabled,
 )
+from agent_runtime import EnablementResolver, RunBudget, get_model, get_run_config, run_with_budget
 from dotenv import find_dotenv, load_dotenv
 import asyncio
-import os
 
 # 0. Load environment variables
 load_dotenv(find_dotenv())
 
-# 1. Define the LLM Provider (Gemini via OpenAI-compatible API)
-external_client = AsyncOpenAI(
-    api_key=os.getenv("GEMINI_API_KEY"),
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
-
-# 2. Define the Model
-llm_model = OpenAIChatCompletionsModel(
-    model="gemini-2.5-flash",
-    openai_client=external_client
-)
+# 1. Shared Gemini model (pooled client, connects on first use)
+llm_model = get_model()
 
-# 3. Configure the Run settings
-run_config = RunConfig(
-    model=llm_model,
-    model_provider=external_client
-)
+# 2. Configure the Run settings
+run_config = get_run_config()
 
 set_tracing_disabled(disabled=True)
 
@@ -48,6 +33,10 @@ def get_user_data(user_id: str) -> str:
 class UserScope:
     is_admin: bool
 
+# Permission checks are resolved once per run, not on every turn
+permissions = EnablementResolver()
+
+@permissions.cached
 async def is_admin(ctx: RunContextWrapper[UserScope], agent: AgentBase[UserScope]) -> bool:
     print("Checking if admin allowed...", ctx.context)
     return True if ctx.context.is_admin else False
@@ -79,13 +68,16 @@ async def main():
 
     print("\n--- Running as an admin ---")
     # TODO 3: Set max_turns to 3 for this run as a safety limit.
-    result_admin = await Runner.run(
+    # The budget also bounds time, tokens and tool calls for the run.
+    result_admin = await run_with_budget(
         admin_agent,
         "Get data for user_123 and then delete them.",
+        RunBudget(deadline=30, max_total_tokens=10_000, max_tool_calls=4),
         context=UserScope(is_admin=True),
         max_turns=3,
     )
     print(f"Final Output: {result_admin.final_output}")
+    print(f"Budget used: {result_admin.budget}")
 
 
 asyncio.run(main())
\ No newline at end of file
@@ -1,30 +1,21 @@
-import os
 from openai.types.responses import ResponseTextDeltaEvent
 from dotenv import load_dotenv, find_dotenv
-from agents import Agent, AsyncOpenAI, OpenAIChatCompletionsModel, RunConfig, Runner, StopAtTools, function_tool
+from agents import Agent, StopAtTools, function_tool
+from agent_runtime import ToolCache, get_model, get_run_config, run_sync
 
 # 0. Load environment variables
 load_dotenv(find_dotenv())
 
-# 1. Define the LLM Provider (Gemini via OpenAI-compatible API)
-external_client = AsyncOpenAI(
-    api_key=os.getenv("GEMINI_API_KEY"),
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
+# 1. Shared Gemini model (pooled client, connects on first use)
+llm_model = get_model()
 
-# 2. Define the Model
-llm_model = OpenAIChatCompletionsModel(
-    model="gemini-2.5-flash",
-    openai_client=external_client
-)
+# 2. Configure the Run settings
+run_config = get_run_config()
 
-# 3. Configure the Run settings
-run_config = RunConfig(
-    model=llm_model,
-    model_provider=external_client,
-    tracing_disabled=True
-)
+# Weather lookups are cached for 10 minutes
+tool_cache = ToolCache()
 
+@tool_cache.tool(ttl=600)
 @function_tool
 def get_weather(city: str) -> str:
     """A simple function to get the weather for a user."""
@@ -43,8 +34,9 @@ base_agent: Agent = Agent(
     tool_use_behavior=StopAtTools(stop_at_tool_names=["get_travel_plan"])
 )
 
-res = Runner.run_sync(base_agent, "What is weather in Lahore")
-res = Runner.run_sync(base_agent, "Make me travel plan for Lahore")
+# Both runs share one background event loop, so the second reuses the first one's connection
+res = run_sync(base_agent, "What is weather in Lahore")
+res = run_sync(base_agent, "Make me travel plan for Lahore")
 print(res.final_output)
 
 # 1. NLP answer = loop finished
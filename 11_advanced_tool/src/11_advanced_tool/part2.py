@@ -1,30 +1,17 @@
 import asyncio
-import os
 from openai.types.responses import ResponseTextDeltaEvent
 from dotenv import load_dotenv, find_dotenv
-from agents import Agent, AsyncOpenAI, MaxTurnsExceeded, OpenAIChatCompletionsModel, RunConfig, Runner, StopAtTools, function_tool
+from agents import Agent, MaxTurnsExceeded, Runner, StopAtTools, function_tool
+from agent_runtime import BudgetExceeded, RunBudget, get_model, get_run_config, run_with_budget
 
 # 0. Load environment variables
 load_dotenv(find_dotenv())
 
-# 1. Define the LLM Provider (Gemini via OpenAI-compatible API)
-external_client = AsyncOpenAI(
-    api_key=os.getenv("GEMINI_API_KEY"),
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
-
-# 2. Define the Model
-llm_model = OpenAIChatCompletionsModel(
-    model="gemini-2.5-flash",
-    openai_client=external_client
-)
-
-# 3. Configure the Run settings
-run_config = RunConfig(
-    model=llm_model,
-    model_provider=external_client,
-    tracing_disabled=True
-)
+# 1. Shared Gemini model (pooled client, connects on first use)
+llm_model = get_model()
+
+# 2. Configure the Run settings
+run_config = get_run_config()
 
 @function_tool
 def get_weather(city: str) -> str:
@@ -33,12 +20,19 @@ def get_weather(city: str) -> str:
 base_agent: Agent = Agent(name="WeatherAgent", model=llm_model, tools=[get_weather])
 print(base_agent.tools)
 
+# max_turns only fails the run once the turns are spent; a budget makes the agent answer
+# with what it has when time, tokens or tool calls run low.
+budget = RunBudget(deadline=20, max_total_tokens=8000, max_tool_calls=3)
+
 async def main():
     try:
-        res = await Runner.run(base_agent, "What is weather in Lahore", max_turns=2)
+        res = await run_with_budget(base_agent, "What is weather in Lahore", budget, max_turns=5)
         print(res.new_items)
+        print(res.budget)
     except MaxTurnsExceeded as e:
         print(f"Max turns exceeded: {e}")
+    except BudgetExceeded as e:
+        print(f"Budget exceeded: {e.message} ({e.usage})")
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -1,36 +1,27 @@
 import asyncio
 from dataclasses import dataclass
-import os
 from openai.types.responses import ResponseTextDeltaEvent
 from dotenv import load_dotenv, find_dotenv
-from agents import Agent, AgentBase, AsyncOpenAI, MaxTurnsExceeded, OpenAIChatCompletionsModel, RunConfig, RunContextWrapper, Runner, StopAtTools, function_tool
+from agents import Agent, AgentBase, MaxTurnsExceeded, RunContextWrapper, Runner, StopAtTools, function_tool
+from agent_runtime import EnablementResolver, get_model, get_run_config
 
 # 0. Load environment variables
 load_dotenv(find_dotenv())
 
-# 1. Define the LLM Provider (Gemini via OpenAI-compatible API)
-external_client = AsyncOpenAI(
-    api_key=os.getenv("GEMINI_API_KEY"),
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
-
-# 2. Define the Model
-llm_model = OpenAIChatCompletionsModel(
-    model="gemini-2.5-flash",
-    openai_client=external_client
-)
-
-# 3. Configure the Run settings
-run_config = RunConfig(
-    model=llm_model,
-    model_provider=external_client,
-    tracing_disabled=True
-)
+# 1. Shared Gemini model (pooled client, connects on first use)
+llm_model = get_model()
+
+# 2. Configure the Run settings
+run_config = get_run_config()
 
 @dataclass
 class UserScope:
     is_admin: bool
 
+# Permission checks are resolved once per run, not on every turn
+permissions = EnablementResolver()
+
+@permissions.cached
 async def is_weather_allowed(ctx: RunContextWrapper[UserScope], agent: AgentBase[UserScope]) -> bool:
     print("Checking if weather is allowed...", ctx.context)
     return True if ctx.context.is_admin else False
@@ -1,37 +1,39 @@
 import asyncio
+import random
 from dataclasses import dataclass
-import os
 from openai.types.responses import ResponseTextDeltaEvent
 from dotenv import load_dotenv, find_dotenv
-from agents import Agent, AgentBase, AsyncOpenAI, MaxTurnsExceeded, OpenAIChatCompletionsModel, RunConfig, RunContextWrapper, Runner, StopAtTools, function_tool
+from agents import Agent, AgentBase, MaxTurnsExceeded, RunContextWrapper, Runner, StopAtTools, function_tool
+from agent_runtime import ToolResilience, default_registry, get_model, get_run_config
 
 # 0. Load environment variables
 load_dotenv(find_dotenv())
 
-# 1. Define the LLM Provider (Gemini via OpenAI-compatible API)
-external_client = AsyncOpenAI(
-    api_key=os.getenv("GEMINI_API_KEY"),
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
-
-# 2. Define the Model
-llm_model = OpenAIChatCompletionsModel(
-    model="gemini-2.5-flash",
-    openai_client=external_client
-)
-
-# 3. Configure the Run settings
-run_config = RunConfig(
-    model=llm_model,
-    model_provider=external_client,
-    tracing_disabled=True
-)
-
-@function_tool(description_override="", failure_error_function="")
+# 1. Shared Gemini model (pooled client, connects on first use)
+llm_model = get_model()
+
+# 2. Configure the Run settings
+run_config = get_run_config()
+
+# 3. Retries with backoff, a circuit breaker per tool and fallback tools, all inside one tool
+#    call (no extra model turn); failures raise (failure_error_function=None) so the
+#    resilience layer sees them
+resilience = ToolResilience(retries=2, failure_threshold=3, reset_timeout=30)
+
+@function_tool(failure_error_function=None)
+def get_weather_alternative(city: str) -> str:
+    """Backup weather service."""
+    return f"The weather in {city} is sunny (backup service)."
+
+@resilience.tool(fallbacks=[get_weather_alternative])
+@function_tool(description_override="", failure_error_function=None)
 def get_weather(city: str) -> str:
     try:
-        # If Call Fails Call another service i.e get_weather_alternative
-        ...
+        # Primary weather service, flaky in this demo (times out about half the time); when it
+        # fails, ToolResilience retries it and then calls get_weather_alternative
+        if random.random() < 0.5:
+            raise TimeoutError
+        return f"The weather in {city} is cloudy."
     except ValueError:
         raise ValueError("Weather service is currently unavailable.")
     except TimeoutError:
@@ -44,6 +46,8 @@ base_agent: Agent = Agent(name="WeatherAgent", instructions="", model=llm_model,
 async def main():
     res = await Runner.run(base_agent, "What is weather in Lahore")
     print(res.final_output)
+    # Breaker state, retries and fallbacks
+    print("\n".join(l for l in default_registry.to_prometheus().splitlines() if l.startswith("agent_tool_")))
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -1,38 +1,29 @@
 import asyncio
 from dataclasses import dataclass
-import os
 from openai.types.responses import ResponseTextDeltaEvent
 from dotenv import load_dotenv, find_dotenv
-from agents import Agent, AgentBase, AsyncOpenAI, MaxTurnsExceeded, OpenAIChatCompletionsModel, RunConfig, RunContextWrapper, Runner, StopAtTools, function_tool
+from agents import Agent, AgentBase, MaxTurnsExceeded, RunContextWrapper, Runner, StopAtTools, function_tool
+from agent_runtime import EnablementResolver, get_model, get_run_config
 from pydantic import BaseModel
 
 # 0. Load environment variables
 load_dotenv(find_dotenv())
 
-# 1. Define the LLM Provider (Gemini via OpenAI-compatible API)
-external_client = AsyncOpenAI(
-    api_key=os.getenv("GEMINI_API_KEY"),
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
-
-# 2. Define the Model
-llm_model = OpenAIChatCompletionsModel(
-    model="gemini-2.5-flash",
-    openai_client=external_client
-)
+# 1. Shared Gemini model (pooled client, connects on first use)
+llm_model = get_model()
 
-# 3. Configure the Run settings
-run_config = RunConfig(
-    model=llm_model,
-    model_provider=external_client,
-    tracing_disabled=True
-)
+# 2. Configure the Run settings
+run_config = get_run_config()
 
 class UserContext(BaseModel):
     user_id: str
     subscription_tier: str = "free"  # free, premium, enterprise
     has_permission: bool = False
 
+# Permission checks are resolved once per user (for 5 minutes), not on every turn
+permissions = EnablementResolver(ttl=300, identity=lambda context: context.context.user_id)
+
+@permissions.cached
 def premium_feature_enabled(context: RunContextWrapper, agent: Agent) -> bool:
     print(f"premium_feature_enabled()")
     print(context.context.subscription_tier, context.context.subscription_tier in ["premium", "enterprise"])
@@ -0,0 +1,70 @@
+"""Helpers shared by the benchmarks (not part of the library)."""
+
+import asyncio
+import json
+from collections.abc import Callable
+from typing import Any
+
+from agents import Model, ModelResponse, Usage
+from openai.types.responses import ResponseFunctionToolCall, ResponseOutputMessage, ResponseOutputText
+
+
+def text_message(text: str) -> ResponseOutputMessage:
+    return ResponseOutputMessage(
+        id="msg_scripted",
+        type="message",
+        role="assistant",
+        status="completed",
+        content=[ResponseOutputText(type="output_text", text=text, annotations=[])],
+    )
+
+
+def tool_call(name: str, arguments: dict[str, Any], call_id: str) -> ResponseFunctionToolCall:
+    return ResponseFunctionToolCall(
+        type="function_call",
+        name=name,
+        arguments=json.dumps(arguments),
+        call_id=call_id,
+        id=call_id,
+    )
+
+
+class ScriptedModel(Model):
+    """In-process model with fixed latency.
+
+    For the first ``turns`` turns it calls ``tool_names`` (each with ``arguments(name)``), then
+    it answers with ``answer``. Without tools (or with ``tool_choice="none"``) it answers
+    directly.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        tool_names: list[str] | None = None,
+        arguments: Callable[[str], dict[str, Any]] = lambda name: {},
+        answer: str = "Done.",
+        turns: int = 1,
+    ) -> None:
+        self.latency = latency
+        self.tool_names = tool_names
+        self.arguments = arguments
+        self.answer = answer
+        self.turns = turns
+        self.calls = 0
+
+    async def get_response(self, system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        items = input if isinstance(input, list) else []
+        answered = sum(1 for i in items if isinstance(i, dict) and i.get("type") == "function_call_output")
+        names = self.tool_names if self.tool_names is not None else [t.name for t in tools[:1]]
+        forced_answer = model_settings.tool_choice == "none"
+        if tools and names and answered < self.turns * len(names) and not forced_answer:
+            output = [tool_call(n, self.arguments(n), f"call_{self.calls}_{i}") for i, n in enumerate(names)]
+        else:
+            output = [text_message(self.answer)]
+        usage = Usage(requests=1, input_tokens=50, output_tokens=10, total_tokens=60)
+        return ModelResponse(output=output, usage=usage, response_id=None)
+
+    def stream_response(self, *args, **kwargs):
+        raise NotImplementedError("ScriptedModel only supports get_response")
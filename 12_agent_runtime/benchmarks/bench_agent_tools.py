@@ -0,0 +1,101 @@
+"""Sub-agent tools one per turn vs in the same turn vs ``AgentToolGroup`` (lesson 09).
+
+Run with:  uv run python benchmarks/bench_agent_tools.py [--translate 0.3] [--summarize 0.5]
+
+The coach asks for a translation and a summary. Against the mock server the translator takes
+``--translate`` seconds and the summarizer ``--summarize``; the coach itself ``--coach``.
+With ``parallel_tool_calls=False`` the sub-agents run one per turn (sum of their times); in
+one turn they overlap (max). The cached row repeats the request with the summary cached, and
+the last row shows a failing translator cancelling the slower summarizer.
+"""
+
+import argparse
+import asyncio
+import time
+
+from agents import Agent, ModelSettings, Runner, set_tracing_disabled
+
+from agent_runtime import AgentToolGroup, ClientSettings, aclose_clients, get_model
+from agent_runtime.mock_server import MockServer, Rule
+
+set_tracing_disabled(disabled=True)
+
+PROMPT = "Translate to Spanish and summarize: Large language models help with drafting."
+
+
+def rules(args: argparse.Namespace) -> list[Rule]:
+    return [
+        Rule.from_dict({"system": "Spanish", "match": "fail", "error": 503, "latency": "fixed:0.05"}),
+        Rule.from_dict({"system": "Spanish", "content": "Me encanta.", "latency": f"fixed:{args.translate}"}),
+        Rule.from_dict({"system": "Summarize", "content": "- Drafting help.", "latency": f"fixed:{args.summarize}"}),
+        Rule.from_dict(
+            {
+                "match": "translate",
+                "tool_calls": [
+                    {"name": "translate_to_spanish", "arguments": {"input": "{input}"}},
+                    {"name": "summarize_text", "arguments": {"input": "{input}"}},
+                ],
+                "latency": f"fixed:{args.coach}",
+            }
+        ),
+    ]
+
+
+def build_coach(model, make_tool, parallel: bool = True) -> Agent:
+    spanish = Agent(name="Spanish Translator", instructions="Translate into Spanish.", model=model)
+    summarizer = Agent(name="Summarizer", instructions="Summarize in 2 bullets.", model=model)
+    return Agent(
+        name="Writing Coach",
+        instructions="Use the tools when asked.",
+        tools=[
+            make_tool(spanish, "translate_to_spanish", "Translate to Spanish."),
+            make_tool(summarizer, "summarize_text", "Summarize in 2 bullets.", cache=True),
+        ],
+        model=model,
+        model_settings=ModelSettings(parallel_tool_calls=parallel),
+    )
+
+
+async def timed(agent: Agent, prompt: str) -> tuple[float, str]:
+    start = time.perf_counter()
+    result = await Runner.run(agent, prompt)
+    return time.perf_counter() - start, str(result.final_output)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--translate", type=float, default=0.3)
+    parser.add_argument("--summarize", type=float, default=0.5)
+    parser.add_argument("--coach", type=float, default=0.05)
+    args = parser.parse_args()
+
+    server = await MockServer(rules=rules(args)).start()
+    settings = ClientSettings(api_key="bench", base_url=server.base_url, http2=False, max_retries=0)
+    model = get_model(settings=settings)
+
+    def sdk_tool(agent, name, description, cache=False):
+        return agent.as_tool(tool_name=name, tool_description=description)
+
+    group = AgentToolGroup(max_concurrency=4)
+    rows = [
+        ("as_tool, one per turn", build_coach(model, sdk_tool, parallel=False), PROMPT),
+        ("as_tool, same turn", build_coach(model, sdk_tool), PROMPT),
+        ("AgentToolGroup", build_coach(model, group.as_tool), PROMPT),
+        ("AgentToolGroup, cached", build_coach(model, group.as_tool), PROMPT),
+        ("AgentToolGroup, failure", build_coach(model, group.as_tool), PROMPT + " (fail)"),
+    ]
+    print(f"expected: sum {args.translate + args.summarize:.2f}s, max {max(args.translate, args.summarize):.2f}s "
+          f"(+ {args.coach:.2f}s per coach turn)\n")
+    print(f"{'mode':<26}{'seconds':>9}{'requests':>10}")
+    for label, coach, prompt in rows:
+        server.reset_stats()
+        elapsed, output = await timed(coach, prompt)
+        print(f"{label:<26}{elapsed:>9.3f}{server.requests:>10}")
+    print(f"\nlast answer: {output}")
+
+    await aclose_clients()
+    await server.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
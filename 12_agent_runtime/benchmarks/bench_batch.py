@@ -0,0 +1,53 @@
+"""Sequential ``Runner.run`` loop (lesson 08) vs ``run_batch``.
+
+Run with:  uv run python benchmarks/bench_batch.py [--jobs 200] [--latency 0.2]
+
+Uses an in-process scripted model with fixed latency, so the sequential loop costs
+jobs x latency while the batch runner is bounded by the concurrency cap and the RPM bucket.
+"""
+
+import argparse
+import asyncio
+import time
+
+from agents import Agent, ModelSettings, Runner, set_tracing_disabled
+
+from _support import ScriptedModel
+from agent_runtime import BatchJob, run_batch
+
+set_tracing_disabled(disabled=True)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rpm", type=float, default=6000)
+    args = parser.parse_args()
+
+    model = ScriptedModel(latency=args.latency, answer="Love is patient.")
+    base = Agent(name="BaseWriter", instructions="You are a helpful writer.", model=model)
+    family = [
+        base.clone(name="Poet", instructions="Respond in verse.", model_settings=ModelSettings(temperature=0.9)),
+        base.clone(name="Scientist", instructions="Be precise.", model_settings=ModelSettings(temperature=0.1)),
+        base.clone(name="Chef", instructions="Talk about food."),
+    ]
+    jobs = [BatchJob(family[i % len(family)], f"What is love? (#{i})") for i in range(args.jobs)]
+
+    start = time.perf_counter()
+    for job in jobs:
+        await Runner.run(job.agent, job.input)
+    sequential = time.perf_counter() - start
+
+    start = time.perf_counter()
+    done = [r async for r in run_batch(jobs, max_concurrency=args.concurrency, requests_per_minute=args.rpm)]
+    batched = time.perf_counter() - start
+
+    print(f"{'mode':<12}{'jobs':>8}{'seconds':>10}{'jobs/s':>10}")
+    print(f"{'sequential':<12}{args.jobs:>8}{sequential:>10.2f}{args.jobs / sequential:>10.1f}")
+    print(f"{'run_batch':<12}{len(done):>8}{batched:>10.2f}{len(done) / batched:>10.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,81 @@
+"""An agent that keeps calling tools, stopped by ``max_turns`` or by a ``RunBudget``.
+
+Run with:  uv run python benchmarks/bench_budget.py [--runs 100] [--loops 10]
+
+The scripted model calls ``search`` ``--loops`` times before answering (a research agent that
+does not know when to stop); every model turn takes ``--model-latency`` seconds and uses 50
+input and 10 output tokens. ``max_turns`` throws the run away once it is spent, a budget makes
+the agent answer with what it has.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from agents import Agent, MaxTurnsExceeded, Runner, function_tool, set_tracing_disabled
+
+from _support import ScriptedModel
+from agent_runtime import BudgetExceeded, RunBudget, run_with_budget
+
+set_tracing_disabled(disabled=True)
+
+
+@function_tool
+async def search(query: str) -> str:
+    """Search the web."""
+    await asyncio.sleep(0.05)
+    return "Some more results."
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--loops", type=int, default=10)
+    parser.add_argument("--model-latency", type=float, default=0.1)
+    args = parser.parse_args()
+
+    modes = {
+        "max_turns=4": None,
+        "max_tool_calls=3": RunBudget(max_tool_calls=3),
+        "deadline=0.5 s": RunBudget(deadline=0.5),
+        "max_total_tokens=250": RunBudget(max_total_tokens=250),
+    }
+
+    print(f"{'mode':<22}{'answered':>10}{'failed':>8}{'mean s':>8}{'model calls':>13}{'tokens':>8}{'tool calls':>12}")
+    for label, budget in modes.items():
+        model = ScriptedModel(latency=args.model_latency, answer="Here is what I found.", turns=args.loops)
+        agent = Agent(name="Researcher", tools=[search], model=model)
+        gate = asyncio.Semaphore(args.concurrency)
+        tool_calls = 0
+
+        async def one() -> tuple[bool, float]:
+            nonlocal tool_calls
+            async with gate:
+                start = time.perf_counter()
+                try:
+                    if budget is None:
+                        await Runner.run(agent, "research the best math tutors", max_turns=4)
+                    else:
+                        result = await run_with_budget(agent, "research the best math tutors", budget)
+                        tool_calls += result.budget.tool_calls
+                    answered = True
+                except (MaxTurnsExceeded, BudgetExceeded) as e:
+                    if isinstance(e, BudgetExceeded):
+                        tool_calls += e.usage.tool_calls
+                    answered = False
+                return answered, time.perf_counter() - start
+
+        outcomes = await asyncio.gather(*(one() for _ in range(args.runs)))
+        answered = sum(ok for ok, _ in outcomes)
+        if budget is None:
+            tool_calls = model.calls  # every turn called search
+        print(
+            f"{label:<22}{answered:>10}{args.runs - answered:>8}"
+            f"{statistics.mean(s for _, s in outcomes):>8.3f}{model.calls:>13}{model.calls * 60:>8}{tool_calls:>12}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
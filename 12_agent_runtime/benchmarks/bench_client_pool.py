@@ -0,0 +1,68 @@
+"""Per-run clients vs the shared pooled client, against the local mock server.
+
+Run with:  uv run python benchmarks/bench_client_pool.py [--runs 300] [--concurrency 20]
+
+"before" builds an AsyncOpenAI + OpenAIChatCompletionsModel for every run, the way each
+lesson does at import. "after" uses ``agent_runtime.get_model()``. The mock server counts the
+TCP connections it accepts, which is what a TLS handshake would cost against Gemini.
+"""
+
+import argparse
+import asyncio
+import time
+
+from agents import Agent, AsyncOpenAI, OpenAIChatCompletionsModel, Runner, set_tracing_disabled
+
+from agent_runtime import ClientSettings, aclose_clients, get_model
+from agent_runtime.mock_server import MockServer
+
+set_tracing_disabled(disabled=True)
+
+async def run_batch(make_agent, runs: int, concurrency: int) -> float:
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with gate:
+            agent, cleanup = make_agent()
+            await Runner.run(agent, f"Hello #{i}")
+            if cleanup:
+                await cleanup()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(runs)))
+    return time.perf_counter() - start
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.005, help="mock server latency (s)")
+    args = parser.parse_args()
+
+    server = await MockServer(latency=f"fixed:{args.latency}").start()
+    base_url = server.base_url
+
+    def per_run_client():
+        client = AsyncOpenAI(api_key="bench", base_url=base_url)
+        model = OpenAIChatCompletionsModel(model="gemini-2.5-flash", openai_client=client)
+        return Agent(name="Assistant", instructions="Be brief.", model=model), client.close
+
+    settings = ClientSettings(api_key="bench", base_url=base_url, http2=False)
+    shared_agent = Agent(name="Assistant", instructions="Be brief.", model=get_model(settings=settings))
+
+    def shared_client():
+        return shared_agent, None
+
+    print(f"{'mode':<8}{'runs':>8}{'req/s':>10}{'connections':>14}")
+    for label, factory in (("before", per_run_client), ("after", shared_client)):
+        server.reset_stats()
+        elapsed = await run_batch(factory, args.runs, args.concurrency)
+        print(f"{label:<8}{args.runs:>8}{args.runs / elapsed:>10.1f}{server.connections:>14}")
+
+    await aclose_clients()
+    await server.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
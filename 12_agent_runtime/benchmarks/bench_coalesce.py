@@ -0,0 +1,81 @@
+"""A traffic spike of repeated FAQ prompts with and without ``RunCoalescer``.
+
+Run with:  uv run python benchmarks/bench_coalesce.py [--users 300] [--spike 1.0]
+
+``--users`` requests arrive uniformly over ``--spike`` seconds, each asking one of a handful of
+FAQ questions (Zipf-like popularity), to a temperature-0 agent like lesson 06's
+``agent_basic``. The mock model takes ``--latency`` seconds per response; "model calls" is
+what the server saw.
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from agents import Agent, ModelSettings, Runner, set_tracing_disabled
+
+from agent_runtime import ClientSettings, RunCoalescer, get_model, get_run_config
+from agent_runtime.mock_server import MockServer
+
+set_tracing_disabled(disabled=True)
+
+QUESTIONS = [
+    "Hello!",
+    "What are your opening hours?",
+    "How do I reset my password?",
+    "Where is my order?",
+    "Can I change my delivery address?",
+    "Do you ship abroad?",
+]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=300)
+    parser.add_argument("--spike", type=float, default=1.0)
+    parser.add_argument("--latency", default="lognormal:0.6,0.3")
+    args = parser.parse_args()
+
+    server = await MockServer(latency=args.latency, token_delay=0.005, seed=5).start()
+    model = get_model(settings=ClientSettings(api_key="bench", base_url=server.base_url, http2=False))
+    run_config = get_run_config(model=model)
+    rng = random.Random(7)
+    weights = [1 / (rank + 1) for rank in range(len(QUESTIONS))]
+    arrivals = sorted((rng.uniform(0, args.spike), rng.choices(QUESTIONS, weights)[0]) for _ in range(args.users))
+
+    print(f"{'mode':<26}{'model calls':>13}{'mean s':>8}{'p95 s':>8}{'coalesced':>11}")
+    for label, coalesce, streamed in (
+        ("Runner.run", False, False),
+        ("RunCoalescer.run", True, False),
+        ("Runner.run_streamed", False, True),
+        ("RunCoalescer.run_streamed", True, True),
+    ):
+        coalescer = RunCoalescer()
+        agent = Agent(name="Dynamic Agent", instructions="Be helpful.", model_settings=ModelSettings(temperature=0))
+        if coalesce:
+            coalescer.agent(agent)
+        server.reset_stats()
+
+        async def user(delay: float, question: str) -> float:
+            await asyncio.sleep(delay)
+            start = time.perf_counter()
+            if streamed:
+                result = coalescer.run_streamed(agent, question, run_config=run_config)
+                async for _ in result.stream_events():
+                    pass
+            else:
+                await coalescer.run(agent, question, run_config=run_config)
+            return time.perf_counter() - start
+
+        latencies = sorted(await asyncio.gather(*(user(delay, question) for delay, question in arrivals)))
+        print(
+            f"{label:<26}{server.requests:>13}{statistics.mean(latencies):>8.3f}"
+            f"{latencies[int(0.95 * len(latencies))]:>8.3f}{coalescer.stats.coalesce_rate:>10.0%}"
+        )
+    await server.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,80 @@
+"""Per-turn ``is_enabled`` checks vs ``EnablementResolver``.
+
+Run with:  uv run python benchmarks/bench_enablement.py [--runs 20] [--tools 30] [--turns 10]
+
+Every tool is gated by the same entitlement predicate, which awaits ``--lookup`` seconds to
+stand in for a call to an entitlement service (like ``premium_feature_enabled`` in lesson 11).
+"""
+
+import argparse
+import asyncio
+import time
+from dataclasses import dataclass
+
+from agents import Agent, FunctionTool, Runner, function_tool, set_tracing_disabled
+
+from _support import ScriptedModel
+from agent_runtime import EnablementResolver
+
+set_tracing_disabled(disabled=True)
+
+
+@dataclass
+class UserContext:
+    user_id: str
+    subscription_tier: str = "premium"
+
+
+def make_tools(count: int, is_enabled) -> list[FunctionTool]:
+    tools = []
+    for i in range(count):
+
+        def feature() -> str:
+            """A premium feature."""
+            return "ok"
+
+        tools.append(function_tool(feature, name_override=f"feature_{i}", is_enabled=is_enabled))
+    return tools
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--tools", type=int, default=30)
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--lookup", type=float, default=0.002)
+    args = parser.parse_args()
+
+    lookups = 0
+
+    async def premium_feature_enabled(ctx, agent) -> bool:
+        nonlocal lookups
+        lookups += 1
+        await asyncio.sleep(args.lookup)
+        return ctx.context.subscription_tier in ("premium", "enterprise")
+
+    per_run = EnablementResolver()
+    per_user = EnablementResolver(ttl=300, identity=lambda ctx: ctx.context.user_id)
+    modes = {
+        "uncached": premium_feature_enabled,
+        "per run": per_run.cached(premium_feature_enabled),
+        "per user": per_user.cached(premium_feature_enabled),
+    }
+
+    model = ScriptedModel(tool_names=["feature_0"], turns=args.turns - 1)
+    print(f"{'mode':<10}{'runs':>6}{'turns':>7}{'seconds':>10}{'lookups':>10}{'per run':>9}")
+    for label, is_enabled in modes.items():
+        agent = Agent(name="Assistant", tools=make_tools(args.tools, is_enabled), model=model)
+        lookups = model.calls = 0
+        start = time.perf_counter()
+        for i in range(args.runs):
+            await Runner.run(agent, "Use the features", context=UserContext(f"user{i % 4}"), max_turns=args.turns)
+        elapsed = time.perf_counter() - start
+        print(
+            f"{label:<10}{args.runs:>6}{model.calls:>7}{elapsed:>10.3f}"
+            f"{lookups:>10}{lookups / args.runs:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
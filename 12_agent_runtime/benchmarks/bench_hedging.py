@@ -0,0 +1,80 @@
+"""Tail latency of model calls with and without ``HedgedModel``.
+
+Run with:  uv run python benchmarks/bench_hedging.py [--runs 400] [--latency heavytail:0.2,1.5,0.05]
+
+The mock server answers most requests around the median and a few (``P``) from a Pareto tail,
+like a provider with a slow replica. Each mode runs the same agent ``--runs`` times,
+``--concurrency`` at a time, with ``Runner.run`` and with ``Runner.run_streamed``; "extra
+load" is requests the server saw per run, minus one.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from agents import Agent, Runner, set_tracing_disabled
+
+from agent_runtime import ClientSettings, HedgedModel, aclose_clients, get_model, get_run_config
+from agent_runtime.mock_server import MockServer
+
+set_tracing_disabled(disabled=True)
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def measure(model, runs: int, concurrency: int, streamed: bool) -> list[float]:
+    agent = Agent(name="Assistant", instructions="Answer briefly.")
+    run_config = get_run_config(model=model)
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> float:
+        async with gate:
+            start = time.perf_counter()
+            if streamed:
+                result = Runner.run_streamed(agent, f"Question {i}", run_config=run_config)
+                async for _ in result.stream_events():
+                    pass
+            else:
+                await Runner.run(agent, f"Question {i}", run_config=run_config)
+            return time.perf_counter() - start
+
+    return await asyncio.gather(*(one(i) for i in range(runs)))
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", default="heavytail:0.2,1.5,0.05")
+    parser.add_argument("--max-extra", type=float, default=0.1)
+    args = parser.parse_args()
+
+    server = await MockServer(latency=args.latency, seed=3).start()
+    base = get_model(settings=ClientSettings(api_key="bench", base_url=server.base_url, http2=False))
+
+    print(f"{'mode':<22}{'p50 s':>8}{'p95 s':>8}{'p99 s':>8}{'max s':>8}{'extra load':>12}")
+    for streamed in (False, True):
+        hedged = HedgedModel(base, max_extra=args.max_extra)
+        # Warm the adaptive delay up so both modes are measured in steady state.
+        await measure(hedged, hedged.min_samples * 2, args.concurrency, streamed)
+        for label, model in {"plain": base, "HedgedModel": hedged}.items():
+            server.reset_stats()
+            latencies = await measure(model, args.runs, args.concurrency, streamed)
+            extra = server.requests / args.runs - 1
+            name = f"{label} ({'streamed' if streamed else 'run'})"
+            print(
+                f"{name:<22}{statistics.median(latencies):>8.3f}{percentile(latencies, 0.95):>8.3f}"
+                f"{percentile(latencies, 0.99):>8.3f}{max(latencies):>8.3f}{extra:>12.1%}"
+            )
+        print(f"  hedge delay {hedged.delay:.3f} s, {hedged.stats}")
+
+    await aclose_clients()
+    await server.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,77 @@
+"""Input tokens per reply in a long handoff session, full history vs ``HistoryManager``.
+
+Run with:  uv run python benchmarks/bench_history.py [--replies 20] [--max-tokens 1500]
+
+Replays lesson 10's pattern (router hands off to the Fitness Coach, then the conversation
+continues with ``result.to_input_list() + [new message]``) against the mock server, whose
+``prompt_tokens`` are the request size / 4, so the numbers are what went over the wire.
+"""
+
+import argparse
+import asyncio
+
+from agents import Agent, Runner, handoff, set_tracing_disabled
+
+from agent_runtime import ClientSettings, HistoryManager, aclose_clients, get_model, get_run_config
+from agent_runtime.mock_server import MockServer, Rule
+
+set_tracing_disabled(disabled=True)
+
+COACH_REPLY = (
+    "Great question. This week, run three times: an easy 20 minute jog on Monday, intervals of "
+    "1 minute fast and 2 minutes slow on Wednesday, and a longer easy run on Saturday. Keep the "
+    "pace conversational, stretch afterwards, sleep well and drink enough water. Next week we "
+    "add five minutes to the long run. How did your legs feel after the last session? "
+) * 2
+
+
+async def session(router: Agent, replies: int, run_config) -> list[int]:
+    tokens = []
+    result = await Runner.run(router, "I want to run a 5Km in 8 weeks. Can you help?", run_config=run_config)
+    tokens.append(result.context_wrapper.usage.input_tokens)
+    for i in range(replies - 1):
+        history = result.to_input_list() + [{"role": "user", "content": f"Week {i + 1} went fine, what next?"}]
+        result = await Runner.run(result.last_agent, history, run_config=run_config)
+        tokens.append(result.context_wrapper.usage.input_tokens)
+    return tokens
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--replies", type=int, default=20)
+    parser.add_argument("--max-tokens", type=int, default=1500)
+    args = parser.parse_args()
+
+    server = await MockServer(
+        rules=[
+            Rule.from_dict({"system": "running coach", "content": COACH_REPLY}),
+            Rule.from_dict({"match": "run", "tool_calls": [{"name": "transfer_to_fitness_coach"}]}),
+        ]
+    ).start()
+    model = get_model(settings=ClientSettings(api_key="bench", base_url=server.base_url, http2=False))
+    fitness = Agent(name="Fitness Coach", instructions="You're a running coach.", model=model)
+    router = Agent(
+        name="Coach Router",
+        instructions="Route running questions to the Fitness Coach.",
+        handoffs=[handoff(fitness)],
+        model=model,
+    )
+
+    history = HistoryManager(max_tokens=args.max_tokens)
+    full = await session(router, args.replies, get_run_config(model=model))
+    managed = await session(
+        router, args.replies, get_run_config(model=model, call_model_input_filter=history.filter)
+    )
+
+    print(f"{'reply':>5}{'full history':>14}{'HistoryManager':>16}")
+    for i, (a, b) in enumerate(zip(full, managed), 1):
+        print(f"{i:>5}{a:>14}{b:>16}")
+    print(f"{'total':>5}{sum(full):>14}{sum(managed):>16}")
+    print(f"\nsummaries computed: {history.stats.summaries}, reused: {history.stats.summary_cache_hits}")
+
+    await aclose_clients()
+    await server.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,63 @@
+"""Dynamic instructions re-rendered every turn vs ``cached_instructions``.
+
+Run with:  uv run python benchmarks/bench_instructions.py [--runs 200] [--provider-io 0.005]
+
+Each run has three model turns (two rounds of tool calls, then the answer), so the provider
+is called three times per run. The provider awaits ``--provider-io`` seconds to stand in for a
+profile lookup, like ``special_prompt`` in lesson 05 would if it fetched the user.
+"""
+
+import argparse
+import asyncio
+import time
+from dataclasses import dataclass
+
+from agents import Agent, RunContextWrapper, Runner, function_tool, set_tracing_disabled
+
+from _support import ScriptedModel
+from agent_runtime import cached_instructions
+
+set_tracing_disabled(disabled=True)
+
+
+@dataclass
+class UserContext:
+    username: str
+
+
+@function_tool
+def lookup() -> str:
+    """Look something up."""
+    return "42"
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--provider-io", type=float, default=0.005)
+    args = parser.parse_args()
+
+    async def special_prompt(context: RunContextWrapper[UserContext], agent: Agent) -> str:
+        await asyncio.sleep(args.provider_io)
+        return f"You are a math expert. User: {context.context.username}, Agent: {agent.name}."
+
+    cached_prompt = cached_instructions(
+        key=lambda ctx, agent: (ctx.context.username, agent.name)
+    )(special_prompt)
+
+    model = ScriptedModel(tool_names=["lookup"], turns=2)
+    print(f"{'mode':<10}{'runs':>6}{'turns':>7}{'seconds':>10}{'provider calls':>16}")
+    for label, instructions in (("uncached", special_prompt), ("cached", cached_prompt)):
+        agent = Agent(name="Genius", instructions=instructions, tools=[lookup], model=model)
+        model.calls = 0
+        start = time.perf_counter()
+        for i in range(args.runs):
+            await Runner.run(agent, "What is 6 * 7?", context=UserContext(f"user{i % args.users}"))
+        elapsed = time.perf_counter() - start
+        provider_calls = model.calls if label == "uncached" else cached_prompt.cache_info().misses
+        print(f"{label:<10}{args.runs:>6}{model.calls:>7}{elapsed:>10.3f}{provider_calls:>16}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,135 @@
+"""Lessons 03, 09 and 10 end to end against the local mock server.
+
+Run with:  uv run python benchmarks/bench_lessons.py [--runs 50] [--latency lognormal:0.05,0.4]
+
+The agents mirror 03_tool_calling, 09_agents_as_tool and 10_basic_handsoff; the answers come
+from ``lessons_script.json``. The latency model is seeded, so numbers are reproducible on CI.
+Add ``--stream`` to exercise the SSE path and ``--error-rate`` to inject 429s (absorbed by
+the client's retries).
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from pathlib import Path
+
+from agents import Agent, Runner, function_tool, handoff, set_tracing_disabled
+
+from agent_runtime import ClientSettings, aclose_clients, get_model
+from agent_runtime.mock_server import MockServer, load_script
+
+set_tracing_disabled(disabled=True)
+
+SCRIPT = Path(__file__).with_name("lessons_script.json")
+
+
+@function_tool
+def multiply(a: int, b: int) -> int:
+    """Exact multiplication."""
+    return a * b
+
+
+@function_tool
+def sum(a: int, b: int) -> int:
+    """Exact addition."""
+    return a + b
+
+
+def build_scenarios(model) -> dict[str, tuple[Agent, str]]:
+    calculator = Agent(
+        name="Assistant",
+        instructions="Always use tools for math questions.",
+        tools=[multiply, sum],
+        model=model,
+    )
+
+    spanish = Agent(
+        name="Spanish Translator",
+        instructions="Translate what the user says into Spanish. Only output Spanish.",
+        model=model,
+    )
+    summarizer = Agent(
+        name="Summarizer",
+        instructions="Summarize the given text in 2 short bullet points.",
+        model=model,
+    )
+    coach = Agent(
+        name="Writing Coach",
+        instructions="Call translate_to_spanish or summarize_text when asked, else give a tip.",
+        tools=[
+            spanish.as_tool(tool_name="translate_to_spanish", tool_description="Translate to Spanish."),
+            summarizer.as_tool(tool_name="summarize_text", tool_description="Summarize in 2 bullets."),
+        ],
+        model=model,
+    )
+
+    fitness = Agent(name="Fitness Coach", instructions="You're a running coach.", model=model)
+    study = Agent(name="Study Coach", instructions="You're a study planner.", model=model)
+    router = Agent(
+        name="Coach Router",
+        instructions="Route running questions to Fitness Coach and study questions to Study Coach.",
+        handoffs=[study, handoff(fitness)],
+        model=model,
+    )
+
+    return {
+        "03 tool calling": (calculator, "what is 19 + 23 * 2?"),
+        "09 agents as tool": (coach, "Please translate to Spanish: I love hands-on examples."),
+        "10 handoffs": (router, "I want to run a 5Km in 8 weeks. Can you help?"),
+    }
+
+
+async def run_once(agent: Agent, prompt: str, stream: bool) -> float:
+    start = time.perf_counter()
+    if stream:
+        result = Runner.run_streamed(agent, prompt)
+        async for _ in result.stream_events():
+            pass
+    else:
+        await Runner.run(agent, prompt)
+    return time.perf_counter() - start
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--latency", default="lognormal:0.05,0.4")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--stream", action="store_true")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    server = await MockServer(
+        rules=load_script(SCRIPT), latency=args.latency, error_rate=args.error_rate, seed=args.seed
+    ).start()
+    settings = ClientSettings(api_key="bench", base_url=server.base_url, http2=False, max_retries=5)
+    scenarios = build_scenarios(get_model(settings=settings))
+
+    print(f"{'scenario':<20}{'runs':>6}{'p50 ms':>9}{'p95 ms':>9}{'requests':>10}{'429s':>6}")
+    for name, (agent, prompt) in scenarios.items():
+        server.reset_stats()
+        gate = asyncio.Semaphore(args.concurrency)
+
+        async def one() -> float:
+            async with gate:
+                return await run_once(agent, prompt, args.stream)
+
+        timings = sorted(await asyncio.gather(*(one() for _ in range(args.runs))))
+        p50 = statistics.median(timings) * 1000
+        p95 = timings[int(0.95 * (len(timings) - 1))] * 1000
+        print(
+            f"{name:<20}{args.runs:>6}{p50:>9.1f}{p95:>9.1f}"
+            f"{server.requests:>10}{server.statuses[429]:>6}"
+        )
+
+    result = await Runner.run(scenarios["10 handoffs"][0], scenarios["10 handoffs"][1])
+    print(f"\nsample (10 handoffs, answered by {result.last_agent.name}): {result.final_output}")
+
+    await aclose_clients()
+    await server.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,95 @@
+"""Per-event overhead of ``MetricsHooks`` and a sample export.
+
+Run with:  uv run python benchmarks/bench_metrics.py [--events 200000]
+
+Drives the hook coroutines directly (no model, no event loop scheduling) so the number printed
+is the cost the instrumentation itself adds to each lifecycle event.
+"""
+
+import argparse
+import asyncio
+import time
+
+from agents import Agent, ModelResponse, RunContextWrapper, Runner, Usage, function_tool, set_tracing_disabled
+
+from _support import ScriptedModel
+from agent_runtime import MetricsHooks, MetricsRegistry
+
+set_tracing_disabled(disabled=True)
+
+
+@function_tool
+def multiply(a: int, b: int) -> int:
+    """Exact multiplication."""
+    return a * b
+
+
+def drive(coro) -> None:
+    try:
+        coro.send(None)
+    except StopIteration:
+        pass
+
+
+def per_event_cost(events: int) -> dict[str, float]:
+    hooks = MetricsHooks(MetricsRegistry())
+    agent = Agent(name="Assistant")
+    context = RunContextWrapper(context=None)
+    response = ModelResponse(output=[], usage=Usage(requests=1, input_tokens=10, output_tokens=5, total_tokens=15), response_id=None)
+    items: list = []
+    pairs = events // 2
+    results = {}
+    drive(hooks.on_agent_start(context, agent))  # model and tool events belong to a run
+
+    start = time.perf_counter()
+    for _ in range(pairs):
+        drive(hooks.on_llm_start(context, agent, "sys", items))
+        drive(hooks.on_llm_end(context, agent, response))
+    results["llm start/end"] = (time.perf_counter() - start) / (pairs * 2)
+
+    start = time.perf_counter()
+    for _ in range(pairs):
+        drive(hooks.on_tool_start(context, agent, multiply))
+        drive(hooks.on_tool_end(context, agent, multiply, "6"))
+    results["tool start/end"] = (time.perf_counter() - start) / (pairs * 2)
+
+    drive(hooks.on_agent_end(context, agent, "done"))
+    start = time.perf_counter()
+    for _ in range(pairs):
+        drive(hooks.on_agent_start(context, agent))
+        drive(hooks.on_agent_end(context, agent, "done"))
+    results["agent start/end"] = (time.perf_counter() - start) / (pairs * 2)
+    return results
+
+
+async def end_to_end(runs: int) -> tuple[float, float, MetricsHooks]:
+    agent = Agent(name="Assistant", tools=[multiply], model=ScriptedModel(arguments=lambda _: {"a": 6, "b": 7}))
+    hooks = MetricsHooks(MetricsRegistry())
+    timings = []
+    for run_hooks in (None, hooks):
+        start = time.perf_counter()
+        for _ in range(runs):
+            await Runner.run(agent, "what is 6 * 7?", hooks=run_hooks)
+        timings.append((time.perf_counter() - start) / runs)
+    return timings[0], timings[1], hooks
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--runs", type=int, default=300)
+    args = parser.parse_args()
+
+    print(f"{'event':<18}{'µs/event':>10}")
+    for name, seconds in per_event_cost(args.events).items():
+        print(f"{name:<18}{seconds * 1e6:>10.2f}")
+
+    plain, instrumented, hooks = asyncio.run(end_to_end(args.runs))
+    print(f"\nRunner.run without hooks: {plain * 1e6:8.0f} µs/run")
+    print(f"Runner.run with hooks:    {instrumented * 1e6:8.0f} µs/run")
+    print("\nSample export:\n")
+    print("\n".join(hooks.registry.to_prometheus().splitlines()[:12]))
+
+
+if __name__ == "__main__":
+    main()
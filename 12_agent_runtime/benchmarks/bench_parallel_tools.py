@@ -0,0 +1,96 @@
+"""One model turn that calls several tools, as in lesson 08's "area of a 5x3 rectangle and the
+weather in Tokyo".
+
+Run with:  uv run python benchmarks/bench_parallel_tools.py [--runs 20]
+
+The model asks for ``calculate_area`` (sync, 0.1 s of work), ``get_weather`` (sync, 0.3 s
+upstream call) and ``lookup_city`` (async, 0.2 s) in one turn. The SDK gathers the calls, but
+plain ``def`` tools run on the event loop thread, one after another. Through ``ToolRuntime``
+the sync tools run on its thread pool, so the turn takes as long as the slowest tool. With
+``save_note`` marked ``sequential`` it runs after the others and adds its own time.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from agents import Agent, Runner, function_tool, set_tracing_disabled
+
+from _support import ScriptedModel
+from agent_runtime import ToolRuntime
+
+set_tracing_disabled(disabled=True)
+
+
+@function_tool
+def calculate_area(length: float, width: float) -> str:
+    """Calculate the area of a rectangle."""
+    time.sleep(0.1)
+    return f"Area = {length * width} square units"
+
+
+@function_tool
+def get_weather(city: str) -> str:
+    """Get weather information for a city."""
+    time.sleep(0.3)
+    return f"The weather in {city} is sunny and 72°F"
+
+
+@function_tool
+async def lookup_city(city: str) -> str:
+    """Look up facts about a city."""
+    await asyncio.sleep(0.2)
+    return f"{city} is the capital of Japan"
+
+
+@function_tool
+def save_note(text: str) -> str:
+    """Save a note (after the lookups it summarizes)."""
+    time.sleep(0.05)
+    return "saved"
+
+
+ARGUMENTS = {
+    "calculate_area": {"length": 5, "width": 3},
+    "get_weather": {"city": "Tokyo"},
+    "lookup_city": {"city": "Tokyo"},
+    "save_note": {"text": "Tokyo trip"},
+}
+
+
+async def turn_seconds(tools: list, runs: int) -> float:
+    """Mean time of the tool-calling turn (model latency is zero)."""
+    model = ScriptedModel(tool_names=[t.name for t in tools], arguments=ARGUMENTS.__getitem__)
+    agent = Agent(name="WeatherAssistant", instructions="You are a weather and math assistant.", tools=tools, model=model)
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await Runner.run(agent, "What's the area of a 5x3 rectangle and the weather in Tokyo?")
+        samples.append(time.perf_counter() - start)
+    return statistics.mean(samples)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    runtime = ToolRuntime(max_workers=8)
+    tools = [calculate_area, get_weather, lookup_city]
+    wrapped = [runtime.wrap(t) for t in tools]
+    note = [runtime.wrap(save_note, sequential=True)]
+
+    print(f"{'mode':<34}{'turn s':>8}")
+    for label, turn_tools in (
+        ("SDK (sync tools on the loop)", tools),
+        ("ToolRuntime", wrapped),
+        ("SDK + save_note", tools + [save_note]),
+        ("ToolRuntime + sequential save_note", wrapped + note),
+    ):
+        print(f"{label:<34}{await turn_seconds(turn_tools, args.runs):>8.3f}")
+    runtime.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
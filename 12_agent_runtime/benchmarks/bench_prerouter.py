@@ -0,0 +1,122 @@
+"""First turns of lesson 10 with the LLM router vs ``PreRouter``.
+
+Run with:  uv run python benchmarks/bench_prerouter.py [--latency lognormal:0.4,0.3]
+
+Every message starts a new conversation, as turn 1 of lesson 10 does. With the LLM router the
+first model call only picks a specialist (``transfer_to_*``) and a second one answers; the
+pre-router answers confident messages with one call and sends the rest to the LLM router.
+Model latency comes from the mock server (``--latency``, see ``mock_server.parse_latency``).
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from agents import Agent, Runner, handoff, set_tracing_disabled
+
+from agent_runtime import ClientSettings, PreRouter, Route, aclose_clients, get_model, get_run_config
+from agent_runtime.mock_server import MockServer, Rule
+
+set_tracing_disabled(disabled=True)
+
+MESSAGES = [
+    "I want to run a 5Km in 8 weeks. Can you help?",
+    "My exams start in May, I need a study plan",
+    "How do I build stamina for football?",
+    "I keep losing focus after an hour of reading",
+    "Give me a beginner workout for three days a week",
+    "How should I organise my notes for biology?",
+    "I need a schedule for my test next week",
+    "I jog twice a week but get tired fast",
+    "Can you help me prepare for my finals?",
+    "I'd like to get fitter before summer",
+    "Exam stress makes me want to skip my runs",
+    "Hi! What can you do?",
+]
+
+
+async def first_turns(entry, run_config, concurrency: int = 4) -> list[float]:
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one(message: str) -> float:
+        async with gate:
+            start = time.perf_counter()
+            if isinstance(entry, PreRouter):
+                await entry.run(message, run_config=run_config)
+            else:
+                await Runner.run(entry, message, run_config=run_config)
+            return time.perf_counter() - start
+
+    return await asyncio.gather(*(one(message) for message in MESSAGES))
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", default="lognormal:0.4,0.3")
+    args = parser.parse_args()
+
+    server = await MockServer(
+        rules=[
+            Rule.from_dict({"system": "running coach", "content": "Let's start with three easy runs."}),
+            Rule.from_dict({"system": "study planner", "content": "Let's plan one small step a day."}),
+            Rule.from_dict(
+                {"match": "(?i)run|jog|stamina|workout|fit", "tool_calls": [{"name": "transfer_to_fitness_coach"}]}
+            ),
+            Rule.from_dict({"system": "Route the user", "tool_calls": [{"name": "transfer_to_study_coach"}]}),
+        ],
+        latency=args.latency,
+        seed=7,
+    ).start()
+    model = get_model(settings=ClientSettings(api_key="bench", base_url=server.base_url, http2=False))
+    run_config = get_run_config(model=model)
+
+    fitness_coach = Agent(name="Fitness Coach", instructions="You're a running coach.")
+    study_coach = Agent(name="Study Coach", instructions="You're a study planner.")
+    router = Agent(
+        name="Coach Router",
+        instructions="Route the user to the Fitness Coach or the Study Coach.",
+        handoffs=[study_coach, handoff(fitness_coach)],
+    )
+    pre_router = PreRouter(
+        router,
+        [
+            Route(
+                fitness_coach,
+                keywords=["run", "running", "jog", "workout", "stamina", "5k", "fitness"],
+                examples=["I want to get fitter and train for a race", "an exercise routine for the gym"],
+            ),
+            Route(
+                study_coach,
+                keywords=["exam", "study plan", "studying", "focus", "notes", "homework"],
+                examples=["I need a schedule before my test", "help me prepare for finals at school"],
+            ),
+        ],
+    )
+
+    print(f"{'routing':<12}{'runs':>6}{'model calls':>13}{'mean s':>9}{'p50 s':>8}")
+    for label, entry in {"LLM router": router, "PreRouter": pre_router}.items():
+        server.reset_stats()
+        latencies = await first_turns(entry, run_config)
+        print(
+            f"{label:<12}{len(latencies):>6}{server.requests:>13}"
+            f"{statistics.mean(latencies):>9.3f}{statistics.median(latencies):>8.3f}"
+        )
+        if entry is router:
+            baseline = statistics.mean(latencies)
+        else:
+            saved = baseline - statistics.mean(latencies)
+
+    stats = pre_router.stats
+    print(
+        f"\nskip rate {stats.skip_rate:.0%} ({dict(stats.by_rule)}), "
+        f"{saved * 1000:.0f} ms saved per first turn, "
+        f"classification {stats.classify_seconds / stats.decisions * 1e6:.0f} µs per message"
+    )
+
+    await aclose_clients()
+    await server.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,77 @@
+"""Concurrent runs calling a CPU-bound tool: inline, on the thread pool and in worker processes.
+
+Run with:  uv run python benchmarks/bench_process_tools.py [--runs 16] [--samples 400000]
+
+``estimate_area`` is the heavy-numeric version of lessons 04/08's ``calculate_area``: a pure
+Python Monte-Carlo estimate that holds the GIL for its whole call. ``--runs`` runs call it at
+once. Inline the loop is frozen for every call; on threads the calls take turns on the GIL and
+the loop only gets the gaps; in worker processes they spread across cores and the loop stays
+free for model I/O. "max lag" is the longest the event loop failed to wake a 10 ms ticker.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import time
+
+from agents import Agent, Runner, function_tool, set_tracing_disabled
+
+from _support import ScriptedModel
+from agent_runtime import ToolRuntime
+
+set_tracing_disabled(disabled=True)
+
+
+@function_tool
+def estimate_area(length: float, width: float, samples: int) -> str:
+    """Estimate the area of the ellipse inside a length x width rectangle."""
+    rng = random.Random(0)
+    inside = sum(1 for _ in range(samples) if rng.random() ** 2 + rng.random() ** 2 <= 1)
+    return f"Area ≈ {length * width * inside / samples:.3f} square units"
+
+
+async def run_all(agent: Agent, runs: int) -> tuple[float, float]:
+    lag = 0.0
+
+    async def ticker() -> None:
+        nonlocal lag
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lag = max(lag, time.perf_counter() - start - 0.01)
+
+    tick = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    await asyncio.gather(*(Runner.run(agent, "Estimate the area of a 5x3 ellipse") for _ in range(runs)))
+    elapsed = time.perf_counter() - start
+    tick.cancel()
+    return elapsed, lag
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=16)
+    parser.add_argument("--samples", type=int, default=400_000)
+    args = parser.parse_args()
+
+    arguments = {"length": 5, "width": 3, "samples": args.samples}
+    model = ScriptedModel(latency=0.01, arguments=lambda name: arguments)
+    runtime = ToolRuntime(max_workers=args.runs)
+    runtime.warm()
+
+    print(f"{os.cpu_count()} CPU(s), {runtime.max_processes} worker processes, {args.runs} concurrent runs")
+    print(f"{'mode':<10}{'seconds':>10}{'max lag ms':>12}")
+    for label, tool in (
+        ("inline", estimate_area),
+        ("threads", runtime.wrap(estimate_area, offload=True)),
+        ("processes", runtime.wrap(estimate_area, offload="process")),
+    ):
+        agent = Agent(name="Math", instructions="Use the tool.", tools=[tool], model=model)
+        elapsed, lag = await run_all(agent, args.runs)
+        print(f"{label:<10}{elapsed:>10.2f}{lag * 1000:>12.1f}")
+    runtime.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,99 @@
+"""Per-tenant clones with plain tool lists vs ``ToolRegistry`` / ``HandoffRegistry``.
+
+Run with:  uv run python benchmarks/bench_registry.py [--tools 30] [--handoffs 5] [--tenants 1000]
+
+- clone: ``--tenants`` clones of a base agent. With plain lists each clone takes a defensive
+  copy of the tools (lesson 08's "independent clone"); with registries clones share them.
+- turn: building one turn's ``tools`` request param the way the SDK does (a ``Handoff`` per
+  agent handoff, then every tool and handoff converted) vs the precompiled fragment.
+- run: one single-turn run per tenant against the mock server through ``get_model()``, so the
+  full request path is included (model latency zero).
+"""
+
+import argparse
+import asyncio
+import time
+
+from agents import Agent, RunContextWrapper, Runner, function_tool, set_tracing_disabled
+from agents.models.chatcmpl_converter import Converter
+from agents.models.openai_chatcompletions import _to_dump_compatible
+from agents.run import AgentRunner
+
+from agent_runtime import ClientSettings, HandoffRegistry, ToolRegistry, aclose_clients, get_model
+from agent_runtime.mock_server import MockServer
+from agent_runtime.registry import compiled_tools
+
+set_tracing_disabled(disabled=True)
+
+
+def make_tool(i: int):
+    @function_tool(name_override=f"get_weather_{i}")
+    def get_weather(city: str, days: int, units: str = "metric", tags: list[str] | None = None) -> str:
+        """Get the weather forecast for a city.
+
+        Args:
+            city: The city to look up.
+            days: How many days to forecast.
+            units: metric or imperial.
+            tags: Extra details to include.
+        """
+        return "sunny"
+
+    return get_weather
+
+
+async def build_turn(agent: Agent, registered: bool) -> list:
+    context = RunContextWrapper(context=None)
+    tools = await agent.get_all_tools(context)
+    handoffs = await AgentRunner._get_handoffs(agent, context)
+    if registered:
+        return compiled_tools(tools, handoffs)
+    converted = [Converter.tool_to_openai(t) for t in tools]
+    converted += [Converter.convert_handoff_tool(h) for h in handoffs]
+    return _to_dump_compatible(converted)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tools", type=int, default=30)
+    parser.add_argument("--handoffs", type=int, default=5)
+    parser.add_argument("--tenants", type=int, default=1000)
+    args = parser.parse_args()
+
+    server = await MockServer(latency="fixed:0").start()
+    model = get_model(settings=ClientSettings(api_key="bench", base_url=server.base_url, http2=False))
+    tools = [make_tool(i) for i in range(args.tools)]
+    specialists = [Agent(name=f"Specialist {i}", model=model) for i in range(args.handoffs)]
+
+    print(f"{args.tools} tools, {args.handoffs} handoffs, {args.tenants} tenants")
+    print(f"{'mode':<12}{'clone µs':>10}{'turn µs':>10}{'run ms':>9}")
+    for label, registered in (("lists", False), ("registries", True)):
+        if registered:
+            base = Agent(name="Base", tools=ToolRegistry(tools), handoffs=HandoffRegistry(specialists), model=model)
+            clone = lambda i: base.clone(name=f"Tenant {i}")  # noqa: E731
+        else:
+            base = Agent(name="Base", tools=list(tools), handoffs=list(specialists), model=model)
+            clone = lambda i: base.clone(name=f"Tenant {i}", tools=list(base.tools))  # noqa: E731
+
+        start = time.perf_counter()
+        tenants = [clone(i) for i in range(args.tenants)]
+        clone_us = (time.perf_counter() - start) / args.tenants * 1e6
+
+        number = 2000
+        start = time.perf_counter()
+        for _ in range(number):
+            await build_turn(tenants[0], registered)
+        turn_us = (time.perf_counter() - start) / number * 1e6
+
+        start = time.perf_counter()
+        for tenant in tenants:
+            await Runner.run(tenant, "Hello!")
+        run_ms = (time.perf_counter() - start) / args.tenants * 1000
+        print(f"{label:<12}{clone_us:>10.1f}{turn_us:>10.1f}{run_ms:>9.2f}")
+
+    await aclose_clients()
+    await server.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,99 @@
+"""Request ``messages`` for growing histories: the SDK's full rebuild vs ``BodyEncoder``.
+
+Run with:  uv run python benchmarks/bench_request_body.py [--sizes 10 100 1000] [--repeat 200]
+
+For each history size, the next turn's request adds two items (a tool call and its output):
+
+- sdk: what happens per request today: convert every item to a chat message, let the OpenAI
+  client transform them and JSON-encode the lot as httpx does,
+- cold: ``BodyEncoder`` on a history it has not seen (first turn of a resumed session),
+- incremental: ``BodyEncoder`` after the previous turn was encoded. Items from earlier turns
+  arrive as fresh but equal dicts, as the SDK rebuilds them every turn.
+"""
+
+import argparse
+import copy
+import json
+import time
+
+from agents.models.chatcmpl_converter import Converter
+from agents.models.openai_chatcompletions import _to_dump_compatible
+from openai._utils import maybe_transform
+from openai.types.chat import completion_create_params
+
+from agent_runtime import request_body
+from agent_runtime.request_body import BodyEncoder
+
+SYSTEM = "You are a helpful assistant. Always use tools for math questions."
+
+
+def history(size: int) -> list[dict]:
+    items: list[dict] = []
+    for i in range(size):
+        kind = i % 4
+        if kind == 0:
+            items.append({"role": "user", "content": f"What is {i} + {i} * 2? Explain briefly."})
+        elif kind == 1:
+            items.append({
+                "type": "function_call", "call_id": f"call_{i}", "id": f"call_{i}", "name": "multiply",
+                "arguments": json.dumps({"a": i, "b": 2}),
+            })
+        elif kind == 2:
+            items.append({"type": "function_call_output", "call_id": f"call_{i - 1}", "output": str(i * 2)})
+        else:
+            items.append({
+                "type": "message", "role": "assistant", "id": f"msg_{i}", "status": "completed",
+                "content": [{"type": "output_text", "text": f"The answer is {i * 3}.", "annotations": []}],
+            })
+    return items
+
+
+def sdk_body(items: list[dict]) -> bytes:
+    messages = Converter.items_to_messages(items)
+    messages.insert(0, {"content": SYSTEM, "role": "system"})
+    body = maybe_transform(
+        {"messages": _to_dump_compatible(messages), "model": "gemini-2.5-flash"},
+        completion_create_params.CompletionCreateParamsNonStreaming,
+    )
+    return json.dumps(body, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode()
+
+
+def next_turn(items: list[dict]) -> list[dict]:
+    # The first item is the caller's input (same object every turn); the rest are rebuilt.
+    return items[:1] + copy.deepcopy(items[1:])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 30, 100, 300, 1000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"JSON encoder: {'orjson' if request_body.orjson is not None else 'json'}")
+    print(f"{'items':>6}{'sdk µs':>10}{'cold µs':>10}{'incremental µs':>16}{'speedup':>9}")
+    for size in args.sizes:
+        items = history(size)
+        repeat = max(args.repeat * 100 // size, 10)
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            sdk_body(items)
+        sdk_us = (time.perf_counter() - start) / repeat * 1e6
+
+        cold_us = incremental_us = 0.0
+        for _ in range(repeat):
+            encoder = BodyEncoder()
+            start = time.perf_counter()
+            encoder.encode(SYSTEM, items[:-2])
+            cold_us += time.perf_counter() - start
+            turn = next_turn(items)
+            start = time.perf_counter()
+            encoder.encode(SYSTEM, turn)
+            incremental_us += time.perf_counter() - start
+        cold_us, incremental_us = cold_us / repeat * 1e6, incremental_us / repeat * 1e6
+
+        print(f"{size:>6}{sdk_us:>10.1f}{cold_us:>10.1f}{incremental_us:>16.1f}{sdk_us / incremental_us:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""A weather service outage with and without ``ToolResilience``.
+
+Run with:  uv run python benchmarks/bench_resilience.py [--runs 200] [--outage 3]
+
+``get_weather`` times out after ``--timeout`` seconds while the outage lasts (the first
+``--outage`` seconds) and works afterwards; ``get_weather_alternative`` always works. The
+scripted model behaves like lesson 11's agent: when a tool reports an error it tries
+``get_weather`` again, and after ``--give-up`` errors it switches to the alternative. Every
+model turn takes ``--model-latency`` seconds.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from agents import Agent, Model, ModelResponse, Runner, Usage, function_tool, set_tracing_disabled
+from agents.tool import default_tool_error_function
+
+from _support import text_message, tool_call
+from agent_runtime import MetricsRegistry, ToolResilience
+
+set_tracing_disabled(disabled=True)
+
+
+class WeatherModel(Model):
+    def __init__(self, latency: float, give_up: int) -> None:
+        self.latency = latency
+        self.give_up = give_up
+        self.calls = 0
+
+    async def get_response(self, system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        outputs = [str(i["output"]) for i in input if isinstance(i, dict) and i.get("type") == "function_call_output"]
+        errors = sum(1 for o in outputs if o.startswith("An error occurred") or "unavailable" in o)
+        if outputs and errors < len(outputs):
+            output = [text_message(f"Here you go: {outputs[-1]}")]
+        elif errors < self.give_up:
+            output = [tool_call("get_weather", {"city": "Lahore"}, f"call_{self.calls}")]
+        elif "get_weather_alternative" in {t.name for t in tools}:
+            output = [tool_call("get_weather_alternative", {"city": "Lahore"}, f"call_{self.calls}")]
+        else:
+            output = [text_message("Sorry, the weather service is down.")]
+        usage = Usage(requests=1, input_tokens=50, output_tokens=10, total_tokens=60)
+        return ModelResponse(output=output, usage=usage, response_id=None)
+
+    def stream_response(self, *args, **kwargs):
+        raise NotImplementedError
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--outage", type=float, default=3.0)
+    parser.add_argument("--timeout", type=float, default=0.5)
+    parser.add_argument("--model-latency", type=float, default=0.2)
+    parser.add_argument("--give-up", type=int, default=2)
+    args = parser.parse_args()
+
+    primary_calls = 0
+    outage_ends = 0.0
+
+    def primary(failure_error_function):
+        @function_tool(failure_error_function=failure_error_function)
+        async def get_weather(city: str) -> str:
+            """Weather from the primary service."""
+            nonlocal primary_calls
+            primary_calls += 1
+            if time.monotonic() < outage_ends:
+                await asyncio.sleep(args.timeout)
+                raise TimeoutError("Weather service request timed out.")
+            return f"Sunny in {city}"
+
+        return get_weather
+
+    @function_tool(failure_error_function=None)
+    async def get_weather_alternative(city: str) -> str:
+        """Weather from the backup service."""
+        return f"Sunny in {city} (backup)"
+
+    registry = MetricsRegistry()
+    resilience = ToolResilience(retries=2, failure_threshold=3, reset_timeout=1.0, registry=registry, seed=1)
+    modes = {
+        "model retries": [primary(default_tool_error_function), get_weather_alternative],
+        "ToolResilience": [resilience.wrap(primary(None), fallbacks=[get_weather_alternative])],
+    }
+
+    print(f"{'mode':<16}{'runs':>6}{'total s':>9}{'mean s':>8}{'p95 s':>8}{'model calls':>13}{'primary calls':>15}")
+    for label, tools in modes.items():
+        primary_calls = 0
+        model = WeatherModel(args.model_latency, args.give_up)
+        agent = Agent(name="WeatherAgent", tools=tools, model=model)
+        gate = asyncio.Semaphore(args.concurrency)
+
+        async def one(i: int) -> float:
+            async with gate:
+                start = time.perf_counter()
+                await Runner.run(agent, "What is the weather in Lahore?")
+                return time.perf_counter() - start
+
+        outage_ends = time.monotonic() + args.outage
+        start = time.perf_counter()
+        latencies = sorted(await asyncio.gather(*(one(i) for i in range(args.runs))))
+        total = time.perf_counter() - start
+        print(
+            f"{label:<16}{args.runs:>6}{total:>9.2f}{statistics.mean(latencies):>8.3f}"
+            f"{latencies[int(0.95 * len(latencies))]:>8.3f}{model.calls:>13}{primary_calls:>15}"
+        )
+
+    print("\n" + "\n".join(line for line in registry.to_prometheus().splitlines() if not line.startswith("#")))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
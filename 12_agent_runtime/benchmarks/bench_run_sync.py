@@ -0,0 +1,73 @@
+"""Sequential and threaded sync runs: per-call loops vs the shared background loop.
+
+Run with:  uv run python benchmarks/bench_run_sync.py [--calls 1000] [--threads 8]
+
+``--calls`` sequential calls against the local mock server, three ways:
+
+- ``asyncio.run`` — a fresh event loop per call (``Runner.run_sync`` in older SDK releases),
+  so the pooled client and its connections are rebuilt every time,
+- ``Runner.run_sync`` — the SDK keeps one loop per calling thread,
+- ``run_sync`` — ``agent_runtime``'s facade on one background loop.
+
+Then the same calls spread over ``--threads`` threads, as a WSGI server would make them. The
+mock server counts the TCP connections it accepts (a TLS handshake each against Gemini).
+"""
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from agents import Agent, Runner, set_tracing_disabled
+
+from agent_runtime import BackgroundLoop, ClientSettings, get_model, run_sync
+from agent_runtime.mock_server import MockServer
+
+set_tracing_disabled(disabled=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.001, help="mock server latency (s)")
+    args = parser.parse_args()
+
+    # The mock server gets a loop of its own, so it keeps serving while callers block.
+    server_loop = BackgroundLoop(name="mock-server")
+    server = server_loop.call(MockServer(latency=f"fixed:{args.latency}").start())
+    settings = ClientSettings(api_key="bench", base_url=server.base_url, http2=False)
+    agent = Agent(name="Assistant", instructions="Be brief.", model=get_model(settings=settings))
+
+    modes = {
+        "asyncio.run": lambda i: asyncio.run(Runner.run(agent, f"Hello #{i}")),
+        "Runner.run_sync": lambda i: Runner.run_sync(agent, f"Hello #{i}"),
+        "run_sync": lambda i: run_sync(agent, f"Hello #{i}", timeout=30),
+    }
+    print(f"{'mode':<18}{'threads':>8}{'calls/s':>10}{'ms/call':>10}{'connections':>13}")
+    for threads in (1, args.threads):
+        for label, call in modes.items():
+            server_loop.call(_reset(server))
+            start = time.perf_counter()
+            if threads == 1:
+                for i in range(args.calls):
+                    call(i)
+            else:
+                with ThreadPoolExecutor(threads) as pool:
+                    list(pool.map(call, range(args.calls)))
+            elapsed = time.perf_counter() - start
+            print(
+                f"{label:<18}{threads:>8}{args.calls / elapsed:>10.1f}"
+                f"{elapsed / args.calls * 1000:>10.2f}{server.connections:>13}"
+            )
+
+    server_loop.call(server.close())
+    server_loop.close()
+
+
+async def _reset(server: MockServer) -> None:
+    server.reset_stats()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Load test: ``agent-serve`` throughput against the mock model as workers are added.
+
+Run with:  uv run python benchmarks/bench_server.py [--workers 1,2,4] [--requests 2000] [--stream]
+
+Starts the mock server, then for each worker count an ``agent-serve`` pool serving ``agent``
+below (one tool call per run: two model calls plus the SDK's own work) and fires
+``--requests`` requests from ``--concurrency`` keep-alive connections. Every worker runs at most
+``--max-concurrency`` runs; 503s are requests shed by admission control. The load generator
+shares the machine with the pool, so scaling flattens once the cores are busy.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from agents import Agent, function_tool
+
+RULES = [{"match": "order", "tool_calls": [{"name": "lookup_order", "arguments": {"order_id": "A-42"}}]}]
+
+
+@function_tool
+def lookup_order(order_id: str) -> str:
+    """Look up an order."""
+    return f"Order {order_id}: shipped"
+
+
+agent = Agent(name="Support", instructions="Answer briefly.", tools=[lookup_order])
+
+
+def start(args: list[str], env: dict[str, str]) -> tuple[subprocess.Popen[str], str]:
+    """Start a server process and return it with the URL from its first line of output."""
+    process = subprocess.Popen(
+        [sys.executable, "-m", *args], stdout=subprocess.PIPE, text=True, env=env, cwd=Path(__file__).parent
+    )
+    assert process.stdout is not None
+    line = process.stdout.readline()
+    url = next(word for word in line.split() if word.startswith("http"))
+    return process, url.removesuffix("/v1beta/openai/")
+
+
+async def load(url: str, requests: int, concurrency: int, stream: bool) -> tuple[float, list[float], int, int]:
+    latencies: list[float] = []
+    rejected = errors = 0
+    pending = iter(range(requests))
+    body = {"input": "Where is my order A-42?", "stream": stream}
+
+    async def client(http: httpx.AsyncClient) -> None:
+        nonlocal rejected, errors
+        for _ in pending:
+            start = time.perf_counter()
+            response = await http.post(f"{url}/agents/agent", json=body)
+            if response.status_code == 503:
+                rejected += 1
+            elif response.status_code != 200 or (stream and "event: done" not in response.text):
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - start)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=60) as http:
+        for _ in range(30):  # wait for the workers to come up
+            try:
+                await http.get(f"{url}/healthz")
+                break
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+        start = time.perf_counter()
+        await asyncio.gather(*(client(http) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return elapsed, sorted(latencies), rejected, errors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--max-concurrency", type=int, default=64)
+    parser.add_argument("--latency", default="fixed:0.02", help="mock model latency")
+    parser.add_argument("--stream", action="store_true", help="request server-sent events")
+    args = parser.parse_args()
+
+    src = str(Path(__file__).resolve().parents[1] / "src")
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([src, os.environ.get("PYTHONPATH", "")])}
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as script:
+        json.dump(RULES, script)
+    mock, mock_url = start(
+        ["agent_runtime.mock_server", "--port", "0", "--latency", args.latency, "--script", script.name], env
+    )
+    env.update(GEMINI_API_KEY="mock", GEMINI_BASE_URL=f"{mock_url}/v1beta/openai/")
+
+    print(f"{os.cpu_count()} CPU(s), {args.requests} requests, {args.concurrency} connections, "
+          f"model latency {args.latency}{', streamed' if args.stream else ''}")
+    print(f"{'workers':>7}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'503s':>7}{'errors':>8}")
+    try:
+        for workers in (int(n) for n in args.workers.split(",")):
+            server, url = start(
+                [
+                    "agent_runtime.server",
+                    f"{Path(__file__).resolve()}:agent",
+                    "--port", "0",
+                    "--workers", str(workers),
+                    "--max-concurrency", str(args.max_concurrency),
+                ],
+                env,
+            )
+            try:
+                elapsed, latencies, rejected, errors = asyncio.run(
+                    load(url, args.requests, args.concurrency, args.stream)
+                )
+            finally:
+                server.send_signal(signal.SIGTERM)
+                server.wait(timeout=60)
+            served = len(latencies)
+            p99 = latencies[int(0.99 * (served - 1))] if served else 0.0
+            print(
+                f"{workers:>7}{served / elapsed:>9.1f}{statistics.median(latencies or [0]) * 1000:>9.1f}"
+                f"{p99 * 1000:>9.1f}{rejected:>7}{errors:>8}"
+            )
+    finally:
+        mock.send_signal(signal.SIGINT)
+        mock.wait(timeout=10)
+        os.unlink(script.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Session history I/O per turn: SDK ``SQLiteSession`` vs ``LogSession``.
+
+Run with:  uv run python benchmarks/bench_session.py [--turns 300] [--readers 4]
+
+Each turn does what ``Runner.run(..., session=...)`` does: read the history, then append the
+turn's items (user message, tool call, tool output, reply). "LogSession (fresh)" builds a new
+session object every turn, like a stateless web worker; "LogSession" keeps one per
+conversation and only reads new rows. ``--readers`` threads keep reading other sessions from
+the same file meanwhile.
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import threading
+import time
+
+from agents import SQLiteSession
+
+from agent_runtime import SessionStore
+
+
+def turn_items(i: int) -> list[dict]:
+    text = "Keep the pace easy and build up slowly. " * 8
+    return [
+        {"role": "user", "content": f"Week {i}: what next?"},
+        {"type": "function_call", "call_id": f"c{i}", "name": "plan", "arguments": "{}"},
+        {"type": "function_call_output", "call_id": f"c{i}", "output": text},
+        {"role": "assistant", "content": text},
+    ]
+
+
+async def run_turns(get_session, turns: int) -> tuple[float, float]:
+    start = time.perf_counter()
+    last = 0.0
+    for i in range(turns):
+        t = time.perf_counter()
+        session = get_session()
+        await session.get_items()
+        await session.add_items(turn_items(i))
+        last = time.perf_counter() - t
+    return time.perf_counter() - start, last
+
+
+def background_readers(store: SessionStore, count: int, stop: threading.Event) -> list[threading.Thread]:
+    def read() -> None:
+        while not stop.is_set():
+            store.read("other", 0, None)
+
+    threads = [threading.Thread(target=read, daemon=True) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, default=300)
+    parser.add_argument("--readers", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SessionStore(os.path.join(tmp, "log.sqlite3"))
+        store.append("other", [str(turn_items(0))] * 200)
+        stop = threading.Event()
+        threads = background_readers(store, args.readers, stop)
+
+        sdk_path = os.path.join(tmp, "sdk.sqlite3")
+        reused = store.session("reused")
+        modes = {
+            "SQLiteSession (SDK)": lambda: SQLiteSession("sdk", sdk_path),
+            "LogSession (fresh)": lambda: store.session("fresh"),
+            "LogSession": lambda: reused,
+        }
+        print(f"{'backend':<22}{'turns':>7}{'total s':>9}{'last turn ms':>14}")
+        for label, get_session in modes.items():
+            total, last = await run_turns(get_session, args.turns)
+            print(f"{label:<22}{args.turns:>7}{total:>9.3f}{last * 1000:>14.2f}")
+
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
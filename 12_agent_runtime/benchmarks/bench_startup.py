@@ -0,0 +1,91 @@
+"""Process start-up cost: what each entry point imports, with an ``-X importtime`` breakdown.
+
+Run with:  uv run python benchmarks/bench_startup.py [--runs 5] [--top 12]
+
+Every target runs in a fresh interpreter ``--runs`` times (median wall time), then once more
+under ``python -X importtime`` to attribute import time to top-level packages. "eager
+agent_runtime" imports every submodule, like the package did before its names were resolved
+lazily. The last table compares repeated ``.env`` lookups: ``find_dotenv`` walks the
+directory tree every time, ``load_env`` once.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from dotenv import find_dotenv
+
+from agent_runtime import load_env
+
+TARGETS = {
+    "python (baseline)": "pass",
+    "import agents": "import agents",
+    "import agent_runtime": "import agent_runtime",
+    "lesson imports": "from agent_runtime import get_model, get_run_config; get_run_config(model=get_model())",
+    "eager agent_runtime": "from agent_runtime import *",
+    "agent-run (list)": "import sys; sys.argv = ['agent-run']; from agent_runtime.launcher import main; main()",
+}
+
+
+def run(code: str, *flags: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        [sys.executable, *flags, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+
+
+def import_breakdown(code: str) -> dict[str, float]:
+    """Self time in milliseconds per top-level package, from ``-X importtime``."""
+    by_package: dict[str, float] = defaultdict(float)
+    for line in run(code, "-X", "importtime").stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, module = line.removeprefix("import time:").split("|")
+        by_package[module.strip().split(".")[0]] += int(self_us) / 1000
+    return by_package
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=12)
+    args = parser.parse_args()
+
+    breakdowns = {}
+    print(f"{'target':<24}{'median ms':>11}{'imports ms':>12}{'modules':>9}")
+    for label, code in TARGETS.items():
+        times = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            run(code)
+            times.append((time.perf_counter() - start) * 1000)
+        breakdowns[label] = import_breakdown(code)
+        modules = int(run(f"{code}\nimport sys; print(len(sys.modules))").stdout.split()[-1])
+        print(f"{label:<24}{statistics.median(times):>11.1f}{sum(breakdowns[label].values()):>12.1f}{modules:>9}")
+
+    for label in ("lesson imports", "eager agent_runtime"):
+        print(f"\n-X importtime, {label} (self ms per top-level package):")
+        top = sorted(breakdowns[label].items(), key=lambda item: -item[1])[: args.top]
+        for package, ms in top:
+            print(f"  {package:<28}{ms:>8.1f}")
+
+    start_dir = Path(__file__).resolve().parent
+    os.chdir(start_dir)
+    print(f"\n.env lookup from {start_dir}, 1000 times:")
+    for label, lookup in (("find_dotenv", lambda: find_dotenv(usecwd=True)), ("load_env", load_env)):
+        start = time.perf_counter()
+        for _ in range(1000):
+            lookup()
+        print(f"  {label:<28}{(time.perf_counter() - start) * 1000:>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
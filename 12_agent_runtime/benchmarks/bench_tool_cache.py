@@ -0,0 +1,65 @@
+"""Repeated tool calls with and without ``ToolCache``.
+
+Run with:  uv run python benchmarks/bench_tool_cache.py [--runs 200] [--concurrency 20]
+
+Every run asks about one of ``--cities`` cities; ``get_weather`` awaits ``--lookup`` seconds
+to stand in for a slow upstream API (lesson 11's ``get_weather``), and the model calls it
+twice per run, as models often repeat a call. Runs go ``--concurrency`` at a time, so
+identical calls also overlap and get coalesced.
+"""
+
+import argparse
+import asyncio
+import time
+
+from agents import Agent, Runner, function_tool, set_tracing_disabled
+
+from _support import ScriptedModel
+from agent_runtime import ToolCache
+
+set_tracing_disabled(disabled=True)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--cities", type=int, default=5)
+    parser.add_argument("--lookup", type=float, default=0.05)
+    args = parser.parse_args()
+
+    upstream_calls = 0
+
+    @function_tool
+    async def get_weather(city: str) -> str:
+        """Current weather for a city."""
+        nonlocal upstream_calls
+        upstream_calls += 1
+        await asyncio.sleep(args.lookup)
+        return f"Sunny in {city}"
+
+    tool_cache = ToolCache()
+    modes = {"uncached": get_weather, "ToolCache": tool_cache.wrap(get_weather, ttl=600)}
+
+    print(f"{'mode':<10}{'runs':>6}{'seconds':>9}{'upstream calls':>16}{'hit rate':>10}")
+    for label, tool in modes.items():
+        upstream_calls = 0
+        gate = asyncio.Semaphore(args.concurrency)
+
+        async def one(i: int) -> None:
+            city = f"City {i % args.cities}"
+            model = ScriptedModel(tool_names=["get_weather"], arguments=lambda name: {"city": city}, turns=2)
+            async with gate:
+                await Runner.run(Agent(name="Weather", tools=[tool], model=model), f"Weather in {city}?")
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(args.runs)))
+        elapsed = time.perf_counter() - start
+        stats = tool_cache.stats["get_weather"]
+        hit_rate = f"{stats.hit_rate:.0%}" if label == "ToolCache" else "-"
+        print(f"{label:<10}{args.runs:>6}{elapsed:>9.3f}{upstream_calls:>16}{hit_rate:>10}")
+    print(f"\nToolCache stats: {tool_cache.stats['get_weather']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,65 @@
+"""100 concurrent runs of lesson 05's ``math_agent`` with a blocking ``search`` tool.
+
+Run with:  uv run python benchmarks/bench_tool_runtime.py [--sessions 100] [--block 0.2]
+
+``search`` is ``async`` but calls ``time.sleep``, exactly like the lesson. Inline, every call
+freezes the loop, so total time is sessions x block. Through ``ToolRuntime`` the calls run on
+the thread pool and total time approaches a single block.
+"""
+
+import argparse
+import asyncio
+import time
+
+from agents import Agent, RunContextWrapper, Runner, function_tool, set_tracing_disabled
+
+from _support import ScriptedModel
+from agent_runtime import ToolRuntime
+
+set_tracing_disabled(disabled=True)
+
+
+def make_search(block: float):
+    @function_tool()
+    async def search(local_context: RunContextWrapper, query: str) -> str:
+        """Search for the query."""
+        time.sleep(block)  # blocking call inside an async tool, as in lesson 05
+        return "No results found."
+
+    return search
+
+
+async def run_sessions(agent: Agent, sessions: int) -> float:
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(Runner.run(agent, "search for the best math tutor in my area") for _ in range(sessions))
+    )
+    return time.perf_counter() - start
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--block", type=float, default=0.2, help="seconds search blocks for")
+    args = parser.parse_args()
+
+    model = ScriptedModel(latency=0.01, arguments=lambda name: {"query": "math tutor"})
+    search = make_search(args.block)
+    inline_agent = Agent(name="Genius", instructions="You are a math expert.", tools=[search], model=model)
+
+    runtime = ToolRuntime(max_workers=args.sessions)
+    detected = runtime.wrap(search)  # watchdog decides
+    pooled = runtime.wrap(search, offload=True, max_concurrency=args.sessions)
+
+    print(f"{'mode':<12}{'sessions':>10}{'seconds':>10}{'runs/s':>10}")
+    for label, tool in (("inline", search), ("watchdog", detected), ("offloaded", pooled)):
+        agent = inline_agent.clone(tools=[tool])
+        elapsed = await run_sessions(agent, args.sessions)
+        print(f"{label:<12}{args.sessions:>10}{elapsed:>10.2f}{args.sessions / elapsed:>10.1f}")
+
+    print(f"\nwatchdog stalls: {runtime.watchdog.stalls}, flagged tools: {sorted(runtime.blocking_tools)}")
+    runtime.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,105 @@
+"""Runs with an occasionally hanging ``search`` tool, with and without deadlines.
+
+Run with:  uv run python benchmarks/bench_tool_timeouts.py [--runs 200] [--hang 5] [--timeout 0.5]
+
+Every ``--every``-th call of ``search`` hangs for ``--hang`` seconds (like lesson 05's 30 s
+``search``), the others take 50 ms. The async version awaits, the sync version blocks a pool
+thread; "cooperative" sleeps with ``Deadline.wait`` so its thread is freed at the deadline.
+"still running" counts tool calls still occupying a pool thread when the runs finished.
+"""
+
+import argparse
+import asyncio
+import itertools
+import logging
+import statistics
+import time
+from collections import Counter
+
+from agents import Agent, Runner, function_tool, set_tracing_disabled
+
+from _support import ScriptedModel
+from agent_runtime import ToolRuntime, current_deadline
+
+set_tracing_disabled(disabled=True)
+# Abandoned calls that stop at their deadline end in pool threads without a tracing span.
+logging.getLogger("openai.agents").setLevel(logging.ERROR)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--every", type=int, default=10)
+    parser.add_argument("--hang", type=float, default=5.0)
+    parser.add_argument("--timeout", type=float, default=0.5)
+    args = parser.parse_args()
+
+    calls = itertools.count(1)
+    running = Counter()  # pool threads inside each sync tool
+
+    def duration() -> float:
+        return args.hang if next(calls) % args.every == 0 else 0.05
+
+    @function_tool
+    async def search(query: str) -> str:
+        """Search the web."""
+        await asyncio.sleep(duration())
+        return "No results found."
+
+    @function_tool
+    def search_sync(query: str) -> str:
+        """Search the web."""
+        running["search_sync"] += 1
+        try:
+            time.sleep(duration())
+        finally:
+            running["search_sync"] -= 1
+        return "No results found."
+
+    @function_tool
+    def search_cooperative(query: str) -> str:
+        """Search the web."""
+        running["search_cooperative"] += 1
+        try:
+            deadline = current_deadline()
+            if deadline is not None:
+                deadline.wait(duration())
+            else:
+                time.sleep(duration())
+        finally:
+            running["search_cooperative"] -= 1
+        return "No results found."
+
+    print(f"{'mode':<24}{'mean s':>8}{'p95 s':>8}{'max s':>8}{'timeouts':>10}{'abandoned':>11}{'still running':>15}")
+    for label, tool, timeout in (
+        ("async, no deadline", search, None),
+        ("async", search, args.timeout),
+        ("sync pool, no deadline", search_sync, None),
+        ("sync pool", search_sync, args.timeout),
+        ("sync pool, cooperative", search_cooperative, args.timeout),
+    ):
+        runtime = ToolRuntime(max_workers=args.concurrency)
+        wrapped = runtime.wrap(tool, offload=tool is not search, timeout=timeout)
+        model = ScriptedModel(tool_names=[tool.name], arguments=lambda name: {"query": "math tutor"})
+        agent = Agent(name="Genius", tools=[wrapped], model=model)
+        gate = asyncio.Semaphore(args.concurrency)
+
+        async def one() -> float:
+            async with gate:
+                start = time.perf_counter()
+                await Runner.run(agent, "search for the best math tutor in my area")
+                return time.perf_counter() - start
+
+        latencies = sorted(await asyncio.gather(*(one() for _ in range(args.runs))))
+        await asyncio.sleep(0.05)  # let cooperative threads notice their deadline
+        stats = runtime.stats[tool.name]
+        print(
+            f"{label:<24}{statistics.mean(latencies):>8.3f}{latencies[int(0.95 * len(latencies))]:>8.3f}"
+            f"{latencies[-1]:>8.3f}{stats.timeouts:>10}{stats.abandoned:>11}{running[tool.name]:>15}"
+        )
+        runtime.shutdown(wait=False)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,233 @@
+"""Shared runtime pieces for the agentic-ai lessons.
+
+Names are imported from their submodules on first access, so ``from agent_runtime import
+get_model`` only pays for ``agent_runtime.client`` and short-lived processes (the
+``agent-run`` launcher, batch containers) do not import every feature at startup.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .agent_tools import AgentToolGroup
+    from .background import BackgroundLoop, background_loop, run_sync
+    from .batch import BatchJob, BatchResult, CombinedHooks, RateLimitHooks, TokenBucket, run_batch, run_batch_sync
+    from .budget import (
+        BudgetedModel,
+        BudgetExceeded,
+        BudgetUsage,
+        RunBudget,
+        run_with_budget,
+        run_with_budget_streamed,
+    )
+    from .cache import CacheStats, CachingModel, ResponseCache, request_key
+    from .coalesce import CoalescedStream, CoalesceStats, RunCoalescer
+    from .client import (
+        DEFAULT_MODEL,
+        GEMINI_BASE_URL,
+        ClientSettings,
+        PooledChatCompletionsModel,
+        PooledModelProvider,
+        aclose_clients,
+        configure,
+        get_client,
+        get_model,
+        get_run_config,
+    )
+    from .enablement import EnablementResolver, EnablementStats
+    from .env import find_env, load_env
+    from .hedging import HedgeStats, HedgedModel
+    from .history import HistoryManager, HistoryStats
+    from .instructions import InstructionsCacheInfo, by_agent, cached_instructions
+    from .metrics import (
+        Counter,
+        Gauge,
+        Histogram,
+        MetricsHooks,
+        MetricsRegistry,
+        TTFTModel,
+        default_registry,
+    )
+    from .mock_server import MockServer
+    from .model_wrapper import ModelWrapper
+    from .prerouter import PreRouter, PreRouterStats, Route, RouteDecision
+    from .registry import HandoffRegistry, ToolRegistry
+    from .request_body import BodyEncoder
+    from .resilience import CircuitBreaker, CircuitOpen, RetryBudget, ToolResilience
+    from .server import AgentServer, ServerStats
+    from .session import LogSession, SessionStore, run_in_session, starting_agent
+    from .tool_cache import ToolCache, ToolCacheStats
+    from .tool_runtime import (
+        Deadline,
+        LoopStallWatchdog,
+        ToolRuntime,
+        ToolStats,
+        ToolTimeout,
+        current_deadline,
+    )
+
+_EXPORTS: dict[str, tuple[str, ...]] = {
+    "agent_tools": ("AgentToolGroup",),
+    "background": ("BackgroundLoop", "background_loop", "run_sync"),
+    "batch": (
+        "BatchJob",
+        "BatchResult",
+        "CombinedHooks",
+        "RateLimitHooks",
+        "TokenBucket",
+        "run_batch",
+        "run_batch_sync",
+    ),
+    "budget": (
+        "BudgetedModel",
+        "BudgetExceeded",
+        "BudgetUsage",
+        "RunBudget",
+        "run_with_budget",
+        "run_with_budget_streamed",
+    ),
+    "cache": ("CacheStats", "CachingModel", "ResponseCache", "request_key"),
+    "coalesce": ("CoalescedStream", "CoalesceStats", "RunCoalescer"),
+    "client": (
+        "DEFAULT_MODEL",
+        "GEMINI_BASE_URL",
+        "ClientSettings",
+        "PooledChatCompletionsModel",
+        "PooledModelProvider",
+        "aclose_clients",
+        "configure",
+        "get_client",
+        "get_model",
+        "get_run_config",
+    ),
+    "enablement": ("EnablementResolver", "EnablementStats"),
+    "env": ("find_env", "load_env"),
+    "hedging": ("HedgeStats", "HedgedModel"),
+    "history": ("HistoryManager", "HistoryStats"),
+    "instructions": ("InstructionsCacheInfo", "by_agent", "cached_instructions"),
+    "metrics": (
+        "Counter",
+        "Gauge",
+        "Histogram",
+        "MetricsHooks",
+        "MetricsRegistry",
+        "TTFTModel",
+        "default_registry",
+    ),
+    "mock_server": ("MockServer",),
+    "model_wrapper": ("ModelWrapper",),
+    "prerouter": ("PreRouter", "PreRouterStats", "Route", "RouteDecision"),
+    "registry": ("HandoffRegistry", "ToolRegistry"),
+    "request_body": ("BodyEncoder",),
+    "resilience": ("CircuitBreaker", "CircuitOpen", "RetryBudget", "ToolResilience"),
+    "server": ("AgentServer", "ServerStats"),
+    "session": ("LogSession", "SessionStore", "run_in_session", "starting_agent"),
+    "tool_cache": ("ToolCache", "ToolCacheStats"),
+    "tool_runtime": (
+        "Deadline",
+        "LoopStallWatchdog",
+        "ToolRuntime",
+        "ToolStats",
+        "ToolTimeout",
+        "current_deadline",
+    ),
+}
+_MODULES = {name: module for module, names in _EXPORTS.items() for name in names}
+
+
+def __getattr__(name: str) -> Any:
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
+
+
+__all__ = [
+    "AgentServer",
+    "AgentToolGroup",
+    "BackgroundLoop",
+    "BatchJob",
+    "BatchResult",
+    "BodyEncoder",
+    "BudgetExceeded",
+    "BudgetUsage",
+    "BudgetedModel",
+    "CacheStats",
+    "CachingModel",
+    "CircuitBreaker",
+    "CircuitOpen",
+    "CoalesceStats",
+    "CoalescedStream",
+    "CombinedHooks",
+    "DEFAULT_MODEL",
+    "Deadline",
+    "EnablementResolver",
+    "EnablementStats",
+    "GEMINI_BASE_URL",
+    "ClientSettings",
+    "Counter",
+    "Gauge",
+    "HedgeStats",
+    "HedgedModel",
+    "HandoffRegistry",
+    "Histogram",
+    "HistoryManager",
+    "HistoryStats",
+    "InstructionsCacheInfo",
+    "LogSession",
+    "LoopStallWatchdog",
+    "MetricsHooks",
+    "MetricsRegistry",
+    "MockServer",
+    "ModelWrapper",
+    "PooledChatCompletionsModel",
+    "PooledModelProvider",
+    "PreRouter",
+    "PreRouterStats",
+    "RateLimitHooks",
+    "ResponseCache",
+    "RetryBudget",
+    "RunBudget",
+    "Route",
+    "RouteDecision",
+    "RunCoalescer",
+    "ServerStats",
+    "SessionStore",
+    "TokenBucket",
+    "ToolCache",
+    "ToolCacheStats",
+    "ToolRegistry",
+    "ToolResilience",
+    "ToolRuntime",
+    "ToolStats",
+    "ToolTimeout",
+    "TTFTModel",
+    "aclose_clients",
+    "background_loop",
+    "by_agent",
+    "cached_instructions",
+    "configure",
+    "current_deadline",
+    "default_registry",
+    "find_env",
+    "get_client",
+    "get_model",
+    "get_run_config",
+    "load_env",
+    "request_key",
+    "run_batch",
+    "run_batch_sync",
+    "run_in_session",
+    "run_sync",
+    "run_with_budget",
+    "run_with_budget_streamed",
+    "starting_agent",
+]
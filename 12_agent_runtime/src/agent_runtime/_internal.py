@@ -0,0 +1,174 @@
+"""Small helpers shared by the runtime modules (not part of the public API)."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable, Mapping
+from typing import Any, Generic, TypeVar
+
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+# Prefix of ``agents.tool.default_tool_error_function`` output: the SDK turns tool exceptions
+# into this message, which must not be memoized or treated as a successful result.
+TOOL_ERROR_PREFIX = "An error occurred while running the tool."
+
+
+def to_plain(value: Any) -> Any:
+    """``value`` as plain dicts and lists for a request body, the way the OpenAI client sends it.
+
+    The SDK's converters return iterables and pydantic models inside the params.
+    """
+    if isinstance(value, str | bytes | int | float | bool) or value is None:
+        return value
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", exclude_unset=True)
+    if isinstance(value, Mapping):
+        return {key: to_plain(item) for key, item in value.items()}
+    if isinstance(value, Iterable):
+        return [to_plain(item) for item in value]
+    return value
+
+
+def json_default(value: Any) -> Any:
+    """``json.dumps`` fallback for cache keys: pydantic models as JSON, anything else as repr."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", exclude_unset=True)
+    return repr(value)
+
+
+class PerLoop(Generic[T]):
+    """One ``factory()`` object per event loop, created on first use from that loop.
+
+    asyncio primitives bind to the loop that first waits on them, so a semaphore created at
+    import time breaks as soon as a second loop uses it (``Runner.run_sync`` called twice,
+    the background loop, forked server workers).
+    """
+
+    def __init__(self, factory: Callable[[], T]) -> None:
+        self._factory = factory
+        self._objects: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, T] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            obj = self._objects.get(loop)
+            if obj is None:
+                obj = self._objects[loop] = self._factory()
+            return obj
+
+
+class ByIdentity(Generic[T]):
+    """A map keyed by object identity whose entries go away with their key.
+
+    For per-run state keyed by the run context: ``RunContextWrapper`` is an unhashable
+    dataclass, and a run that raises never reaches the hook that would clean up.
+    ``on_drop(value)`` is called for entries whose key was garbage collected.
+    """
+
+    def __init__(self, on_drop: Callable[[T], None] | None = None) -> None:
+        self._data: dict[int, tuple[weakref.ref[Any], T]] = {}
+        self._on_drop = on_drop
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _drop(self, ident: int) -> None:
+        entry = self._data.pop(ident, None)
+        if entry is not None and self._on_drop is not None:
+            self._on_drop(entry[1])
+
+    def set(self, key: object, value: T) -> None:
+        ident = id(key)
+        entry = self._data.get(ident)
+        ref = entry[0] if entry is not None else weakref.ref(key, lambda _: self._drop(ident))
+        self._data[ident] = (ref, value)
+
+    def get(self, key: object, default: T | None = None) -> T | None:
+        entry = self._data.get(id(key))
+        return default if entry is None else entry[1]
+
+    def pop(self, key: object, default: T | None = None) -> T | None:
+        entry = self._data.pop(id(key), None)
+        return default if entry is None else entry[1]
+
+    def values(self) -> list[T]:
+        return [value for _, value in self._data.values()]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+class LRUCache:
+    """String values by key, least recently used evicted past ``maxsize``, optional ``ttl``.
+
+    Callers count ``hits``/``misses`` themselves where a miss means more than a lookup.
+    """
+
+    def __init__(self, maxsize: int, ttl: float | None) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[str, float]] = OrderedDict()
+
+    def get(self, key: Hashable) -> str | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: Hashable, value: str) -> None:
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+
+class _ThreadRunner:
+    def __init__(self) -> None:
+        self.runner = asyncio.Runner()
+
+    def __del__(self) -> None:
+        # The thread is gone: close its loop (which also closes the pooled clients it opened).
+        try:
+            self.runner.close()
+        except Exception:
+            pass
+
+
+_thread_runners = threading.local()
+
+
+def thread_runner() -> asyncio.Runner:
+    """The calling thread's own long-lived ``asyncio.Runner``.
+
+    Pool threads that run coroutines reuse one loop (and its warm pooled clients) instead of
+    starting a fresh ``asyncio.run`` loop per call.
+    """
+    holder = getattr(_thread_runners, "holder", None)
+    if holder is None:
+        holder = _thread_runners.holder = _ThreadRunner()
+    return holder.runner
@@ -0,0 +1,139 @@
+"""Concurrent sub-agent tools with a shared cap, sibling cancellation and a result cache.
+
+``Agent.as_tool`` turns a sub-agent into a tool whose every call is a full nested
+``Runner.run``. The SDK already runs the tool calls of one turn with ``asyncio.gather``, but
+nothing bounds how many nested runs one orchestrator starts, a failed sub-agent lets its
+siblings keep burning quota, and pure sub-agents (like lesson 09's ``summarizer``) re-run on
+identical input. ``AgentToolGroup.as_tool`` is a drop-in replacement that adds all three::
+
+    agent_tools = AgentToolGroup(max_concurrency=4)
+    translate_to_spanish = agent_tools.as_tool(spanish, "translate_to_spanish", "...")
+    summarize_text = agent_tools.as_tool(summarizer, "summarize_text", "...", cache=True)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from agents import (
+    Agent,
+    AgentBase,
+    FunctionTool,
+    ItemHelpers,
+    RunConfig,
+    RunContextWrapper,
+    RunHooks,
+    Runner,
+    RunResult,
+    function_tool,
+)
+from agents.run import DEFAULT_MAX_TURNS
+
+from ._internal import LRUCache, PerLoop
+
+
+def _tool_name(agent_name: str) -> str:
+    # ``Agent.as_tool``'s default: anything but letters, digits and "_" becomes "_", lowercased.
+    return re.sub(r"[^a-zA-Z0-9_]", "_", agent_name).lower()
+
+
+class AgentToolGroup:
+    """Sub-agent tools of one orchestrator.
+
+    Args:
+        max_concurrency: Nested runs of this group's tools in flight at once, across all runs
+            on the same event loop.
+        cancel_siblings: When a sub-agent fails, cancel the other sub-agents still running for
+            the same orchestrator turn. They answer with a short "cancelled" message and the
+            failure itself is reported to the orchestrator like any tool error.
+        cache_size / cache_ttl: Bounds of the result cache used by ``as_tool(..., cache=True)``.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        cancel_siblings: bool = True,
+        cache_size: int = 256,
+        cache_ttl: float | None = 3600.0,
+    ) -> None:
+        self.max_concurrency = max_concurrency
+        self.cancel_siblings = cancel_siblings
+        self.cache = LRUCache(cache_size, cache_ttl)
+        self._limits = PerLoop(lambda: asyncio.Semaphore(max_concurrency))
+        # In-flight nested runs by orchestrator run (its Usage object is shared by every tool
+        # call of the run and by nothing else).
+        self._running: dict[int, set[asyncio.Task[Any]]] = {}
+
+    def as_tool(
+        self,
+        agent: Agent[Any],
+        tool_name: str | None = None,
+        tool_description: str | None = None,
+        *,
+        cache: bool = False,
+        custom_output_extractor: Callable[[RunResult], Awaitable[str]] | None = None,
+        is_enabled: bool | Callable[[RunContextWrapper[Any], AgentBase], Any] = True,
+        run_config: RunConfig | None = None,
+        max_turns: int | None = None,
+        hooks: RunHooks[Any] | None = None,
+    ) -> FunctionTool:
+        """Like ``Agent.as_tool``; ``cache=True`` reuses answers for identical input.
+
+        Only cache sub-agents whose answer depends on nothing but the input (no tools with side
+        effects, no context-dependent instructions).
+        """
+        name = tool_name or _tool_name(agent.name)
+
+        @function_tool(name_override=name, description_override=tool_description or "", is_enabled=is_enabled)
+        async def run_agent(context: RunContextWrapper[Any], input: str) -> str:
+            if cache:
+                cached = self.cache.get((name, input))
+                if cached is not None:
+                    return cached
+                self.cache.misses += 1
+
+            async def nested() -> str:
+                async with self._limits.get():
+                    result = await Runner.run(
+                        agent,
+                        input,
+                        context=context.context,
+                        run_config=run_config,
+                        max_turns=max_turns if max_turns is not None else DEFAULT_MAX_TURNS,
+                        hooks=hooks,
+                    )
+                if custom_output_extractor:
+                    output = await custom_output_extractor(result)
+                else:
+                    output = ItemHelpers.text_message_outputs(result.new_items)
+                if cache:
+                    self.cache.put((name, input), output)
+                return output
+
+            return await self._run_sibling(id(context.usage), name, nested())
+
+        return run_agent
+
+    async def _run_sibling(self, run_key: int, name: str, coro: Awaitable[str]) -> str:
+        task = asyncio.ensure_future(coro)
+        siblings = self._running.setdefault(run_key, set())
+        siblings.add(task)
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.cancelled() or asyncio.current_task().cancelling():  # type: ignore[union-attr]
+                task.cancel()
+                raise
+            return f"Cancelled: a sibling agent tool failed before {name} finished."
+        except Exception:
+            if self.cancel_siblings:
+                for sibling in siblings - {task}:
+                    sibling.cancel()
+            raise
+        finally:
+            siblings.discard(task)
+            if not siblings:
+                self._running.pop(run_key, None)
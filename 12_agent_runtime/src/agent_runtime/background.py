@@ -0,0 +1,168 @@
+"""One long-lived event loop for synchronous callers.
+
+Lessons 03, 08 and 11 call ``Runner.run_sync`` again and again, and threaded (WSGI) code calls
+it from many threads. Each thread then drives its own event loop, so it gets its own client
+and connection pool, and ``asyncio.run`` callers rebuild the client for every call.
+``BackgroundLoop`` runs a single loop on a daemon thread. Any thread can hand it a run and
+block for the result, and every run shares that loop's warm pooled clients::
+
+    result = run_sync(agent, "What is weather in Lahore", run_config=run_config, timeout=30)
+
+    with ThreadPoolExecutor(8) as pool:          # many threads, one loop, one connection pool
+        results = list(pool.map(lambda q: run_sync(agent, q), questions))
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import os
+import threading
+import weakref
+from collections.abc import Coroutine
+from concurrent.futures import Future
+from typing import Any, TypeVar
+
+from agents import Agent, Runner, RunResult
+from agents.items import TResponseInputItem
+
+from .client import aclose_clients
+
+T = TypeVar("T")
+
+
+class BackgroundLoop:
+    """An event loop on its own daemon thread, started on first use.
+
+    Args:
+        timeout: Default seconds to wait in ``call`` / ``run_sync`` (``None``: no limit).
+        name: Name of the loop thread.
+    """
+
+    def __init__(self, timeout: float | None = None, name: str = "agent-loop") -> None:
+        self.timeout = timeout
+        self.name = name
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+        ref = weakref.ref(self)
+
+        def reset_in_child() -> None:
+            # The loop thread does not survive a fork; the child starts its own on first use.
+            if (background := ref()) is not None:
+                background._loop = background._thread = None
+                background._lock = threading.Lock()
+
+        if hasattr(os, "register_at_fork"):  # not on Windows
+            os.register_at_fork(after_in_child=reset_in_child)
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+                self._thread = threading.Thread(
+                    target=self._run, args=(loop, ready), name=self.name, daemon=True
+                )
+                self._thread.start()
+                ready.wait()
+                self._loop = loop
+            return self._loop
+
+    @staticmethod
+    def _run(loop: asyncio.AbstractEventLoop, ready: threading.Event) -> None:
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+        try:
+            loop.run_forever()
+            # Like asyncio.run(): whatever is still running is cancelled and allowed to clean up.
+            tasks = asyncio.all_tasks(loop)
+            for task in tasks:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            loop.close()
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> Future[T]:
+        """Schedule ``coro`` on the loop and return a thread-safe future for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def call(self, coro: Coroutine[Any, Any, T], timeout: float | None = None) -> T:
+        """Run ``coro`` on the loop and block until it is done.
+
+        After ``timeout`` seconds (default ``self.timeout``) it is cancelled and ``TimeoutError``
+        is raised. Must not be called from a thread that is running an event loop.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            coro.close()
+            raise RuntimeError(
+                "BackgroundLoop.call() cannot be called while an event loop is running; await instead"
+            )
+        timeout = self.timeout if timeout is None else timeout
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            if future.done():
+                raise  # the coroutine's own TimeoutError
+            future.cancel()
+            raise TimeoutError(f"Did not finish within {timeout:g} seconds") from None
+        except BaseException:
+            future.cancel()  # e.g. KeyboardInterrupt: do not leave the run behind on the loop
+            raise
+
+    def run_sync(
+        self,
+        starting_agent: Agent[Any],
+        input: str | list[TResponseInputItem],
+        *,
+        timeout: float | None = None,
+        **run_kwargs: Any,
+    ) -> RunResult:
+        """``Runner.run_sync`` on this loop, safe to call from any number of threads."""
+        return self.call(Runner.run(starting_agent, input, **run_kwargs), timeout)
+
+    def close(self, timeout: float | None = 5.0) -> None:
+        """Close the loop's shared clients and stop the loop thread."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or thread is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(aclose_clients(), loop).result(timeout)
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+
+
+_default: BackgroundLoop | None = None
+_default_lock = threading.Lock()
+
+
+def background_loop() -> BackgroundLoop:
+    """The process-wide ``BackgroundLoop`` behind ``run_sync``."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = BackgroundLoop()
+            atexit.register(_default.close)
+        return _default
+
+
+def run_sync(
+    starting_agent: Agent[Any],
+    input: str | list[TResponseInputItem],
+    *,
+    timeout: float | None = None,
+    **run_kwargs: Any,
+) -> RunResult:
+    """Drop-in for ``Runner.run_sync`` that runs on the shared background loop."""
+    return background_loop().run_sync(starting_agent, input, timeout=timeout, **run_kwargs)
@@ -0,0 +1,226 @@
+"""Concurrent batch runner with bounded parallelism and token-bucket rate limiting.
+
+Lesson 08 evaluates its agent families with a loop of ``Runner.run_sync``, so wall time is
+the sum of every model latency. ``run_batch`` runs many (agent, input, context) jobs on one
+event loop with a concurrency cap, and paces every model call through requests-per-minute
+and tokens-per-minute buckets so large evaluation jobs stay inside the Gemini quota.
+Results are yielded in completion order.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass
+from typing import Any
+
+from agents import Agent, ModelResponse, RunConfig, RunHooks, Runner, RunResult
+from agents.items import TResponseInputItem
+
+from ._internal import ByIdentity
+from .background import background_loop
+
+
+class TokenBucket:
+    """Async token bucket refilled continuously at ``per_minute`` tokens per minute.
+
+    ``capacity`` is the largest burst: by default ``burst_seconds`` worth of tokens (at least
+    one), so the first minute cannot see much more than ``per_minute`` either. ``acquire``
+    waits until the tokens are available; a request larger than ``capacity`` waits for a full
+    bucket and leaves it in debt. ``adjust`` corrects an earlier estimate once the real cost is
+    known and may leave the bucket in debt too; later callers wait it out.
+    """
+
+    def __init__(
+        self, per_minute: float, capacity: float | None = None, burst_seconds: float = 1.0
+    ) -> None:
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else max(1.0, self.rate * burst_seconds)
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        needed = min(amount, self.capacity)
+        async with self._lock:  # FIFO: one waiter at a time
+            self._refill()
+            while self.tokens < needed:
+                await asyncio.sleep((needed - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= amount
+
+    def adjust(self, delta: float) -> None:
+        """Add (positive) or charge (negative) tokens without waiting."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + delta)
+
+
+def estimate_tokens(system_prompt: str | None, input_items: list[TResponseInputItem]) -> int:
+    """Rough prompt size (about four characters per token)."""
+    chars = len(system_prompt or "") + sum(len(str(item)) for item in input_items)
+    return chars // 4 + 1
+
+
+class RateLimitHooks(RunHooks[Any]):
+    """Run hooks that pace every model call through RPM/TPM buckets.
+
+    Before a call one request and the estimated prompt tokens are taken; afterwards the
+    TPM bucket is corrected with the real ``usage.total_tokens``. A call that raises keeps its
+    estimate charged (the provider may well have counted it).
+    """
+
+    def __init__(self, requests: TokenBucket | None, tokens: TokenBucket | None) -> None:
+        self.requests = requests
+        self.tokens = tokens
+        # By run context: the entry of a run that fails mid-call goes away with the run.
+        self._estimates: ByIdentity[int] = ByIdentity()
+
+    async def on_llm_start(self, context, agent, system_prompt, input_items) -> None:
+        if self.requests is not None:
+            await self.requests.acquire(1)
+        if self.tokens is not None:
+            estimate = estimate_tokens(system_prompt, input_items)
+            self._estimates.set(context, estimate)
+            await self.tokens.acquire(estimate)
+
+    async def on_llm_end(self, context, agent, response: ModelResponse) -> None:
+        if self.tokens is not None:
+            estimate = self._estimates.pop(context, 0)
+            self.tokens.adjust(estimate - response.usage.total_tokens)
+
+
+class CombinedHooks(RunHooks[Any]):
+    """Run hooks that call each of ``hooks`` in turn."""
+
+    def __init__(self, *hooks: RunHooks[Any]) -> None:
+        self.hooks = hooks
+
+    async def on_llm_start(self, *args: Any) -> None:
+        for hooks in self.hooks:
+            await hooks.on_llm_start(*args)
+
+    async def on_llm_end(self, *args: Any) -> None:
+        for hooks in self.hooks:
+            await hooks.on_llm_end(*args)
+
+    async def on_agent_start(self, *args: Any) -> None:
+        for hooks in self.hooks:
+            await hooks.on_agent_start(*args)
+
+    async def on_agent_end(self, *args: Any) -> None:
+        for hooks in self.hooks:
+            await hooks.on_agent_end(*args)
+
+    async def on_handoff(self, *args: Any) -> None:
+        for hooks in self.hooks:
+            await hooks.on_handoff(*args)
+
+    async def on_tool_start(self, *args: Any) -> None:
+        for hooks in self.hooks:
+            await hooks.on_tool_start(*args)
+
+    async def on_tool_end(self, *args: Any) -> None:
+        for hooks in self.hooks:
+            await hooks.on_tool_end(*args)
+
+
+@dataclass
+class BatchJob:
+    agent: Agent[Any]
+    input: str | list[TResponseInputItem]
+    context: Any = None
+    id: Any = None
+    """Caller's label for the job; defaults to its position in the batch."""
+
+
+@dataclass
+class BatchResult:
+    job: BatchJob
+    result: RunResult | None
+    error: BaseException | None
+    elapsed: float
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+async def run_batch(
+    jobs: Iterable[BatchJob],
+    *,
+    max_concurrency: int = 8,
+    requests_per_minute: float | None = None,
+    tokens_per_minute: float | None = None,
+    run_config: RunConfig | None = None,
+    max_turns: int = 10,
+    hooks: RunHooks[Any] | None = None,
+) -> AsyncIterator[BatchResult]:
+    """Run ``jobs`` concurrently and yield a ``BatchResult`` for each as it finishes.
+
+    ``jobs`` is consumed lazily, so it can be a generator over thousands of prompts. A failing
+    job is reported through ``BatchResult.error`` and does not stop the batch; an error raised
+    by ``jobs`` itself is raised here. ``hooks`` run alongside the rate limiting ones.
+    """
+    rate_limits = RateLimitHooks(
+        TokenBucket(requests_per_minute) if requests_per_minute else None,
+        TokenBucket(tokens_per_minute) if tokens_per_minute else None,
+    )
+    run_hooks = rate_limits if hooks is None else CombinedHooks(rate_limits, hooks)
+    pending = iter(enumerate(jobs))
+    results: asyncio.Queue[BatchResult | Exception | None] = asyncio.Queue()
+
+    async def worker() -> None:
+        try:
+            for index, job in pending:
+                if job.id is None:
+                    job.id = index
+                start = time.perf_counter()
+                try:
+                    result = await Runner.run(
+                        job.agent,
+                        job.input,
+                        context=job.context,
+                        max_turns=max_turns,
+                        hooks=run_hooks,
+                        run_config=run_config,
+                    )
+                    outcome = BatchResult(job, result, None, time.perf_counter() - start)
+                except Exception as e:
+                    outcome = BatchResult(job, None, e, time.perf_counter() - start)
+                await results.put(outcome)
+        except Exception as e:  # raised by the jobs iterable
+            results.put_nowait(e)
+        finally:
+            results.put_nowait(None)
+
+    workers = [asyncio.create_task(worker()) for _ in range(max_concurrency)]
+    try:
+        finished = 0
+        while finished < len(workers):
+            outcome = await results.get()
+            if outcome is None:
+                finished += 1
+            elif isinstance(outcome, Exception):
+                raise outcome
+            else:
+                yield outcome
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+
+def run_batch_sync(jobs: Iterable[BatchJob], **kwargs: Any) -> list[BatchResult]:
+    """Blocking helper: run the batch on the shared background loop (``run_sync``'s, so its
+    warm clients are reused), results in completion order."""
+
+    async def collect() -> list[BatchResult]:
+        return [outcome async for outcome in run_batch(jobs, **kwargs)]
+
+    return background_loop().call(collect())
@@ -0,0 +1,371 @@
+"""Run-level budgets for latency, tokens and tool calls.
+
+``max_turns`` (lesson 11, ``part2.py`` and ``mini-lab.py``) raises ``MaxTurnsExceeded`` only
+after the time and tokens are spent, and throws the work away. A ``RunBudget`` is checked
+before every model call instead. Once any part of it is ``soft_limit`` used up (or all tool
+calls are used), the next call is made with ``tool_choice="none"`` so the agent answers with
+what it has. Time and tokens are also forecast from the average model call so far: when two
+more calls would not fit, the next one must answer, and when even one would not, the run
+raises ``BudgetExceeded`` instead of making it. A call that still goes past a limit raises
+too, so time and token limits are hard caps. The tool call limit is checked per call: calls the
+model makes in parallel past ``max_tool_calls`` are not run and tell the model so::
+
+    budget = RunBudget(deadline=20, max_total_tokens=8000, max_tool_calls=5)
+    result = await run_with_budget(agent, "What is the weather in Lahore?", budget)
+    print(result.budget)  # BudgetUsage(elapsed=..., total_tokens=..., tool_calls=..., ...)
+
+    result = run_with_budget_streamed(agent, "What is the weather in Lahore?", budget)
+    async for event in result.stream_events(): ...
+
+The model calls of the run go through ``BudgetedModel`` wrappers, which find the run's budget in
+a context variable, so concurrent runs with different budgets can share one model.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import dataclasses
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from agents import (
+    Agent,
+    AgentsException,
+    FunctionTool,
+    Handoff,
+    Model,
+    ModelResponse,
+    RunConfig,
+    Runner,
+    RunResult,
+    RunResultStreaming,
+)
+from agents.items import TResponseInputItem, TResponseStreamEvent
+from agents.tool_context import ToolContext
+
+from .model_wrapper import ModelWrapper
+
+
+@dataclass(frozen=True)
+class RunBudget:
+    """Limits for one run; ``None`` leaves a dimension unlimited.
+
+    Args:
+        deadline: Wall-clock seconds for the whole run.
+        max_input_tokens: Input tokens over all model calls.
+        max_output_tokens: Output tokens over all model calls.
+        max_total_tokens: Input plus output tokens.
+        max_tool_calls: Function tool calls run for the model (handoffs not included); calls
+            past it are refused one by one, parallel calls of one turn included.
+        soft_limit: Fraction of any limit after which the agent is made to answer.
+    """
+
+    deadline: float | None = None
+    max_input_tokens: int | None = None
+    max_output_tokens: int | None = None
+    max_total_tokens: int | None = None
+    max_tool_calls: int | None = None
+    soft_limit: float = 0.8
+
+
+@dataclass
+class BudgetUsage:
+    """What a run consumed, and how that compares with its ``RunBudget``."""
+
+    budget: RunBudget = field(repr=False)
+    started_at: float = field(default_factory=time.monotonic, repr=False)
+    elapsed: float = 0.0
+    model_calls: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    tool_calls: int = 0
+    refused_tool_calls: int = 0
+    """Tool calls not run because ``max_tool_calls`` was used up."""
+    forced_final: bool = False
+    """Whether a model call was made with ``tool_choice="none"`` to wrap the run up."""
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+    def fractions(self) -> dict[str, float]:
+        """Share of each configured limit used so far (1.0 = all of it)."""
+        budget = self.budget
+        self.elapsed = time.monotonic() - self.started_at
+        used = {
+            "deadline": (self.elapsed, budget.deadline),
+            "input_tokens": (self.input_tokens, budget.max_input_tokens),
+            "output_tokens": (self.output_tokens, budget.max_output_tokens),
+            "total_tokens": (self.total_tokens, budget.max_total_tokens),
+            "tool_calls": (self.tool_calls, budget.max_tool_calls),
+        }
+        return {name: value / limit for name, (value, limit) in used.items() if limit is not None}
+
+    def forecast(self) -> dict[str, float]:
+        """Share of each configured limit one more average model call would use."""
+        budget, calls = self.budget, self.model_calls
+        if not calls:
+            return {}
+        per_call = {
+            "deadline": (self.elapsed, budget.deadline),
+            "input_tokens": (self.input_tokens, budget.max_input_tokens),
+            "output_tokens": (self.output_tokens, budget.max_output_tokens),
+            "total_tokens": (self.total_tokens, budget.max_total_tokens),
+        }
+        return {
+            name: value / calls / limit
+            for name, (value, limit) in per_call.items()
+            if limit is not None
+        }
+
+    @property
+    def consumed(self) -> float:
+        """Share of the most used limit."""
+        return max(self.fractions().values(), default=0.0)
+
+
+class BudgetExceeded(AgentsException):
+    """A run went past a hard limit of its ``RunBudget``."""
+
+    def __init__(self, message: str, usage: BudgetUsage) -> None:
+        super().__init__(message)
+        self.message = message
+        self.usage = usage
+
+
+_usage: contextvars.ContextVar[BudgetUsage | None] = contextvars.ContextVar("run_budget", default=None)
+
+
+class BudgetedModel(ModelWrapper):
+    """Enforces the current run's budget around every model call (no budget: pass-through)."""
+
+    def _before_call(self, model_settings: Any, tools: list[Any]) -> tuple[BudgetUsage | None, Any]:
+        usage = _usage.get()
+        if usage is None:
+            return None, model_settings
+        fractions = usage.fractions()
+        forecast = usage.forecast()
+        # Tool calls only ever force the final answer; time and tokens cannot be stretched.
+        # Tokens are not made up for later: a call the forecast says will not fit is not made.
+        over = [
+            name
+            for name, used in fractions.items()
+            if name != "tool_calls"
+            and (used >= 1.0 or name.endswith("tokens") and used + forecast.get(name, 0.0) > 1.0)
+        ]
+        if over:
+            raise BudgetExceeded(f"Run budget exhausted: {', '.join(over)}", usage)
+        nearly = any(used >= usage.budget.soft_limit for used in fractions.values())
+        # Another tool turn only makes sense if a turn after it still fits.
+        nearly = nearly or any(fractions[name] + 2 * share > 1.0 for name, share in forecast.items())
+        tools_left = usage.budget.max_tool_calls is None or usage.tool_calls < usage.budget.max_tool_calls
+        if tools and (nearly or not tools_left):
+            usage.forced_final = True
+            model_settings = dataclasses.replace(model_settings, tool_choice="none")
+        return usage, model_settings
+
+    @staticmethod
+    def _record(usage: BudgetUsage, input_tokens: int, output_tokens: int) -> None:
+        usage.model_calls += 1
+        usage.input_tokens += input_tokens
+        usage.output_tokens += output_tokens
+        over = [
+            name for name, used in usage.fractions().items() if used > 1.0 and name.endswith("tokens")
+        ]
+        if over:
+            raise BudgetExceeded(f"Run budget exceeded: {', '.join(over)}", usage)
+
+    def _time_left(self, usage: BudgetUsage | None) -> float | None:
+        if usage is None or usage.budget.deadline is None:
+            return None
+        return usage.budget.deadline - (time.monotonic() - usage.started_at)
+
+    async def get_response(
+        self, system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs: Any
+    ) -> ModelResponse:
+        usage, model_settings = self._before_call(model_settings, tools)
+        scope = asyncio.timeout(self._time_left(usage))
+        try:
+            async with scope:
+                response = await self.model.get_response(
+                    system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs
+                )
+        except TimeoutError:
+            if usage is None or not scope.expired():
+                raise
+            raise BudgetExceeded("Run budget exhausted: deadline", usage) from None
+        if usage is not None:
+            self._record(usage, response.usage.input_tokens, response.usage.output_tokens)
+        return response
+
+    async def stream_response(
+        self, system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs: Any
+    ) -> AsyncIterator[TResponseStreamEvent]:
+        usage, model_settings = self._before_call(model_settings, tools)
+        stream = self.model.stream_response(
+            system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs
+        )
+        time_left = self._time_left(usage)
+        # The deadline covers each wait for the next event; a timeout scope around the whole
+        # loop would also cancel the consumer while it handles an event.
+        deadline = None if time_left is None else asyncio.get_running_loop().time() + time_left
+        try:
+            while True:
+                scope = asyncio.timeout_at(deadline)
+                try:
+                    async with scope:
+                        event = await anext(stream)
+                except StopAsyncIteration:
+                    return
+                except TimeoutError:
+                    if usage is None or not scope.expired():
+                        raise
+                    raise BudgetExceeded("Run budget exhausted: deadline", usage) from None
+                if usage is not None and event.type == "response.completed":
+                    tokens = event.response.usage
+                    self._record(
+                        usage, tokens.input_tokens if tokens else 0, tokens.output_tokens if tokens else 0
+                    )
+                yield event
+        finally:
+            aclose = getattr(stream, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+
+def _refused(usage: BudgetUsage) -> str:
+    return (
+        f"Tool call not made: this run's budget of {usage.budget.max_tool_calls} tool calls is used "
+        "up. Answer with what you have."
+    )
+
+
+class _BudgetedAgents:
+    """Clones of the agents a run can reach, with budgeted models and function tools.
+
+    Each clone's model is wrapped in ``BudgetedModel`` (unless ``run_config.model`` replaces
+    them all) and its function tools count against ``max_tool_calls`` as they run. The originals
+    are left alone; handoffs (plain agents or ``Handoff`` objects) lead to the clones, so every
+    agent of the run is budgeted with its own model.
+    """
+
+    def __init__(self, run_config: RunConfig) -> None:
+        self.run_config = run_config
+        self._agents: dict[int, Agent[Any]] = {}
+        self._models: dict[int, BudgetedModel] = {}
+        self._tools: dict[int, FunctionTool] = {}
+
+    def model(self, model: str | Model | None) -> BudgetedModel:
+        if not isinstance(model, Model):
+            model = self.run_config.model_provider.get_model(model)
+        if isinstance(model, BudgetedModel):
+            return model
+        wrapped = self._models.get(id(model))
+        if wrapped is None:
+            wrapped = self._models[id(model)] = BudgetedModel(model)
+        return wrapped
+
+    def agent(self, agent: Agent[Any]) -> Agent[Any]:
+        clone = self._agents.get(id(agent))
+        if clone is None:
+            model = agent.model if self.run_config.model is not None else self.model(agent.model)
+            clone = self._agents[id(agent)] = agent.clone(
+                model=model, tools=[self._tool(t) for t in agent.tools]
+            )
+            clone.handoffs = [self._handoff(h) for h in agent.handoffs]
+        return clone
+
+    def _tool(self, tool: Any) -> Any:
+        if not isinstance(tool, FunctionTool):
+            return tool
+        wrapped = self._tools.get(id(tool))
+        if wrapped is not None:
+            return wrapped
+        invoke = tool.on_invoke_tool
+
+        async def on_invoke_tool(ctx: ToolContext[Any], args: str) -> Any:
+            # Counted as each call starts: the parallel calls of one turn run concurrently.
+            usage = _usage.get()
+            if usage is not None:
+                limit = usage.budget.max_tool_calls
+                if limit is not None and usage.tool_calls >= limit:
+                    usage.refused_tool_calls += 1
+                    return _refused(usage)
+                usage.tool_calls += 1
+            return await invoke(ctx, args)
+
+        wrapped = self._tools[id(tool)] = dataclasses.replace(tool, on_invoke_tool=on_invoke_tool)
+        return wrapped
+
+    def _handoff(self, handoff: Agent[Any] | Handoff[Any, Any]) -> Agent[Any] | Handoff[Any, Any]:
+        if isinstance(handoff, Agent):
+            return self.agent(handoff)
+        invoke = handoff.on_invoke_handoff
+
+        async def on_invoke_handoff(context: Any, arguments: str) -> Agent[Any]:
+            return self.agent(await invoke(context, arguments))
+
+        return dataclasses.replace(handoff, on_invoke_handoff=on_invoke_handoff)
+
+
+def _budgeted(starting_agent: Agent[Any], run_kwargs: dict[str, Any]) -> Agent[Any]:
+    run_config = run_kwargs.get("run_config") or RunConfig()
+    if run_config.model is not None:
+        model = run_config.model
+        if isinstance(model, str):
+            model = run_config.model_provider.get_model(model)
+        if not isinstance(model, BudgetedModel):
+            run_config = dataclasses.replace(run_config, model=BudgetedModel(model))
+    run_kwargs["run_config"] = run_config
+    return _BudgetedAgents(run_config).agent(starting_agent)
+
+
+async def run_with_budget(
+    starting_agent: Agent[Any],
+    input: str | list[TResponseInputItem],
+    budget: RunBudget,
+    **run_kwargs: Any,
+) -> RunResult:
+    """``Runner.run`` under ``budget``; the result carries a ``budget`` (``BudgetUsage``).
+
+    The run works on clones of the starting agent and the agents it hands off to (so
+    ``result.last_agent`` is a clone), each with its own model wrapped in a ``BudgetedModel``
+    and its function tools counted. A ``run_config.model`` applies to all agents anyway and is
+    wrapped itself. Raises ``BudgetExceeded`` past a hard limit.
+    """
+    starting_agent = _budgeted(starting_agent, run_kwargs)
+    usage = BudgetUsage(budget)
+    token = _usage.set(usage)
+    try:
+        result = await Runner.run(starting_agent, input, **run_kwargs)
+    finally:
+        _usage.reset(token)
+        usage.fractions()  # final elapsed time
+    result.budget = usage  # type: ignore[attr-defined]
+    return result
+
+
+def run_with_budget_streamed(
+    starting_agent: Agent[Any],
+    input: str | list[TResponseInputItem],
+    budget: RunBudget,
+    **run_kwargs: Any,
+) -> RunResultStreaming:
+    """``Runner.run_streamed`` under ``budget``, like ``run_with_budget``.
+
+    ``result.budget`` fills in as the run streams; ``BudgetExceeded`` comes out of
+    ``stream_events()``.
+    """
+    starting_agent = _budgeted(starting_agent, run_kwargs)
+    usage = BudgetUsage(budget)
+    # The run's task copies the context when it is created, budget included.
+    token = _usage.set(usage)
+    try:
+        result = Runner.run_streamed(starting_agent, input, **run_kwargs)
+    finally:
+        _usage.reset(token)
+    result.budget = usage  # type: ignore[attr-defined]
+    return result
@@ -0,0 +1,406 @@
+"""Exact-match response cache for deterministic agents.
+
+Low-temperature agents such as ``agent_cold`` (lesson 04) or ``precise_agent`` (lesson 08)
+see the same prompts again and again. ``CachingModel`` answers repeats from a
+``ResponseCache``: an in-memory LRU in front of an optional SQLite file, both with TTLs and
+size-based eviction. Requests above ``max_temperature`` (like ``agent_hot``) bypass it.
+
+Entries are stored as versioned JSON, so a cache file outlives SDK and pydantic upgrades: an
+entry written in another format, or one that no longer loads, is dropped and counted as a miss.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any
+
+from agents import FunctionTool, Handoff, Model, ModelResponse, ModelSettings, Tool, Usage
+from agents.agent_output import AgentOutputSchemaBase
+from agents.items import TResponseInputItem, TResponseStreamEvent
+from openai.types.responses import ResponseOutputItem
+from openai.types.responses.response_usage import InputTokensDetails, OutputTokensDetails
+from pydantic import TypeAdapter
+
+from ._internal import json_default
+from .model_wrapper import ModelWrapper
+
+logger = logging.getLogger("agent_runtime")
+
+# Bump when the stored layout changes; entries in any other format are treated as misses.
+CACHE_FORMAT = 1
+_output_items = TypeAdapter(list[ResponseOutputItem])
+
+
+def encode_response(response: ModelResponse) -> bytes:
+    """``response`` as versioned JSON."""
+    usage = response.usage
+    return json.dumps(
+        {
+            "format": CACHE_FORMAT,
+            "output": [item.model_dump(mode="json") for item in response.output],
+            "usage": {
+                "requests": usage.requests,
+                "input_tokens": usage.input_tokens,
+                "input_tokens_details": usage.input_tokens_details.model_dump(mode="json"),
+                "output_tokens": usage.output_tokens,
+                "output_tokens_details": usage.output_tokens_details.model_dump(mode="json"),
+                "total_tokens": usage.total_tokens,
+            },
+            "response_id": response.response_id,
+        },
+        ensure_ascii=False,
+    ).encode()
+
+
+def decode_response(blob: bytes) -> ModelResponse:
+    """Inverse of ``encode_response``; raises ``ValueError`` for any other format."""
+    data = json.loads(blob)
+    if not isinstance(data, dict) or data.get("format") != CACHE_FORMAT:
+        raise ValueError("not a cache entry in the current format")
+    usage = data["usage"]
+    return ModelResponse(
+        output=_output_items.validate_python(data["output"]),
+        usage=Usage(
+            requests=usage["requests"],
+            input_tokens=usage["input_tokens"],
+            input_tokens_details=InputTokensDetails.model_validate(usage["input_tokens_details"]),
+            output_tokens=usage["output_tokens"],
+            output_tokens_details=OutputTokensDetails.model_validate(usage["output_tokens_details"]),
+            total_tokens=usage["total_tokens"],
+        ),
+        response_id=data["response_id"],
+    )
+
+
+def _tool_fingerprint(tool: Tool) -> Any:
+    if isinstance(tool, FunctionTool):
+        return [tool.name, tool.description, tool.params_json_schema, tool.strict_json_schema]
+    return [type(tool).__name__, getattr(tool, "name", None)]
+
+
+def request_key(
+    model_name: str,
+    system_instructions: str | None,
+    input: str | list[TResponseInputItem],
+    model_settings: ModelSettings,
+    tools: list[Tool],
+    output_schema: AgentOutputSchemaBase | None,
+    handoffs: list[Handoff],
+    prompt: Any = None,
+) -> str:
+    """Stable hash of everything that decides what the model will answer."""
+    payload = {
+        "model": model_name,
+        "instructions": system_instructions,
+        "input": input,
+        "settings": model_settings.to_json_dict(),
+        "tools": [_tool_fingerprint(t) for t in tools],
+        "handoffs": [[h.tool_name, h.tool_description, h.input_json_schema] for h in handoffs],
+        "output": (
+            None
+            if output_schema is None or output_schema.is_plain_text()
+            else [output_schema.name(), output_schema.json_schema()]
+        ),
+    }
+    if prompt is not None:  # left out otherwise, so keys written before it was added still match
+        payload["prompt"] = prompt
+    encoded = json.dumps(payload, sort_keys=True, default=json_default, ensure_ascii=False)
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    bypasses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class LRUTier:
+    """In-memory LRU bounded by entry count and total payload bytes."""
+
+    def __init__(self, max_entries: int, max_bytes: int, stats: CacheStats) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._stats = stats
+        self._entries: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, now: float) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        blob, expires_at = entry
+        if expires_at <= now:
+            self._remove(key)
+            self._stats.expirations += 1
+            return None
+        self._entries.move_to_end(key)
+        return blob
+
+    def put(self, key: str, blob: bytes, expires_at: float) -> None:
+        if len(blob) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (blob, expires_at)
+        self.size += len(blob)
+        while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self._stats.evictions += 1
+
+    def discard(self, key: str) -> None:
+        if key in self._entries:
+            self._remove(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size = 0
+
+    def _remove(self, key: str) -> None:
+        blob, _ = self._entries.pop(key)
+        self.size -= len(blob)
+
+
+class SQLiteTier:
+    """Persistent tier: one SQLite file (WAL, memory-mapped), evicting least-recently used."""
+
+    def __init__(self, path: str | Path, max_bytes: int, stats: CacheStats) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._stats = stats
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(f"PRAGMA mmap_size={max_bytes}")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL,"
+            " expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses(accessed_at)")
+        self.size = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def get(self, key: str, now: float) -> bytes | None:
+        row = self._db.execute(
+            "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        blob, expires_at = row
+        if expires_at <= now:
+            self._delete(key, len(blob))
+            self._stats.expirations += 1
+            return None
+        self._db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        return blob
+
+    def put(self, key: str, blob: bytes, expires_at: float, now: float) -> None:
+        if len(blob) > self.max_bytes:
+            return
+        old = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+        self._db.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+            (key, blob, len(blob), expires_at, now),
+        )
+        self.size += len(blob) - (old[0] if old else 0)
+        if self.size > self.max_bytes:
+            self._evict(now)
+
+    def discard(self, key: str) -> None:
+        row = self._db.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            self._delete(key, row[0])
+
+    def clear(self) -> None:
+        self._db.execute("DELETE FROM responses")
+        self.size = 0
+
+    def close(self) -> None:
+        self._db.close()
+
+    def _delete(self, key: str, size: int) -> None:
+        self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+        self.size -= size
+
+    def _evict(self, now: float) -> None:
+        expired = self._db.execute(
+            "DELETE FROM responses WHERE expires_at <= ? RETURNING size", (now,)
+        ).fetchall()
+        self._stats.expirations += len(expired)
+        self.size -= sum(size for (size,) in expired)
+        for key, size in self._db.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at"
+        ).fetchall():
+            if self.size <= self.max_bytes:
+                break
+            self._delete(key, size)
+            self._stats.evictions += 1
+
+
+class ResponseCache:
+    """Two-tier cache of ``ModelResponse`` objects keyed by ``request_key``.
+
+    Args:
+        ttl: Seconds an entry stays valid.
+        max_entries: Memory-tier entry limit.
+        max_memory_bytes: Memory-tier limit on encoded response bytes.
+        path: SQLite file for the persistent tier; ``None`` keeps the cache in memory only.
+        max_disk_bytes: Persistent-tier size limit.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 3600.0,
+        max_entries: int = 1024,
+        max_memory_bytes: int = 64 * 1024 * 1024,
+        path: str | Path | None = None,
+        max_disk_bytes: int = 512 * 1024 * 1024,
+    ) -> None:
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self.memory = LRUTier(max_entries, max_memory_bytes, self.stats)
+        self.disk = SQLiteTier(path, max_disk_bytes, self.stats) if path is not None else None
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> ModelResponse | None:
+        now = time.time()
+        with self._lock:
+            blob = self.memory.get(key, now)
+            if blob is not None:
+                response = self._load(key, blob)
+                if response is not None:
+                    self.stats.memory_hits += 1
+                    return response
+                self.memory.discard(key)
+            if self.disk is not None:
+                blob = self.disk.get(key, now)
+                if blob is not None:
+                    response = self._load(key, blob)
+                    if response is not None:
+                        self.stats.disk_hits += 1
+                        self.memory.put(key, blob, now + self.ttl)
+                        return response
+                    self.disk.discard(key)
+            self.stats.misses += 1
+            return None
+
+    @staticmethod
+    def _load(key: str, blob: bytes) -> ModelResponse | None:
+        try:
+            return decode_response(blob)
+        except Exception as e:  # another format or version, or a damaged entry
+            logger.warning("Dropping unreadable response cache entry %s: %s", key[:12], e)
+            return None
+
+    def put(self, key: str, response: ModelResponse) -> None:
+        blob = encode_response(response)
+        now = time.time()
+        with self._lock:
+            self.memory.put(key, blob, now + self.ttl)
+            if self.disk is not None:
+                self.disk.put(key, blob, now + self.ttl, now)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.memory.clear()
+            if self.disk is not None:
+                self.disk.clear()
+
+    def close(self) -> None:
+        if self.disk is not None:
+            self.disk.close()
+
+
+class CachingModel(ModelWrapper):
+    """Serves repeated requests from a ``ResponseCache``.
+
+    Only requests with an explicit ``temperature <= max_temperature`` are cached; everything
+    else (hot agents, the provider's default temperature, streaming) goes straight through
+    and is counted as a bypass. Hits come back with zero ``usage``: no tokens were spent, so
+    run usage, ``MetricsHooks`` and budgets do not count them again.
+    """
+
+    def __init__(self, model: Model, cache: ResponseCache, max_temperature: float = 0.3) -> None:
+        super().__init__(model)
+        self.cache = cache
+        self.max_temperature = max_temperature
+
+    def is_cacheable(self, model_settings: ModelSettings) -> bool:
+        temperature = model_settings.temperature
+        return temperature is not None and temperature <= self.max_temperature
+
+    async def get_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: Any,
+        **kwargs: Any,
+    ) -> ModelResponse:
+        call = dict(
+            system_instructions=system_instructions,
+            input=input,
+            model_settings=model_settings,
+            tools=tools,
+            output_schema=output_schema,
+            handoffs=handoffs,
+            tracing=tracing,
+            **kwargs,
+        )
+        # Server-side conversation state makes the response depend on more than the request.
+        if (
+            not self.is_cacheable(model_settings)
+            or kwargs.get("previous_response_id")
+            or kwargs.get("conversation_id")
+        ):
+            self.cache.stats.bypasses += 1
+            return await self.model.get_response(**call)
+
+        key = request_key(
+            self.model_name,
+            system_instructions,
+            input,
+            model_settings,
+            tools,
+            output_schema,
+            handoffs,
+            kwargs.get("prompt"),
+        )
+        cached = self.cache.get(key)
+        if cached is not None:
+            return replace(cached, usage=Usage())
+        response = await self.model.get_response(**call)
+        self.cache.put(key, response)
+        return response
+
+    def stream_response(self, *args: Any, **kwargs: Any) -> AsyncIterator[TResponseStreamEvent]:
+        self.cache.stats.bypasses += 1
+        return self.model.stream_response(*args, **kwargs)
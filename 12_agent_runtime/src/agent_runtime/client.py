@@ -0,0 +1,300 @@
+"""Shared, pooled Gemini clients for every lesson.
+
+Lessons used to build their own ``AsyncOpenAI`` + ``OpenAIChatCompletionsModel`` at import
+time with default HTTP settings. Here one tuned client is kept per event loop and models
+resolve it lazily, so every agent, run and thread driving the same loop reuses the same
+warm keep-alive pool instead of paying a fresh TLS handshake.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import importlib.util
+import os
+import threading
+import weakref
+from dataclasses import dataclass, replace
+from functools import cache
+from collections.abc import AsyncIterator
+from typing import Any
+
+import httpx
+from agents import (
+    AgentOutputSchemaBase,
+    Handoff,
+    Model,
+    ModelProvider,
+    ModelSettings,
+    OpenAIChatCompletionsModel,
+    RunConfig,
+    Tool,
+)
+from agents.items import TResponseInputItem
+from agents.models.interface import ModelTracing
+from agents.tracing import GenerationSpanData, Span
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+from .registry import compiled_tools
+from .request_body import BodyEncoder, EncodedBodyClient, EncodedMessages
+
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta/openai/"
+DEFAULT_MODEL = "gemini-2.5-flash"
+# The SDK's own check, which it also reads once at import: with model data logging on it logs
+# the messages it converted, so it has to build them.
+_DONT_LOG_MODEL_DATA = os.getenv("OPENAI_AGENTS_DONT_LOG_MODEL_DATA", "1").lower() in {"1", "true"}
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
+@dataclass(frozen=True)
+class ClientSettings:
+    """HTTP and connection-pool settings for the shared client."""
+
+    api_key: str | None = None
+    base_url: str = GEMINI_BASE_URL
+    http2: bool = True
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 60.0
+    connect_timeout: float = 5.0
+    timeout: float = 60.0
+    max_retries: int = 2
+    encode_bodies: bool = False
+    """Build request bodies incrementally with a ``BodyEncoder`` (see ``request_body``)."""
+
+    @classmethod
+    def from_env(cls) -> ClientSettings:
+        """Read settings from ``GEMINI_API_KEY``, ``GEMINI_BASE_URL`` and the ``AGENT_*`` variables.
+
+        Point ``GEMINI_BASE_URL`` at ``agent_runtime.mock_server`` to run offline.
+        """
+        defaults = cls()
+        return cls(
+            api_key=os.getenv("GEMINI_API_KEY"),
+            base_url=os.getenv("GEMINI_BASE_URL") or defaults.base_url,
+            http2=_env_bool("AGENT_HTTP2", defaults.http2),
+            max_connections=int(os.getenv("AGENT_MAX_CONNECTIONS", defaults.max_connections)),
+            max_keepalive_connections=int(
+                os.getenv("AGENT_MAX_KEEPALIVE_CONNECTIONS", defaults.max_keepalive_connections)
+            ),
+            keepalive_expiry=float(os.getenv("AGENT_KEEPALIVE_EXPIRY", defaults.keepalive_expiry)),
+            connect_timeout=float(os.getenv("AGENT_CONNECT_TIMEOUT", defaults.connect_timeout)),
+            timeout=float(os.getenv("AGENT_TIMEOUT", defaults.timeout)),
+            max_retries=int(os.getenv("AGENT_MAX_RETRIES", defaults.max_retries)),
+            encode_bodies=_env_bool("AGENT_ENCODE_BODIES", defaults.encode_bodies),
+        )
+
+
+_default_settings: ClientSettings | None = None
+_lock = threading.Lock()
+# httpx pools are bound to the loop that opened them, so clients are cached per loop.
+_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[ClientSettings, AsyncOpenAI]] = (
+    weakref.WeakKeyDictionary()
+)
+_detached_clients: dict[ClientSettings, AsyncOpenAI] = {}
+# One ``_close_with_loop`` generator per loop; the loop itself only keeps a weak reference.
+_closers: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any] = weakref.WeakKeyDictionary()
+
+
+def configure(settings: ClientSettings) -> None:
+    """Replace the default settings used by ``get_client()`` and ``get_model()``."""
+    global _default_settings
+    _default_settings = settings
+
+
+def default_settings() -> ClientSettings:
+    """The configured settings, read from the environment on first use."""
+    global _default_settings
+    if _default_settings is None:
+        _default_settings = ClientSettings.from_env()
+    return _default_settings
+
+
+@cache
+def _http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def _build_client(settings: ClientSettings) -> AsyncOpenAI:
+    http_client = DefaultAsyncHttpxClient(
+        http2=settings.http2 and _http2_available(),
+        limits=httpx.Limits(
+            max_connections=settings.max_connections,
+            max_keepalive_connections=settings.max_keepalive_connections,
+            keepalive_expiry=settings.keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(settings.timeout, connect=settings.connect_timeout),
+    )
+    return AsyncOpenAI(
+        api_key=settings.api_key,
+        base_url=settings.base_url,
+        max_retries=settings.max_retries,
+        http_client=http_client,
+    )
+
+
+def get_client(settings: ClientSettings | None = None) -> AsyncOpenAI:
+    """Return the shared client for ``settings`` on the running event loop.
+
+    Called outside a running loop it returns a single detached client per settings, which
+    is only safe to use from one loop afterwards.
+    """
+    settings = settings or default_settings()
+    try:
+        loop: asyncio.AbstractEventLoop | None = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+
+    with _lock:
+        clients = _detached_clients if loop is None else _clients.setdefault(loop, {})
+        client = clients.get(settings)
+        if client is None:
+            client = clients[settings] = _build_client(settings)
+            if loop is not None and loop not in _closers:
+                _closers[loop] = closer = _close_with_loop()
+                asyncio.ensure_future(anext(closer))
+        return client
+
+
+async def _close_with_loop() -> AsyncIterator[None]:
+    # ``asyncio.run`` / ``asyncio.Runner`` (and ``BackgroundLoop``) finalize the loop's async
+    # generators before closing it, which runs this ``finally`` on the loop: the pools it
+    # opened are closed instead of leaking sockets until garbage collection.
+    try:
+        yield
+    finally:
+        await aclose_clients()
+
+
+async def aclose_clients() -> None:
+    """Close every shared client owned by the running event loop."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        clients = _clients.pop(loop, {})
+        _closers.pop(loop, None)
+    for client in clients.values():
+        await client.close()
+
+
+# The current request's pre-encoded messages, while the SDK builds the rest of it.
+_encoded_messages: contextvars.ContextVar[EncodedMessages | None] = contextvars.ContextVar(
+    "encoded_messages", default=None
+)
+
+
+class PooledChatCompletionsModel(OpenAIChatCompletionsModel):
+    """Chat Completions model that looks up the shared client on every call.
+
+    Nothing is opened at construction time, so lessons can still create their model at import.
+    Request messages are encoded incrementally by ``body_encoder``: pass one, or opt in for
+    every model with ``ClientSettings(encode_bodies=True)`` / ``AGENT_ENCODE_BODIES=1``.
+    """
+
+    def __init__(
+        self,
+        model: str = DEFAULT_MODEL,
+        settings: ClientSettings | None = None,
+        body_encoder: BodyEncoder | None = None,
+    ) -> None:
+        self.model = model
+        self.settings = settings
+        self.body_encoder = body_encoder
+
+    @property
+    def _client(self) -> AsyncOpenAI:  # type: ignore[override]
+        client = get_client(self.settings)
+        encoded = _encoded_messages.get()
+        if encoded is None or self.body_encoder is None:
+            return client
+        return EncodedBodyClient(client, encoded, self.body_encoder)  # type: ignore[return-value]
+
+    def _encoder(self) -> BodyEncoder | None:
+        # Settings are read on the first call, not at construction (lessons build models at import).
+        if self.body_encoder is None and (self.settings or default_settings()).encode_bodies:
+            self.body_encoder = BodyEncoder()
+        return self.body_encoder
+
+    async def _fetch_response(  # type: ignore[override]
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        span: Span[GenerationSpanData],
+        tracing: ModelTracing,
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        fragment = compiled_tools(tools, handoffs) if tools or handoffs else None
+        if fragment is not None:
+            # Every tool and handoff comes from a ToolRegistry / HandoffRegistry: send their
+            # precompiled schemas instead of converting them again for this turn.
+            extra_body = {**(model_settings.extra_body or {}), "tools": fragment}
+            if model_settings.parallel_tool_calls and tools:
+                extra_body["parallel_tool_calls"] = True
+            model_settings = replace(model_settings, extra_body=extra_body)
+            tools, handoffs = [], []
+        encoder = self._encoder()
+        if (
+            encoder is None
+            or not _DONT_LOG_MODEL_DATA
+            or "messages" in (model_settings.extra_body or {})
+        ):
+            return await super()._fetch_response(
+                system_instructions, input, model_settings, tools, output_schema, handoffs,
+                span, tracing, *args, **kwargs,
+            )
+
+        # History sent in earlier turns is reused already encoded; the SDK builds the rest of
+        # the request around an empty message list and the client splices the messages in.
+        encoded = encoder.encode(system_instructions, input)
+        token = _encoded_messages.set(encoded)
+        try:
+            response = await super()._fetch_response(
+                None, [], model_settings, tools, output_schema, handoffs, span, tracing, *args, **kwargs
+            )
+        finally:
+            _encoded_messages.reset(token)
+        if tracing.include_data():
+            span.span_data.input = encoded.messages
+        return response
+
+
+class PooledModelProvider(ModelProvider):
+    """Resolves model names (or the default) to shared pooled models."""
+
+    def __init__(self, settings: ClientSettings | None = None) -> None:
+        self.settings = settings
+
+    def get_model(self, model_name: str | None) -> Model:
+        return get_model(model_name, self.settings)
+
+
+_models: dict[tuple[str, ClientSettings | None], PooledChatCompletionsModel] = {}
+
+
+def get_model(name: str | None = None, settings: ClientSettings | None = None) -> Model:
+    """Shared model for ``name`` (default ``GEMINI_MODEL`` or gemini-2.5-flash)."""
+    name = name or os.getenv("GEMINI_MODEL", DEFAULT_MODEL)
+    key = (name, settings)
+    with _lock:
+        model = _models.get(key)
+        if model is None:
+            model = _models[key] = PooledChatCompletionsModel(name, settings)
+        return model
+
+
+def get_run_config(**overrides: Any) -> RunConfig:
+    """A ``RunConfig`` wired to the shared model, with tracing off like the lessons."""
+    overrides.setdefault("model", get_model())
+    overrides.setdefault("model_provider", PooledModelProvider())
+    overrides.setdefault("tracing_disabled", True)
+    return RunConfig(**overrides)
@@ -0,0 +1,269 @@
+"""Single-flight coalescing of identical in-flight runs.
+
+During a spike many users send the same prompt to the same FAQ-like agent (``agent_basic``,
+lesson 06) at the same moment, and every duplicate costs its own model calls. A
+``RunCoalescer`` sits in front of ``Runner.run`` / ``Runner.run_streamed``: a run identical to
+one already in flight (same agent, resolved instructions, input, model and settings) waits for
+that run instead of starting another, and streaming callers each replay the same events::
+
+    coalescer = RunCoalescer()
+    agent_basic = coalescer.agent(Agent(..., model_settings=ModelSettings(temperature=0)))
+
+    result = await coalescer.run(agent_basic, "Hello!", run_config=run_config)
+    stream = coalescer.run_streamed(agent_basic, "Hello!", run_config=run_config)
+    async for event in stream.stream_events(): ...
+
+Only opted-in agents with deterministic settings (an explicit ``temperature <=
+max_temperature``) are coalesced, and only runs without a context, session, hooks or
+server-side conversation state; everything else goes straight to ``Runner``. Coalesced callers
+share one ``RunResult``. A run is cancelled only when every caller waiting on it has gone.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from typing import Any
+
+from agents import Agent, RunConfig, RunContextWrapper, Runner, RunResult, RunResultStreaming
+from agents.items import TResponseInputItem
+from agents.run import DEFAULT_MAX_TURNS
+from agents.stream_events import StreamEvent
+
+from ._internal import json_default
+
+# Runner keyword arguments that make a run depend on its caller.
+_PER_CALLER = ("context", "hooks", "session", "previous_response_id", "conversation_id")
+
+
+@dataclass
+class CoalesceStats:
+    runs: int = 0
+    executed: int = 0
+    """Runs that were actually executed."""
+    coalesced: int = 0
+    """Runs answered by an identical run already in flight."""
+    bypasses: int = 0
+    """Runs not eligible for coalescing."""
+
+    @property
+    def coalesce_rate(self) -> float:
+        shared = self.executed + self.coalesced
+        return self.coalesced / shared if shared else 0.0
+
+
+@dataclass(eq=False)
+class _Flight:
+    """One executing run and the callers waiting on it."""
+
+    key: str
+    flights: dict[str, _Flight] = field(repr=False)
+    """Where the flight is registered under ``key`` while new callers may join it."""
+    task: asyncio.Task[Any] | None = None
+    waiters: int = 0
+    # Streams only: every event so far, so late subscribers replay from the start.
+    result: RunResultStreaming | None = None
+    events: list[StreamEvent] = field(default_factory=list)
+    error: BaseException | None = None
+    done: bool = False
+    changed: asyncio.Condition = field(default_factory=asyncio.Condition)
+
+
+class CoalescedStream:
+    """What ``RunCoalescer.run_streamed`` returns for an eligible run.
+
+    ``stream_events()`` yields the shared run's events from the first one; other attributes
+    (``final_output``, ``last_agent``, ``new_items`` ...) come from the shared
+    ``RunResultStreaming`` once streaming has started.
+    """
+
+    def __init__(self, coalescer: RunCoalescer, joined: asyncio.Task[_Flight]) -> None:
+        self._coalescer = coalescer
+        self._joined = joined
+        self._flight: _Flight | None = None
+        self._left = False
+
+    async def stream_events(self) -> AsyncIterator[StreamEvent]:
+        flight = self._flight = await self._joined
+        index = 0
+        try:
+            while True:
+                while index < len(flight.events):
+                    yield flight.events[index]
+                    index += 1
+                if flight.done:
+                    break
+                async with flight.changed:
+                    await flight.changed.wait_for(lambda: len(flight.events) > index or flight.done)
+            if flight.error is not None:
+                raise flight.error
+        finally:
+            self._leave()
+
+    def cancel(self) -> None:
+        """Stop following the run (the run itself is cancelled once nobody follows it)."""
+        if not self._joined.done():
+            self._joined.add_done_callback(lambda _: self.cancel())
+            return
+        if not self._joined.cancelled() and self._joined.exception() is None:
+            self._flight = self._joined.result()
+            self._leave()
+
+    def _leave(self) -> None:
+        if not self._left and self._flight is not None:
+            self._left = True
+            self._coalescer._release(self._flight)
+
+    def __getattr__(self, name: str) -> Any:
+        flight = self.__dict__.get("_flight")
+        if flight is None or flight.result is None:
+            raise AttributeError(f"{name!r} is available once stream_events() has started")
+        return getattr(flight.result, name)
+
+
+class RunCoalescer:
+    """Shares one execution among identical concurrent runs of opted-in agents.
+
+    Args:
+        max_temperature: Highest explicit temperature still considered deterministic.
+    """
+
+    def __init__(self, max_temperature: float = 0.3) -> None:
+        self.max_temperature = max_temperature
+        self.stats = CoalesceStats()
+        self._agents: dict[int, Agent[Any]] = {}
+        self._runs: dict[str, _Flight] = {}
+        self._streams: dict[str, _Flight] = {}
+
+    def agent(self, agent: Agent[Any]) -> Agent[Any]:
+        """Opt ``agent`` in; returns it, so it can wrap the ``Agent(...)`` expression."""
+        self._agents[id(agent)] = agent
+        return agent
+
+    def is_eligible(self, agent: Agent[Any], run_config: RunConfig | None, **run_kwargs: Any) -> bool:
+        if id(agent) not in self._agents or any(run_kwargs.get(name) is not None for name in _PER_CALLER):
+            return False
+        settings = agent.model_settings.resolve(run_config.model_settings if run_config else None)
+        return settings.temperature is not None and settings.temperature <= self.max_temperature
+
+    async def key(
+        self,
+        agent: Agent[Any],
+        input: str | list[TResponseInputItem],
+        run_config: RunConfig | None,
+        max_turns: int,
+    ) -> str:
+        """Hash of the agent, its resolved instructions, the input, the model and its settings."""
+        run_config = run_config or RunConfig()
+        model = run_config.model or agent.model
+        payload = {
+            "agent": id(agent),
+            "instructions": await agent.get_system_prompt(RunContextWrapper(context=None)),
+            "input": input,
+            "model": model if isinstance(model, str | None) else id(model),
+            "settings": agent.model_settings.resolve(run_config.model_settings).to_json_dict(),
+            "max_turns": max_turns,
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=json_default, ensure_ascii=False)
+        return hashlib.sha256(encoded.encode()).hexdigest()
+
+    async def run(
+        self,
+        starting_agent: Agent[Any],
+        input: str | list[TResponseInputItem],
+        *,
+        run_config: RunConfig | None = None,
+        max_turns: int = DEFAULT_MAX_TURNS,
+        **run_kwargs: Any,
+    ) -> RunResult:
+        """``Runner.run``, sharing an identical run already in flight."""
+        self.stats.runs += 1
+        if not self.is_eligible(starting_agent, run_config, **run_kwargs):
+            self.stats.bypasses += 1
+            return await Runner.run(starting_agent, input, run_config=run_config, max_turns=max_turns, **run_kwargs)
+
+        key = await self.key(starting_agent, input, run_config, max_turns)
+        flight = self._runs.get(key)
+        if flight is None:
+            self.stats.executed += 1
+            flight = self._runs[key] = _Flight(key, self._runs)
+            flight.task = asyncio.ensure_future(
+                Runner.run(starting_agent, input, run_config=run_config, max_turns=max_turns, **run_kwargs)
+            )
+            flight.task.add_done_callback(lambda _: self._forget(flight))
+        else:
+            self.stats.coalesced += 1
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)  # type: ignore[arg-type]
+        finally:
+            self._release(flight)
+
+    def run_streamed(
+        self,
+        starting_agent: Agent[Any],
+        input: str | list[TResponseInputItem],
+        *,
+        run_config: RunConfig | None = None,
+        max_turns: int = DEFAULT_MAX_TURNS,
+        **run_kwargs: Any,
+    ) -> RunResultStreaming | CoalescedStream:
+        """``Runner.run_streamed``, subscribing to an identical streamed run already in flight."""
+        self.stats.runs += 1
+        if not self.is_eligible(starting_agent, run_config, **run_kwargs):
+            self.stats.bypasses += 1
+            return Runner.run_streamed(
+                starting_agent, input, run_config=run_config, max_turns=max_turns, **run_kwargs
+            )
+
+        async def join() -> _Flight:
+            key = await self.key(starting_agent, input, run_config, max_turns)
+            flight = self._streams.get(key)
+            if flight is None:
+                self.stats.executed += 1
+                flight = self._streams[key] = _Flight(key, self._streams)
+                flight.result = Runner.run_streamed(
+                    starting_agent, input, run_config=run_config, max_turns=max_turns, **run_kwargs
+                )
+                flight.task = asyncio.ensure_future(self._pump(flight))
+                flight.task.add_done_callback(lambda _: self._forget(flight))
+            else:
+                self.stats.coalesced += 1
+            flight.waiters += 1
+            return flight
+
+        return CoalescedStream(self, asyncio.ensure_future(join()))
+
+    async def _pump(self, flight: _Flight) -> None:
+        assert flight.result is not None
+        try:
+            async for event in flight.result.stream_events():
+                flight.events.append(event)
+                async with flight.changed:
+                    flight.changed.notify_all()
+        except BaseException as e:
+            flight.error = e
+            if not isinstance(e, Exception):
+                raise
+        finally:
+            flight.done = True
+            async with flight.changed:
+                flight.changed.notify_all()
+
+    @staticmethod
+    def _forget(flight: _Flight) -> None:
+        # Only this flight: a new one may already run under the same key.
+        if flight.flights.get(flight.key) is flight:
+            del flight.flights[flight.key]
+
+    def _release(self, flight: _Flight) -> None:
+        flight.waiters -= 1
+        if flight.waiters <= 0 and flight.task is not None and not flight.task.done():
+            # Out of the map before the cancellation lands, so nobody joins a cancelled run.
+            self._forget(flight)
+            flight.task.cancel()
+            if flight.result is not None:
+                flight.result.cancel()
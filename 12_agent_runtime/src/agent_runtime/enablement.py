@@ -0,0 +1,164 @@
+"""Cached resolution of tool ``is_enabled`` predicates.
+
+The SDK re-evaluates every tool's ``is_enabled`` callable on every turn, so a 10-turn run with
+30 tools gated by the same entitlement check makes 300 lookups. ``EnablementResolver`` wraps
+predicates so each one is evaluated once per run (or once per context identity, shared across
+runs) and reused until its TTL expires or it is invalidated::
+
+    permissions = EnablementResolver(ttl=300, identity=lambda ctx: ctx.context.user_id)
+
+    @permissions.cached
+    async def premium_feature_enabled(ctx, agent) -> bool: ...
+
+    @function_tool(is_enabled=premium_feature_enabled)
+    def get_weather(city: str) -> str: ...
+
+The SDK already checks all tools of an agent concurrently; concurrent misses on the same
+predicate share a single evaluation.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any
+
+from agents import AgentBase, RunContextWrapper
+
+from ._internal import ByIdentity, PerLoop
+
+Predicate = Callable[[RunContextWrapper[Any], AgentBase], "bool | Awaitable[bool]"]
+
+
+@dataclass
+class EnablementStats:
+    lookups: int = 0
+    evaluations: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return 1 - self.evaluations / self.lookups if self.lookups else 0.0
+
+
+class EnablementResolver:
+    """Caches ``is_enabled`` results per run or per context identity.
+
+    Args:
+        ttl: Seconds a result stays valid; ``None`` keeps it for the whole run (or until
+            invalidated, with ``identity``).
+        identity: Maps the run context to a stable identity such as a user id. Results are then
+            shared by every run for that identity. Without it results are scoped to one run.
+        per_agent: Cache per (predicate, agent) instead of per predicate, for predicates that
+            look at the agent.
+        maxsize: Identity-scoped entries kept before the oldest are dropped.
+    """
+
+    def __init__(
+        self,
+        ttl: float | None = None,
+        identity: Callable[[RunContextWrapper[Any]], Hashable] | None = None,
+        per_agent: bool = False,
+        maxsize: int = 4096,
+    ) -> None:
+        self.ttl = ttl
+        self.identity = identity
+        self.per_agent = per_agent
+        self.maxsize = maxsize
+        self.stats = EnablementStats()
+        # Run-scoped entries by run context, dropped when the context is garbage collected.
+        self._runs: ByIdentity[dict[Hashable, tuple[bool, float]]] = ByIdentity()
+        self._shared: dict[Hashable, tuple[bool, float]] = {}
+        # Futures bind to their loop; runs on other loops evaluate for themselves.
+        self._pending: PerLoop[dict[Hashable, asyncio.Future[bool]]] = PerLoop(dict)
+
+    def _scope(self, context: RunContextWrapper[Any]) -> tuple[dict[Hashable, tuple[bool, float]], Hashable]:
+        if self.identity is not None:
+            return self._shared, self.identity(context)
+        entries = self._runs.get(context)
+        if entries is None:
+            entries = {}
+            self._runs.set(context, entries)
+        return entries, id(context)
+
+    def _store(self, entries: dict[Hashable, tuple[bool, float]], key: Hashable, value: bool) -> None:
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+        entries.pop(key, None)
+        entries[key] = (value, expires_at)
+        if entries is self._shared:
+            while len(entries) > self.maxsize:
+                del entries[next(iter(entries))]
+
+    async def resolve(
+        self, predicate: Predicate, context: RunContextWrapper[Any], agent: AgentBase
+    ) -> bool:
+        """Evaluate ``predicate`` for this run/identity, or return the cached result."""
+        self.stats.lookups += 1
+        entries, scope = self._scope(context)
+        key = (scope, predicate, agent.name if self.per_agent else None)
+        cached = entries.get(key)
+        if cached is not None and cached[1] > time.monotonic():
+            return cached[0]
+        in_flight = self._pending.get()
+        pending = in_flight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        self.stats.evaluations += 1
+        future = in_flight[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = predicate(context, agent)
+            if inspect.isawaitable(result):
+                result = await result
+            value = bool(result)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else is waiting
+            raise
+        finally:
+            del in_flight[key]
+        self._store(entries, key, value)
+        future.set_result(value)
+        return value
+
+    def cached(self, predicate: Predicate) -> Callable[[RunContextWrapper[Any], AgentBase], Awaitable[bool]]:
+        """Wrap ``predicate`` for use as ``function_tool(is_enabled=...)``; works as a decorator."""
+
+        @functools.wraps(predicate)
+        async def is_enabled(context: RunContextWrapper[Any], agent: AgentBase) -> bool:
+            return await self.resolve(predicate, context, agent)
+
+        is_enabled.predicate = predicate  # type: ignore[attr-defined]
+        return is_enabled
+
+    def invalidate(self, identity: Hashable | None = None, predicate: Predicate | None = None) -> None:
+        """Drop cached results, e.g. after a user's entitlements change.
+
+        With no arguments everything is dropped; otherwise only entries matching ``identity``
+        and/or ``predicate`` (decorated or not).
+        """
+        self.stats.invalidations += 1
+        predicate = getattr(predicate, "predicate", predicate)
+        if identity is None and predicate is None:
+            self._shared.clear()
+            self._runs.clear()
+            return
+        for entries in (self._shared, *self._runs.values()):
+            for key in [
+                k
+                for k in entries
+                if (identity is None or k[0] == identity) and (predicate is None or k[1] is predicate)
+            ]:
+                del entries[key]
+
+    def invalidate_run(self, context: RunContextWrapper[Any]) -> None:
+        """Drop the results cached for one run (``identity`` not set)."""
+        self.stats.invalidations += 1
+        self._runs.pop(context)
@@ -0,0 +1,49 @@
+"""Cached ``.env`` loading.
+
+Every lesson starts with ``load_dotenv(find_dotenv())``, which walks from the calling script up
+to the filesystem root on each start, and again for every script run in the same process.
+``load_env`` walks once per directory and loads each file once; ``DOTENV_PATH`` skips the walk
+entirely (point it at the file, or set it empty in containers that get their variables from
+the environment)::
+
+    load_env(__file__)  # same lookup as load_dotenv(find_dotenv())
+"""
+
+from __future__ import annotations
+
+import os
+from functools import cache
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+_loaded: set[Path] = set()
+
+
+@cache
+def _search(directory: Path) -> Path | None:
+    for parent in (directory, *directory.parents):
+        candidate = parent / ".env"
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def find_env(start: str | os.PathLike[str] | None = None) -> Path | None:
+    """The ``.env`` file nearest to ``start`` (a file or directory, default: the cwd)."""
+    override = os.environ.get("DOTENV_PATH")
+    if override is not None:
+        return Path(override) if override else None
+    directory = Path(start).resolve() if start is not None else Path.cwd()
+    if not directory.is_dir():
+        directory = directory.parent
+    return _search(directory)
+
+
+def load_env(start: str | os.PathLike[str] | None = None, override: bool = False) -> Path | None:
+    """Load the nearest ``.env`` into ``os.environ`` unless already loaded; returns its path."""
+    path = find_env(start)
+    if path is not None and (override or path not in _loaded):
+        load_dotenv(path, override=override)
+        _loaded.add(path)
+    return path
@@ -0,0 +1,195 @@
+"""Hedged model requests to cut tail latency.
+
+A few model calls take many times the median (slow replica, cold cache, network hiccup).
+``HedgedModel`` sends a duplicate request when the first one has not produced anything after
+an adaptive delay (by default the observed p95 time to first response); whichever attempt
+responds first wins and the other is cancelled::
+
+    run_config = get_run_config(model=HedgedModel(get_model(), max_extra=0.05))
+
+With ``Runner.run_streamed`` the race is on the first stream event, after which the winning
+stream is passed through unchanged. ``max_extra`` caps duplicate requests as a fraction of
+all requests, so a slow provider is never hit with twice the load.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from agents import Model, ModelResponse
+from agents.items import TResponseStreamEvent
+
+from .model_wrapper import ModelWrapper
+
+T = TypeVar("T")
+
+_END = object()
+
+
+@dataclass
+class _Failed:
+    error: Exception
+
+
+@dataclass
+class HedgeStats:
+    requests: int = 0
+    hedged: int = 0
+    """Requests that sent a duplicate."""
+    hedge_wins: int = 0
+    """Hedged requests answered by the duplicate."""
+    over_budget: int = 0
+    """Requests that were due a duplicate but ran out of ``max_extra`` budget."""
+
+    @property
+    def extra_load(self) -> float:
+        return self.hedged / self.requests if self.requests else 0.0
+
+
+class HedgedModel(ModelWrapper):
+    """Sends a second request when the first is slower than usual.
+
+    Args:
+        model: The model to call.
+        quantile: Hedge after this quantile of recent times to first response.
+        delay: Fixed hedge delay in seconds instead of the adaptive one.
+        initial_delay: Delay used until ``min_samples`` responses have been observed.
+        min_delay: Lower bound for the adaptive delay.
+        max_extra: Duplicate requests allowed per request, e.g. ``0.05`` for 5% extra load.
+        burst: Duplicates that may be sent back to back when budget has accrued.
+        window: Recent response times kept for the quantile.
+        min_samples: Responses observed before the adaptive delay is used.
+    """
+
+    def __init__(
+        self,
+        model: Model,
+        quantile: float = 0.95,
+        delay: float | None = None,
+        initial_delay: float = 2.0,
+        min_delay: float = 0.05,
+        max_extra: float = 0.1,
+        burst: float = 5.0,
+        window: int = 256,
+        min_samples: int = 20,
+    ) -> None:
+        super().__init__(model)
+        self.quantile = quantile
+        self.fixed_delay = delay
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_extra = max_extra
+        self.burst = burst
+        self.min_samples = min_samples
+        self.stats = HedgeStats()
+        self._samples: deque[float] = deque(maxlen=window)
+        self._budget = burst
+
+    @property
+    def delay(self) -> float:
+        """Seconds to wait before hedging the next request."""
+        if self.fixed_delay is not None:
+            return self.fixed_delay
+        if len(self._samples) < self.min_samples:
+            return self.initial_delay
+        ordered = sorted(self._samples)
+        rank = min(len(ordered) - 1, math.ceil(self.quantile * len(ordered)) - 1)
+        return max(self.min_delay, ordered[rank])
+
+    def _may_hedge(self) -> bool:
+        if self._budget >= 1:
+            self._budget -= 1
+            return True
+        self.stats.over_budget += 1
+        return False
+
+    async def _race(self, attempt: Callable[[], Awaitable[T]]) -> tuple[T, asyncio.Task[T] | None]:
+        """Result of the first attempt to succeed, plus the losing attempt if one finished.
+
+        The losing attempt is cancelled when still running; a finished loser is returned so
+        the caller can release it (an open stream).
+        """
+        self.stats.requests += 1
+        self._budget = min(self.burst, self._budget + self.max_extra)
+
+        async def timed() -> T:
+            start = time.perf_counter()
+            result = await attempt()
+            self._samples.append(time.perf_counter() - start)
+            return result
+
+        primary = asyncio.ensure_future(timed())
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=self.delay)
+            if done or not self._may_hedge():
+                return await primary, None
+        except BaseException:
+            primary.cancel()
+            raise
+
+        self.stats.hedged += 1
+        hedge = asyncio.ensure_future(timed())
+        pending = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.stats.hedge_wins += 1
+                        loser = hedge if task is primary else primary
+                        if loser in pending:
+                            loser.cancel()
+                            return task.result(), None
+                        return task.result(), loser if loser.exception() is None else None
+            # Both attempts failed: report the primary's error.
+            return primary.result(), None
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def get_response(self, *args: Any, **kwargs: Any) -> ModelResponse:
+        response, _ = await self._race(lambda: self.model.get_response(*args, **kwargs))
+        return response
+
+    async def stream_response(self, *args: Any, **kwargs: Any) -> AsyncIterator[TResponseStreamEvent]:
+        # Each attempt drains its stream in its own task (the SDK's tracing spans must be
+        # entered and exited in the same context) and hands the events over through a queue.
+        async def pump(queue: asyncio.Queue[Any]) -> None:
+            try:
+                async for event in self.model.stream_response(*args, **kwargs):
+                    queue.put_nowait(event)
+            except Exception as e:
+                queue.put_nowait(_Failed(e))
+            else:
+                queue.put_nowait(_END)
+
+        async def first_event() -> tuple[Any, asyncio.Queue[Any], asyncio.Task[None]]:
+            queue: asyncio.Queue[Any] = asyncio.Queue()
+            task = asyncio.ensure_future(pump(queue))
+            try:
+                first = await queue.get()
+            except BaseException:
+                task.cancel()
+                raise
+            if isinstance(first, _Failed):
+                raise first.error
+            return first, queue, task
+
+        (event, queue, task), loser = await self._race(first_event)
+        if loser is not None:
+            loser.result()[2].cancel()
+        try:
+            while event is not _END:
+                if isinstance(event, _Failed):
+                    raise event.error
+                yield event
+                event = await queue.get()
+        finally:
+            task.cancel()
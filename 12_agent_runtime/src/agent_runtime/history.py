@@ -0,0 +1,234 @@
+"""Token-budgeted conversation history for long multi-turn sessions.
+
+Lesson 10 continues a conversation with ``r1.to_input_list() + [new message]``, so every reply
+re-sends the whole growing history, router chatter and handoff tool items included.
+``HistoryManager`` plugs into ``RunConfig.call_model_input_filter`` and, before every model
+call:
+
+1. drops handoff bookkeeping (``transfer_to_*`` calls and their outputs),
+2. shortens tool outputs outside the recent window,
+3. when still over ``max_tokens``, folds older items into a rolling summary.
+
+Summaries are cached by the history prefix they cover and extended incrementally, so a growing
+conversation only summarizes the items that newly fell out of the window.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections import OrderedDict, deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from agents.items import TResponseInputItem
+from agents.run import CallModelData, ModelInputData
+
+from .batch import estimate_tokens
+
+Summarizer = Callable[[str, list[TResponseInputItem]], Awaitable[str]]
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:"
+PER_CALL_KEPT = 1000
+
+
+def item_text(item: TResponseInputItem) -> str:
+    """Plain text of a message, tool call or tool output item."""
+    if not isinstance(item, dict):
+        return str(item)
+    kind = item.get("type", "message")
+    if kind == "function_call":
+        return f"{item.get('name')}({item.get('arguments', '')})"
+    if kind == "function_call_output":
+        return str(item.get("output", ""))
+    content = item.get("content", "")
+    if isinstance(content, str):
+        return content
+    return " ".join(str(part.get("text", "")) for part in content if isinstance(part, dict))
+
+
+def _item_hash(item: TResponseInputItem) -> str:
+    return hashlib.sha256(json.dumps(item, sort_keys=True, default=str).encode()).hexdigest()
+
+
+async def extractive_summary(previous: str, items: list[TResponseInputItem]) -> str:
+    """Default summarizer: first sentence of every message, no model call."""
+    lines = [previous] if previous else []
+    for item in items:
+        if not isinstance(item, dict) or item.get("type", "message") != "message":
+            continue
+        text = " ".join(item_text(item).split())
+        if text:
+            first = text.split(". ")[0][:160]
+            lines.append(f"- {item.get('role', 'assistant')}: {first}")
+    return "\n".join(lines)
+
+
+@dataclass
+class HistoryStats:
+    calls: int = 0
+    tokens_before: int = 0
+    tokens_after: int = 0
+    summaries: int = 0
+    summary_cache_hits: int = 0
+    per_call: deque[tuple[int, int]] = field(default_factory=lambda: deque(maxlen=PER_CALL_KEPT))
+    """(estimated input tokens before, after) for the last ``PER_CALL_KEPT`` model calls."""
+
+    @property
+    def saved(self) -> float:
+        return 1 - self.tokens_after / self.tokens_before if self.tokens_before else 0.0
+
+
+class HistoryManager:
+    """Keeps model input under a token budget.
+
+    Args:
+        max_tokens: Estimated input-token budget (about four characters per token).
+        keep_recent: Items at the end of the history that are always sent verbatim.
+        tool_output_chars: Tool outputs outside the recent window are cut to this length.
+        summarizer: ``async (previous_summary, items) -> summary``; the default keeps the first
+            sentence of each message. Pass an LLM-backed one for better summaries.
+        drop_handoffs: Remove handoff tool calls and outputs.
+        max_summaries: Cached summaries kept (one per conversation prefix).
+
+    Use ``run_config = get_run_config(call_model_input_filter=history.filter)``.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 2000,
+        keep_recent: int = 6,
+        tool_output_chars: int = 200,
+        summarizer: Summarizer | None = None,
+        drop_handoffs: bool = True,
+        max_summaries: int = 256,
+    ) -> None:
+        self.max_tokens = max_tokens
+        self.keep_recent = keep_recent
+        self.tool_output_chars = tool_output_chars
+        self.summarizer = summarizer or extractive_summary
+        self.drop_handoffs = drop_handoffs
+        self.max_summaries = max_summaries
+        self.stats = HistoryStats()
+        # (prefix length, hash of the prefix's last item) -> (prefix items, summary)
+        self._summaries: OrderedDict[tuple[int, str], tuple[list[TResponseInputItem], str]] = (
+            OrderedDict()
+        )
+
+    async def filter(self, data: CallModelData[Any]) -> ModelInputData:
+        """``RunConfig.call_model_input_filter`` entry point."""
+        instructions = data.model_data.instructions
+        items = data.model_data.input
+        compacted = await self.compact(items, instructions)
+        return ModelInputData(input=compacted, instructions=instructions)
+
+    async def compact(
+        self, items: list[TResponseInputItem], instructions: str | None = None
+    ) -> list[TResponseInputItem]:
+        before = estimate_tokens(instructions, items)
+        if self.drop_handoffs:
+            items = self._drop_handoffs(items)
+        recent_start = self._safe_boundary(items, len(items) - self.keep_recent)
+        items = [self._shorten(item) for item in items[:recent_start]] + items[recent_start:]
+
+        if estimate_tokens(instructions, items) > self.max_tokens and recent_start > 0:
+            items = await self._summarize(items, recent_start)
+
+        after = estimate_tokens(instructions, items)
+        self.stats.calls += 1
+        self.stats.tokens_before += before
+        self.stats.tokens_after += after
+        self.stats.per_call.append((before, after))
+        return items
+
+    def _drop_handoffs(self, items: list[TResponseInputItem]) -> list[TResponseInputItem]:
+        handoff_calls = {
+            item.get("call_id")
+            for item in items
+            if isinstance(item, dict)
+            and item.get("type") == "function_call"
+            and str(item.get("name", "")).startswith("transfer_to_")
+        }
+        if not handoff_calls:
+            return items
+        return [
+            item
+            for item in items
+            if not (
+                isinstance(item, dict)
+                and item.get("type") in ("function_call", "function_call_output")
+                and item.get("call_id") in handoff_calls
+            )
+        ]
+
+    @staticmethod
+    def _safe_boundary(items: list[TResponseInputItem], index: int) -> int:
+        """Move ``index`` back so no tool output is separated from its call.
+
+        Calls and outputs are matched by ``call_id``: after parallel calls
+        (``[call_a, call_b, out_a, out_b]``) the outputs do not directly follow their calls.
+        """
+        index = max(0, min(index, len(items)))
+        calls = {
+            item.get("call_id"): position
+            for position, item in enumerate(items[:index])
+            if isinstance(item, dict) and item.get("type") == "function_call"
+        }
+        if not calls:
+            return index
+        start, end = index, len(items)
+        while True:
+            earliest = index
+            for item in items[start:end]:
+                if isinstance(item, dict) and item.get("type") == "function_call_output":
+                    earliest = min(earliest, calls.get(item.get("call_id"), earliest))
+            if earliest == index:
+                return index
+            # The items now moved to the recent side may hold outputs of even earlier calls.
+            start, end, index = earliest, index, earliest
+
+    def _shorten(self, item: TResponseInputItem) -> TResponseInputItem:
+        if not (isinstance(item, dict) and item.get("type") == "function_call_output"):
+            return item
+        output = item.get("output")
+        if isinstance(output, str) and len(output) > self.tool_output_chars:
+            return {**item, "output": output[: self.tool_output_chars] + " …[truncated]"}
+        return item
+
+    async def _summarize(
+        self, items: list[TResponseInputItem], boundary: int
+    ) -> list[TResponseInputItem]:
+        # Each call sends the whole (growing) history again. Find the longest already-summarized
+        # prefix by its length and last item, then confirm it by comparing the items, so only
+        # one item per cached length is serialized instead of the whole prefix.
+        covered, summary, hit = 0, "", None
+        for length in sorted({length for length, _ in self._summaries}, reverse=True):
+            if length > boundary:
+                continue
+            key = (length, _item_hash(items[length - 1]))
+            cached = self._summaries.get(key)
+            if cached is not None and cached[0] == items[:length]:
+                covered, summary, hit = length, cached[1], key
+                self._summaries.move_to_end(key)
+                self.stats.summary_cache_hits += 1
+                break
+
+        def with_summary(start: int, text: str) -> list[TResponseInputItem]:
+            head = [{"role": "user", "content": f"{SUMMARY_PREFIX}\n{text}"}] if text else []
+            return head + items[start:]
+
+        # Keep the cached summary while the result fits; extend it only when over budget.
+        if covered and estimate_tokens(None, with_summary(covered, summary)) <= self.max_tokens:
+            return with_summary(covered, summary)
+        if covered < boundary:
+            summary = await self.summarizer(summary, items[covered:boundary])
+            self.stats.summaries += 1
+            if hit is not None:
+                # Superseded by the longer prefix of the same conversation.
+                del self._summaries[hit]
+            key = (boundary, _item_hash(items[boundary - 1]))
+            self._summaries[key] = (items[:boundary], summary)
+            while len(self._summaries) > self.max_summaries:
+                self._summaries.popitem(last=False)
+        return with_summary(boundary, summary)
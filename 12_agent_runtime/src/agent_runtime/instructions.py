@@ -0,0 +1,116 @@
+"""Memoized dynamic instructions.
+
+The SDK calls an agent's ``instructions`` callable on every model turn of every run, even when
+the rendered prompt only depends on a few inputs (agent name, hour of day, username).
+``cached_instructions`` declares those inputs as a cache key and keeps the rendered string per
+key in a small LRU, so repeat turns skip the provider entirely::
+
+    @cached_instructions(key=lambda ctx, agent: (agent.name, datetime.now().hour))
+    def time_based(context, agent) -> str: ...
+
+Async providers stay async (the SDK checks ``inspect.iscoroutinefunction``) and concurrent
+misses on the same key share one call.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, NamedTuple
+
+from agents import Agent, RunContextWrapper
+
+from ._internal import LRUCache, PerLoop
+
+InstructionsKey = Callable[[RunContextWrapper[Any], Agent[Any]], Hashable]
+
+
+class InstructionsCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+def by_agent(context: RunContextWrapper[Any], agent: Agent[Any]) -> Hashable:
+    """Default key: the prompt depends only on which agent asks."""
+    return agent.name
+
+
+def cached_instructions(
+    func: Callable[..., str | Awaitable[str]] | None = None,
+    *,
+    key: InstructionsKey = by_agent,
+    maxsize: int = 128,
+    ttl: float | None = None,
+) -> Any:
+    """Cache an instructions provider's output per ``key(context, agent)``.
+
+    Args:
+        key: Returns everything the prompt depends on; must be hashable. Defaults to the
+            agent name.
+        maxsize: Number of rendered prompts kept (least recently used are evicted).
+        ttl: Optional lifetime in seconds, for prompts built from data that goes stale.
+
+    The wrapper exposes ``cache_info()`` and ``cache_clear()`` like ``functools.lru_cache``.
+    Do not cache providers that keep their own state (e.g. count interactions).
+    """
+
+    def decorate(provider: Callable[..., Any]) -> Any:
+        cache = LRUCache(maxsize, ttl)
+
+        if inspect.iscoroutinefunction(provider):
+            # Futures bind to their loop (background loop, ``run_sync``, pool threads).
+            pending_by_loop: PerLoop[dict[Hashable, asyncio.Future[str]]] = PerLoop(dict)
+
+            @functools.wraps(provider)
+            async def async_wrapper(context: RunContextWrapper[Any], agent: Agent[Any]) -> str:
+                k = key(context, agent)
+                value = cache.get(k)
+                if value is not None:
+                    return value
+                pending = pending_by_loop.get()
+                if k in pending:
+                    cache.hits += 1
+                    return await asyncio.shield(pending[k])
+                cache.misses += 1
+                future = pending[k] = asyncio.get_running_loop().create_future()
+                try:
+                    value = await provider(context, agent)
+                except asyncio.CancelledError:
+                    future.cancel()
+                    raise
+                except BaseException as e:
+                    future.set_exception(e)
+                    future.exception()  # mark retrieved when nobody else is waiting
+                    raise
+                finally:
+                    del pending[k]
+                cache.put(k, value)
+                future.set_result(value)
+                return value
+
+            wrapper: Any = async_wrapper
+        else:
+
+            @functools.wraps(provider)
+            def sync_wrapper(context: RunContextWrapper[Any], agent: Agent[Any]) -> str:
+                k = key(context, agent)
+                value = cache.get(k)
+                if value is None:
+                    cache.misses += 1
+                    value = provider(context, agent)
+                    cache.put(k, value)
+                return value
+
+            wrapper = sync_wrapper
+
+        wrapper.cache_info = lambda: InstructionsCacheInfo(
+            cache.hits, cache.misses, cache.maxsize, len(cache)
+        )
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorate(func) if func is not None else decorate
@@ -0,0 +1,140 @@
+"""One fast-starting entry point for every lesson script.
+
+    agent-run                    # list lessons and their scripts
+    agent-run hello-agent        # 01_hello_agent/src/hello_agent/main.py
+    agent-run 11 part2           # 11_advanced_tool/src/11_advanced_tool/part2.py
+    uv run hello-agent           # a lesson's own console script goes through here too
+
+Nothing beyond the standard library is imported until a script has been picked: lessons are
+found on disk by name, the script's ``.env`` is loaded through the cached ``load_env`` and the
+file runs as ``__main__`` with ``runpy``, so a start pays only for the imports of that one
+script (and ``agent_runtime`` resolves its own names lazily). Lessons are looked up under
+``AGENT_LESSONS_ROOT``, else the nearest parent of the working directory that holds them.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import runpy
+import sys
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+_LESSON_DIR = re.compile(r"(\d+)_(\w+)")
+LAUNCHER = "agent-run"
+
+
+def _normalize(name: str) -> str:
+    return name.strip().lower().replace("-", "_")
+
+
+@dataclass(frozen=True)
+class Lesson:
+    """A lesson project (``NN_name/``) and the scripts in its ``src/<package>/``."""
+
+    path: Path
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+    def matches(self, key: str) -> bool:
+        """``01_hello_agent``, ``hello-agent``, ``hello_agent``, ``01`` and ``1`` all match."""
+        number, short = _LESSON_DIR.fullmatch(self.name).groups()  # type: ignore[union-attr]
+        key = _normalize(key)
+        return key in (self.name, short) or (key.isdigit() and int(key) == int(number))
+
+    def scripts(self) -> dict[str, Path]:
+        return {p.stem: p for p in sorted(self.path.glob("src/*/*.py")) if not p.name.startswith("_")}
+
+    def script(self, name: str | None = None) -> Path:
+        """The named script, else ``main`` or the only script of the lesson."""
+        scripts = self.scripts()
+        if name is None:
+            if "main" in scripts:
+                return scripts["main"]
+            if len(scripts) == 1:
+                return next(iter(scripts.values()))
+            raise LookupError(f"{self.name} has several scripts, pick one of: {', '.join(scripts)}")
+        for stem, path in scripts.items():
+            if _normalize(stem) == _normalize(name):
+                return path
+        raise LookupError(f"{self.name} has no script {name!r} (scripts: {', '.join(scripts)})")
+
+
+def _has_lessons(directory: Path) -> bool:
+    return any(_LESSON_DIR.fullmatch(p.name) and (p / "src").is_dir() for p in directory.iterdir())
+
+
+def lessons_root() -> Path:
+    """Directory holding the ``NN_name`` lesson projects."""
+    if root := os.environ.get("AGENT_LESSONS_ROOT"):
+        return Path(root)
+    cwd = Path.cwd()
+    for directory in (cwd, *cwd.parents):
+        if _has_lessons(directory):
+            return directory
+    # Editable install: src/agent_runtime/launcher.py inside 12_agent_runtime/
+    return Path(__file__).resolve().parents[3]
+
+
+def find_lessons(root: Path | None = None) -> list[Lesson]:
+    root = root or lessons_root()
+    return [
+        Lesson(p)
+        for p in sorted(root.iterdir())
+        if _LESSON_DIR.fullmatch(p.name) and (p / "src").is_dir() and p.name != "12_agent_runtime"
+    ]
+
+
+def find_lesson(key: str, root: Path | None = None) -> Lesson:
+    for lesson in find_lessons(root):
+        if lesson.matches(key):
+            return lesson
+    raise LookupError(f"No lesson {key!r} under {root or lessons_root()}")
+
+
+def run_script(path: Path, argv: Sequence[str] = ()) -> None:
+    """Run ``path`` as ``__main__`` after loading its ``.env``."""
+    from .env import load_env
+
+    load_env(path)
+    sys.argv = [str(path), *argv]
+    sys.path.insert(0, str(path.parent))
+    runpy.run_path(str(path), run_name="__main__")
+
+
+def _list(root: Path | None = None) -> None:
+    for lesson in find_lessons(root):
+        print(f"{lesson.name:<26}{' '.join(lesson.scripts())}")
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """``agent-run [lesson] [script] [args...]``; as a lesson's console script, the lesson is implied."""
+    prog = Path(sys.argv[0]).stem
+    if argv is None:
+        argv = sys.argv[1:]
+        if prog != LAUNCHER and _normalize(prog) not in {"__main__", "launcher"}:
+            argv = [prog, *argv]
+
+    parser = argparse.ArgumentParser(prog=LAUNCHER, description="Run a lesson script.")
+    parser.add_argument("lesson", nargs="?", help="lesson directory, name or number (default: list lessons)")
+    parser.add_argument("script", nargs="?", help="script in the lesson (default: main or the only one)")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="arguments passed to the script")
+    args = parser.parse_args(argv)
+
+    if args.lesson is None:
+        _list()
+        return
+    try:
+        path = find_lesson(args.lesson).script(args.script)
+    except LookupError as e:
+        parser.exit(2, f"{LAUNCHER}: {e}\n")
+    run_script(path, args.args)
+
+
+if __name__ == "__main__":
+    main()
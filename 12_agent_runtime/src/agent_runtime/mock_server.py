@@ -0,0 +1,447 @@
+"""Local Gemini-compatible (OpenAI chat-completions) mock server for offline benchmarks.
+
+Every lesson talks to ``https://generativelanguage.googleapis.com/v1beta/openai/``, so nothing
+could be benchmarked without network or quota. This server answers ``POST .../chat/completions``
+(streaming and non-streaming) from a script of rules, with configurable latency:
+
+    python -m agent_runtime.mock_server --port 8765 --latency lognormal:0.4,0.5 --script rules.json
+    export GEMINI_BASE_URL=http://127.0.0.1:8765/v1beta/openai/
+
+A script is a JSON list of rules, tried in order against each request::
+
+    [
+      {"match": "translate", "tool_calls": [{"name": "translate_to_spanish", "arguments": {"input": "{input}"}}]},
+      {"match": "run|workout", "tool_calls": [{"name": "transfer_to_fitness_coach"}]},
+      {"system": "Summarize", "content": "- point one\\n- point two", "latency": "fixed:0.3"}
+    ]
+
+``match`` / ``system`` are case-insensitive regexes on the last user message / system prompt.
+A rule with ``tool_calls`` only fires on a user turn and only if the request offers those tools
+(handoffs are tools named ``transfer_to_<agent>``); once tool results come back the server
+answers with the rule's ``then`` text (default: a summary of the tool outputs); with
+``parallel_tool_calls=false`` the calls are made one per turn. ``{input}`` is replaced with the
+last user message. Without a matching rule the server echoes the input.
+
+Latency specs: ``fixed:S``, ``uniform:A,B``, ``lognormal:MEDIAN,SIGMA`` and
+``heavytail:MEDIAN,ALPHA,P`` (lognormal body, Pareto tail hit with probability ``P``).
+``--error-rate`` injects ``429`` responses with a ``Retry-After`` header; a rule with
+``"error": 503`` always fails with that status.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import random
+import re
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+LatencyModel = Callable[[random.Random], float]
+
+
+def parse_latency(spec: str) -> LatencyModel:
+    """Build a latency sampler (seconds) from a spec such as ``lognormal:0.4,0.5``."""
+    kind, _, params = spec.partition(":")
+    values = [float(v) for v in params.split(",") if v]
+    if kind == "fixed":
+        (seconds,) = values or [0.0]
+        return lambda rng: seconds
+    if kind == "uniform":
+        low, high = values
+        return lambda rng: rng.uniform(low, high)
+    if kind == "lognormal":
+        median, sigma = values
+        return lambda rng: rng.lognormvariate(math.log(median), sigma)
+    if kind == "heavytail":
+        median, alpha, p = values
+
+        def heavytail(rng: random.Random) -> float:
+            if rng.random() < p:
+                return median * rng.paretovariate(alpha) * 4
+            return rng.lognormvariate(math.log(median), 0.25)
+
+        return heavytail
+    raise ValueError(f"Unknown latency model: {spec!r}")
+
+
+@dataclass
+class Rule:
+    match: re.Pattern[str] | None = None
+    system: re.Pattern[str] | None = None
+    content: str | None = None
+    tool_calls: list[dict[str, Any]] = field(default_factory=list)
+    then: str | None = None
+    latency: LatencyModel | None = None
+    error: int | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Rule:
+        def pattern(key: str) -> re.Pattern[str] | None:
+            return re.compile(data[key], re.I | re.S) if data.get(key) else None
+
+        return cls(
+            match=pattern("match"),
+            system=pattern("system"),
+            content=data.get("content"),
+            tool_calls=list(data.get("tool_calls", [])),
+            then=data.get("then"),
+            latency=parse_latency(data["latency"]) if data.get("latency") else None,
+            error=data.get("error"),
+        )
+
+
+def load_script(path: str | Path) -> list[Rule]:
+    return [Rule.from_dict(rule) for rule in json.loads(Path(path).read_text())]
+
+
+def _text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return ""
+
+
+def _fill(value: Any, user: str) -> Any:
+    """Replace ``{input}`` in every string of a tool-argument template."""
+    if isinstance(value, str):
+        return value.replace("{input}", user)
+    if isinstance(value, dict):
+        return {k: _fill(v, user) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_fill(v, user) for v in value]
+    return value
+
+
+@dataclass
+class Reply:
+    content: str | None
+    tool_calls: list[dict[str, Any]]
+    latency: LatencyModel | None
+    error: int | None = None
+
+
+class MockServer:
+    """Scripted chat-completions server.
+
+    Args:
+        rules: Script rules (see the module docstring).
+        latency: Latency model for a whole response; when streaming it is the time to the first
+            chunk and ``token_delay`` is added per streamed chunk.
+        error_rate: Probability of answering ``429 Too Many Requests``.
+        seed: Seed for the latency / error random generator, for reproducible runs.
+    """
+
+    def __init__(
+        self,
+        rules: list[Rule] | None = None,
+        latency: LatencyModel | str = "fixed:0",
+        token_delay: float = 0.0,
+        error_rate: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: int | None = None,
+    ) -> None:
+        self.rules = rules or []
+        self.latency = parse_latency(latency) if isinstance(latency, str) else latency
+        self.token_delay = token_delay
+        self.error_rate = error_rate
+        self.host = host
+        self.port = port
+        self.rng = random.Random(seed)
+        self.connections = 0
+        self.requests = 0
+        self.statuses: Counter[int] = Counter()
+        self._ids = itertools.count(1)
+        self._server: asyncio.Server | None = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1beta/openai/"
+
+    async def start(self) -> MockServer:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def __aenter__(self) -> MockServer:
+        return await self.start()
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    def reset_stats(self) -> None:
+        self.connections = self.requests = 0
+        self.statuses.clear()
+
+    # -- scripted behaviour -------------------------------------------------------------
+
+    def reply_for(self, request: dict[str, Any]) -> Reply:
+        messages = request.get("messages", [])
+        offered = {t.get("function", {}).get("name") for t in request.get("tools", []) or []}
+        if request.get("tool_choice") == "none":
+            offered = set()
+        system = next((_text(m.get("content")) for m in messages if m.get("role") == "system"), "")
+        user = next(
+            (_text(m.get("content")) for m in reversed(messages) if m.get("role") == "user"), ""
+        )
+        last_user = max((i for i, m in enumerate(messages) if m.get("role") == "user"), default=-1)
+        outputs = [_text(m.get("content")) for m in messages[last_user + 1 :] if m.get("role") == "tool"]
+        after_tools = bool(messages) and messages[-1].get("role") == "tool"
+        # Like the real API, parallel_tool_calls=false means one tool call per turn.
+        one_per_turn = request.get("parallel_tool_calls") is False
+
+        for rule in self.rules:
+            if rule.system and not rule.system.search(system):
+                continue
+            if rule.match and not rule.match.search(user):
+                continue
+            if rule.tool_calls:
+                if not {c["name"] for c in rule.tool_calls} <= offered:
+                    continue
+                calls = [
+                    {"name": c["name"], "arguments": json.dumps(_fill(c.get("arguments", {}), user))}
+                    for c in rule.tool_calls
+                ]
+                if one_per_turn and len(outputs) < len(calls):
+                    return Reply(None, [calls[len(outputs)]], rule.latency)
+                if after_tools:
+                    then = rule.then or "Here is what I found: " + " | ".join(outputs[-len(calls):])
+                    return Reply(then.replace("{input}", user), [], rule.latency)
+                return Reply(None, calls, rule.latency)
+            if rule.error is not None:
+                return Reply(None, [], rule.latency, rule.error)
+            if rule.content is not None:
+                return Reply(rule.content.replace("{input}", user), [], rule.latency)
+
+        if after_tools:
+            last = _text(messages[-1].get("content"))
+            return Reply(f"Tool says: {last}", [], None)
+        return Reply(f"Mock reply to: {user[:200]}", [], None)
+
+    # -- HTTP ---------------------------------------------------------------------------
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                method, path, _ = request_line.split(" ", 2)
+                headers = {
+                    k.strip().lower(): v.strip()
+                    for k, _, v in (line.partition(":") for line in header_lines if line)
+                }
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                self.requests += 1
+                await self._dispatch(method, path, body, writer)
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method: str, path: str, body: bytes, writer: asyncio.StreamWriter) -> None:
+        if method != "POST" or not path.rstrip("/").endswith("/chat/completions"):
+            await self._send_json(writer, 404, {"error": {"message": f"No route for {method} {path}"}})
+            return
+        if self.error_rate and self.rng.random() < self.error_rate:
+            await self._send_json(
+                writer,
+                429,
+                {"error": {"message": "Resource has been exhausted (mock).", "code": 429}},
+                extra_headers={"retry-after": "1"},
+            )
+            return
+
+        request = json.loads(body or b"{}")
+        reply = self.reply_for(request)
+        delay = (reply.latency or self.latency)(self.rng)
+        if reply.error is not None:
+            await asyncio.sleep(delay)
+            await self._send_json(
+                writer, reply.error, {"error": {"message": "Scripted failure (mock).", "code": reply.error}}
+            )
+            return
+        model = request.get("model", "gemini-2.5-flash")
+        prompt_tokens = len(body) // 4
+        completion_id = f"chatcmpl-mock-{next(self._ids)}"
+
+        if request.get("stream"):
+            await self._stream(writer, completion_id, model, reply, delay, prompt_tokens)
+            return
+
+        await asyncio.sleep(delay)
+        message: dict[str, Any] = {"role": "assistant", "content": reply.content}
+        if reply.tool_calls:
+            message["tool_calls"] = [
+                {"id": f"call_{completion_id}_{i}", "type": "function", "function": call}
+                for i, call in enumerate(reply.tool_calls)
+            ]
+        completion_tokens = len((reply.content or "").split()) + 5 * len(reply.tool_calls)
+        await self._send_json(
+            writer,
+            200,
+            {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": message,
+                        "finish_reason": "tool_calls" if reply.tool_calls else "stop",
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            },
+        )
+
+    async def _stream(
+        self,
+        writer: asyncio.StreamWriter,
+        completion_id: str,
+        model: str,
+        reply: Reply,
+        delay: float,
+        prompt_tokens: int,
+    ) -> None:
+        self.statuses[200] += 1
+        writer.write(
+            b"HTTP/1.1 200 OK\r\ncontent-type: text/event-stream\r\n"
+            b"cache-control: no-cache\r\ntransfer-encoding: chunked\r\n\r\n"
+        )
+
+        def chunk(delta: dict[str, Any], finish: str | None = None, usage: Any = None) -> None:
+            payload = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": model,
+                "choices": [] if usage else [{"index": 0, "delta": delta, "finish_reason": finish}],
+            }
+            if usage:
+                payload["usage"] = usage
+            self._write_chunk(writer, f"data: {json.dumps(payload)}\n\n".encode())
+
+        await asyncio.sleep(delay)
+        words = re.findall(r"\S+\s*", reply.content or "")
+        chunk({"role": "assistant", "content": words[0] if words else ""})
+        for word in words[1:]:
+            if self.token_delay:
+                await writer.drain()
+                await asyncio.sleep(self.token_delay)
+            chunk({"content": word})
+        for i, call in enumerate(reply.tool_calls):
+            chunk(
+                {
+                    "tool_calls": [
+                        {
+                            "index": i,
+                            "id": f"call_{completion_id}_{i}",
+                            "type": "function",
+                            "function": {"name": call["name"], "arguments": call["arguments"]},
+                        }
+                    ]
+                }
+            )
+        chunk({}, finish="tool_calls" if reply.tool_calls else "stop")
+        completion_tokens = len(words) + 5 * len(reply.tool_calls)
+        chunk(
+            {},
+            usage={
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        )
+        self._write_chunk(writer, b"data: [DONE]\n\n")
+        self._write_chunk(writer, b"")
+        await writer.drain()
+
+    @staticmethod
+    def _write_chunk(writer: asyncio.StreamWriter, data: bytes) -> None:
+        # Clients that cancel mid-stream (e.g. a losing hedged request) just go away.
+        if not writer.is_closing():
+            writer.write(b"%x\r\n%s\r\n" % (len(data), data))
+
+    async def _send_json(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        payload: dict[str, Any],
+        extra_headers: dict[str, str] | None = None,
+    ) -> None:
+        self.statuses[status] += 1
+        body = json.dumps(payload).encode()
+        reason = {
+            200: "OK",
+            404: "Not Found",
+            429: "Too Many Requests",
+            500: "Internal Server Error",
+            503: "Service Unavailable",
+        }.get(status, "Error")
+        headers = "".join(f"{k}: {v}\r\n" for k, v in (extra_headers or {}).items())
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\ncontent-type: application/json\r\n"
+            f"content-length: {len(body)}\r\n{headers}\r\n".encode()
+            + body
+        )
+        await writer.drain()
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    server = MockServer(
+        rules=load_script(args.script) if args.script else None,
+        latency=args.latency,
+        token_delay=args.token_delay,
+        error_rate=args.error_rate,
+        host=args.host,
+        port=args.port,
+        seed=args.seed,
+    )
+    await server.start()
+    print(f"Mock Gemini server listening on {server.base_url}")
+    print(f"export GEMINI_BASE_URL={server.base_url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local Gemini-compatible mock server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--script", help="JSON file with response rules")
+    parser.add_argument("--latency", default="fixed:0", help="e.g. fixed:0.2, lognormal:0.4,0.5")
+    parser.add_argument("--token-delay", type=float, default=0.0, help="seconds between streamed chunks")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="probability of a 429")
+    parser.add_argument("--seed", type=int)
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""Base class for models that wrap another model."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from typing import Any
+
+from agents import Model, ModelResponse
+from agents.items import TResponseStreamEvent
+
+
+class ModelWrapper(Model):
+    """A ``Model`` that forwards every call to ``self.model``.
+
+    Subclasses override ``get_response`` / ``stream_response`` and call ``super()`` (or
+    ``self.model``) for the real request. The SDK always calls models with keyword
+    arguments, which are passed through unchanged.
+    """
+
+    def __init__(self, model: Model) -> None:
+        self.model = model
+
+    @property
+    def model_name(self) -> str:
+        """Name of the innermost model, e.g. ``gemini-2.5-flash``."""
+        inner: Any = self.model
+        while isinstance(inner, ModelWrapper):
+            inner = inner.model
+        return str(getattr(inner, "model", type(inner).__name__))
+
+    async def get_response(self, *args: Any, **kwargs: Any) -> ModelResponse:
+        return await self.model.get_response(*args, **kwargs)
+
+    def stream_response(self, *args: Any, **kwargs: Any) -> AsyncIterator[TResponseStreamEvent]:
+        return self.model.stream_response(*args, **kwargs)
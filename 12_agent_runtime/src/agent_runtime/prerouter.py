@@ -0,0 +1,262 @@
+"""Local pre-routing ahead of an LLM router agent.
+
+Lesson 10's ``Coach Router`` spends a full model round trip choosing between two specialists
+from keyword-like rules ("running, workout, stamina" vs "exams, study plan"). ``PreRouter``
+classifies the first message locally and starts the run with the specialist directly when it
+is confident; otherwise the run starts with the LLM router as before::
+
+    pre_router = PreRouter(
+        router,
+        [
+            Route(fitness_coach, keywords=["run", "workout", "stamina"], examples=["train for a 5k"]),
+            Route(study_coach, keywords=["exam", "study plan", "focus", "notes"]),
+        ],
+    )
+    result = await pre_router.run("I want to run a 5Km in 8 weeks")  # starts with fitness_coach
+
+Two rules, in order:
+
+1. **keywords** - a keyword (or every word of a keyword phrase) of exactly one route appears;
+   keywords of several routes make the message ambiguous and it goes to the LLM router;
+2. **TF-IDF** - cosine similarity between the message and each route's keywords + examples,
+   accepted when the best route scores ``threshold`` or more and leads the runner-up by
+   ``margin``.
+
+Scoring is vectorized with NumPy when it is installed (``agent-runtime[prerouter]``) and falls
+back to sparse dictionaries otherwise; both give the same scores.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import time
+from collections import Counter
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from agents import Agent, Runner, RunResult
+from agents.items import TResponseInputItem
+
+from .history import item_text
+
+try:
+    import numpy as np
+except ImportError:  # optional: ``pip install agent-runtime[prerouter]``
+    np = None
+
+_WORD = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    "a an and are be can do for help how i in is it me my of on or the this to want we what with"
+    " you your".split()
+)
+
+
+def _stem(word: str) -> str:
+    """Very small suffix stripper: running/runs -> run, exams -> exam, studied -> study."""
+    if word.endswith(("ies", "ied")) and len(word) > 4:
+        return word[:-3] + "y"
+    for suffix in ("ing", "ed"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[: -len(suffix)]
+            if word[-1] == word[-2] and word[-1] not in "aeiouls":
+                word = word[:-1]  # runn -> run
+            return word
+    if word.endswith(("ches", "shes", "sses", "xes")):
+        return word[:-2]
+    if word.endswith("s") and not word.endswith(("ss", "us", "is")) and len(word) > 3:
+        return word[:-1]
+    return word
+
+
+def tokenize(text: str) -> list[str]:
+    return [_stem(word) for word in _WORD.findall(text.lower()) if word not in _STOPWORDS]
+
+
+def message_text(input: str | list[TResponseInputItem]) -> str:
+    """The text to classify: the input string, or the last user message of an item list."""
+    if isinstance(input, str):
+        return input
+    for item in reversed(input):
+        if isinstance(item, dict) and item.get("role") == "user":
+            return item_text(item)
+    return ""
+
+
+@dataclass
+class Route:
+    """A specialist the pre-router may start with.
+
+    Args:
+        agent: The agent the LLM router would hand off to.
+        keywords: Words or phrases that alone identify the route.
+        examples: Typical messages; they only feed the TF-IDF rule.
+    """
+
+    agent: Agent[Any]
+    keywords: Sequence[str] = ()
+    examples: Sequence[str] = ()
+
+    @property
+    def name(self) -> str:
+        return self.agent.name
+
+
+@dataclass
+class RouteDecision:
+    agent: Agent[Any] = field(repr=False)
+    route: str | None
+    """Name of the chosen route; ``None`` when falling back to the LLM router."""
+    confidence: float
+    rule: str
+    """``"keyword"``, ``"tfidf"`` or ``"fallback"``."""
+
+
+@dataclass
+class PreRouterStats:
+    decisions: int = 0
+    skipped: int = 0
+    """Decisions that started with a specialist, saving the router's model call."""
+    fallbacks: int = 0
+    by_route: Counter[str] = field(default_factory=Counter)
+    by_rule: Counter[str] = field(default_factory=Counter)
+    classify_seconds: float = 0.0
+
+    @property
+    def skip_rate(self) -> float:
+        return self.skipped / self.decisions if self.decisions else 0.0
+
+
+class PreRouter:
+    """Chooses the starting agent locally, falling back to an LLM router.
+
+    Args:
+        fallback: The LLM router agent, used when no rule is confident.
+        routes: The specialists and their rules.
+        threshold: Minimum TF-IDF cosine similarity of the best route.
+        margin: Minimum lead of the best route over the runner-up.
+        keyword_weight: Weight of keywords relative to example text in the TF-IDF vectors.
+    """
+
+    def __init__(
+        self,
+        fallback: Agent[Any],
+        routes: Sequence[Route],
+        threshold: float = 0.2,
+        margin: float = 0.1,
+        keyword_weight: float = 2.0,
+    ) -> None:
+        if not routes:
+            raise ValueError("PreRouter needs at least one route")
+        self.fallback = fallback
+        self.routes = list(routes)
+        self.threshold = threshold
+        self.margin = margin
+        self.stats = PreRouterStats()
+        self._keywords = [
+            [tuple(tokenize(keyword)) for keyword in route.keywords if tokenize(keyword)]
+            for route in self.routes
+        ]
+
+        # One weighted term-frequency document per route, then IDF across routes.
+        documents: list[Counter[str]] = []
+        for route, keywords in zip(self.routes, self._keywords):
+            terms: Counter[str] = Counter()
+            for phrase in keywords:
+                for token in phrase:
+                    terms[token] += keyword_weight
+            for example in route.examples:
+                terms.update(tokenize(example))
+            documents.append(terms)
+        vocabulary = sorted(set().union(*documents))
+        self._index = {term: i for i, term in enumerate(vocabulary)}
+        n = len(documents)
+        self._idf = {
+            term: math.log((1 + n) / (1 + sum(term in doc for doc in documents))) + 1
+            for term in vocabulary
+        }
+        self._vectors = [self._normalize({t: tf * self._idf[t] for t, tf in doc.items()}) for doc in documents]
+        if np is not None:
+            self._matrix = np.zeros((n, len(vocabulary)))
+            for row, vector in enumerate(self._vectors):
+                for term, weight in vector.items():
+                    self._matrix[row, self._index[term]] = weight
+
+    @staticmethod
+    def _normalize(vector: dict[str, float]) -> dict[str, float]:
+        norm = math.sqrt(sum(w * w for w in vector.values()))
+        return {t: w / norm for t, w in vector.items()} if norm else {}
+
+    def agents(self) -> dict[str, Agent[Any]]:
+        """The fallback router and every route's agent, by name."""
+        return {self.fallback.name: self.fallback, **{route.name: route.agent for route in self.routes}}
+
+    # -- scoring -------------------------------------------------------------------------
+
+    def _query(self, tokens: list[str]) -> dict[str, float]:
+        counts = Counter(t for t in tokens if t in self._idf)
+        return self._normalize({t: tf * self._idf[t] for t, tf in counts.items()})
+
+    def scores(self, texts: Sequence[str]) -> list[list[float]]:
+        """TF-IDF cosine similarity of each text with each route (rows follow ``texts``)."""
+        queries = [self._query(tokenize(text)) for text in texts]
+        if np is not None:
+            matrix = np.zeros((len(queries), len(self._index)))
+            for row, query in enumerate(queries):
+                for term, weight in query.items():
+                    matrix[row, self._index[term]] = weight
+            return (matrix @ self._matrix.T).tolist()
+        return [
+            [float(sum(w * vector.get(t, 0.0) for t, w in query.items())) for vector in self._vectors]
+            for query in queries
+        ]
+
+    def _keyword_routes(self, tokens: list[str]) -> list[int]:
+        present = set(tokens)
+        return [i for i, keywords in enumerate(self._keywords) if any(present.issuperset(p) for p in keywords)]
+
+    def classify_many(self, inputs: Sequence[str | list[TResponseInputItem]]) -> list[RouteDecision]:
+        start = time.perf_counter()
+        texts = [message_text(input) for input in inputs]
+        decisions: list[RouteDecision | None] = []
+        undecided: list[int] = []
+        for i, text in enumerate(texts):
+            hits = self._keyword_routes(tokenize(text))
+            if len(hits) == 1:
+                route = self.routes[hits[0]]
+                decisions.append(RouteDecision(route.agent, route.name, 1.0, "keyword"))
+            elif hits:
+                decisions.append(RouteDecision(self.fallback, None, 0.0, "fallback"))
+            else:
+                undecided.append(i)
+                decisions.append(None)
+
+        for i, row in zip(undecided, self.scores([texts[i] for i in undecided])):
+            ranked = sorted(range(len(row)), key=row.__getitem__, reverse=True)
+            best = row[ranked[0]]
+            runner_up = row[ranked[1]] if len(ranked) > 1 else 0.0
+            if best >= self.threshold and best - runner_up >= self.margin:
+                route = self.routes[ranked[0]]
+                decisions[i] = RouteDecision(route.agent, route.name, best, "tfidf")
+            else:
+                decisions[i] = RouteDecision(self.fallback, None, best, "fallback")
+
+        stats = self.stats
+        stats.classify_seconds += time.perf_counter() - start
+        for decision in decisions:
+            stats.decisions += 1
+            stats.by_rule[decision.rule] += 1
+            if decision.route is None:
+                stats.fallbacks += 1
+            else:
+                stats.skipped += 1
+                stats.by_route[decision.route] += 1
+        return decisions  # type: ignore[return-value]
+
+    def classify(self, input: str | list[TResponseInputItem]) -> RouteDecision:
+        return self.classify_many([input])[0]
+
+    async def run(self, input: str | list[TResponseInputItem], **run_kwargs: Any) -> RunResult:
+        """``Runner.run`` starting with the classified agent."""
+        return await Runner.run(self.classify(input).agent, input, **run_kwargs)
@@ -0,0 +1,166 @@
+"""Immutable, copy-on-write tool and handoff registries with precompiled request schemas.
+
+``Agent.clone`` shares its parent's ``tools`` list (lesson 08), so appending to one agent's
+tools silently changes every clone. And on every turn the SDK rebuilds a ``Handoff`` per agent
+handoff and converts each tool and handoff into its chat-completions schema again (about a
+millisecond for 30 tools and 5 handoffs), although the tools rarely change between turns.
+
+``ToolRegistry`` and ``HandoffRegistry`` are lists that cannot be changed. ``add`` /
+``drop`` / ``replace`` return a new registry (with a new ``version``) and leave the original
+alone. Their request schemas are compiled once, when the registry is built, and every clone
+that keeps its parent's registry shares them. Cloning itself costs about the same as with a
+list; the saving is the per-turn conversion (see ``benchmarks/bench_registry.py``)::
+
+    tools = ToolRegistry([calculate_area, get_weather])
+    base = Agent(name="Base", tools=tools, handoffs=HandoffRegistry([billing, support]))
+
+    tenant = base.clone(name=f"Tenant {tenant_id}")            # shares tools and schemas
+    math = base.clone(tools=tools.drop("get_weather"))         # a new registry; base unchanged
+
+``PooledChatCompletionsModel`` (``get_model()``) sends the precompiled ``tools`` request
+fragment whenever every tool and handoff of a turn comes from a registry; otherwise the SDK
+converts them as usual. Registered tools must not be mutated afterwards.
+"""
+
+from __future__ import annotations
+
+import itertools
+import operator
+import threading
+import weakref
+from collections.abc import Callable, Iterable
+from typing import Any, NoReturn
+
+from agents import Agent, FunctionTool, Handoff, Tool, handoff
+from agents.models.chatcmpl_converter import Converter
+
+from ._internal import LRUCache, to_plain
+
+_versions = itertools.count(1)
+# Reentrant: ``_forget`` can run from garbage collection while the lock is held.
+_lock = threading.RLock()
+# Compiled chat-completions param per registered tool / handoff, by id while it is alive.
+_compiled: dict[int, dict[str, Any]] = {}
+# Whole ``tools`` fragments for the combinations of tools and handoffs seen in turns.
+_fragments = LRUCache(maxsize=1024, ttl=None)
+
+
+def _forget(key: int) -> None:
+    with _lock:
+        _compiled.pop(key, None)
+        _fragments.clear()  # a fragment may hold the id, which can now be reused
+
+
+def _compile(item: FunctionTool | Handoff) -> None:
+    with _lock:
+        if id(item) in _compiled:
+            return
+        param = (
+            Converter.tool_to_openai(item)
+            if isinstance(item, FunctionTool)
+            else Converter.convert_handoff_tool(item)
+        )
+        _compiled[id(item)] = to_plain(param)
+    weakref.finalize(item, _forget, id(item))
+
+
+def compiled_tools(tools: list[Tool], handoffs: list[Handoff]) -> list[dict[str, Any]] | None:
+    """The request's ``tools`` param for one turn, or ``None`` if something is not registered.
+
+    The list is cached and shared: callers must not modify it.
+    """
+    key = (*map(id, tools), None, *map(id, handoffs))
+    with _lock:
+        fragment = _fragments.get(key)
+        if fragment is None:
+            try:
+                fragment = [_compiled[id(item)] for item in (*tools, *handoffs)]
+            except KeyError:
+                return None
+            _fragments.put(key, fragment)
+        return fragment
+
+
+class _Registry(list):  # type: ignore[type-arg]
+    """A list that cannot be changed in place (``Agent`` requires lists).
+
+    ``name`` gives an entry's name, which must be unique within the registry.
+    """
+
+    def __init__(self, items: Iterable[Any], name: Callable[[Any], str]) -> None:
+        super().__init__(items)
+        self._name = name
+        self.version = next(_versions)
+        names = [name(item) for item in self]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate names in {type(self).__name__}: {', '.join(duplicates)}")
+
+    def _derive(self, items: Iterable[Any]) -> Any:
+        return type(self)(items)
+
+    def drop(self, *names: str) -> Any:
+        """A new registry without the entries called ``names``."""
+        return self._derive(item for item in self if self._name(item) not in names)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return type(self), (list(self),)
+
+    def _immutable(self, *args: Any, **kwargs: Any) -> NoReturn:
+        raise TypeError(
+            f"{type(self).__name__} is immutable; derive a new one with add(), drop() or replace()"
+        )
+
+    append = extend = insert = pop = remove = clear = sort = reverse = _immutable
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}([{', '.join(map(self._name, self))}], version={self.version})"
+
+
+class ToolRegistry(_Registry):
+    """Immutable agent ``tools`` list whose function tools are compiled once."""
+
+    def __init__(self, tools: Iterable[Tool] = ()) -> None:
+        super().__init__(tools, operator.attrgetter("name"))
+        for tool in self:
+            if isinstance(tool, FunctionTool):
+                _compile(tool)
+
+    def add(self, *tools: Tool) -> ToolRegistry:
+        """A new registry with ``tools`` appended."""
+        return self._derive([*self, *tools])
+
+    def replace(self, *tools: Tool) -> ToolRegistry:
+        """A new registry where each of ``tools`` takes the place of the entry with its name."""
+        by_name = {tool.name: tool for tool in tools}
+        return self._derive(by_name.get(tool.name, tool) for tool in self)
+
+
+class HandoffRegistry(_Registry):
+    """Immutable agent ``handoffs`` list.
+
+    Agents are turned into ``Handoff`` objects once, here, instead of on every turn, and their
+    schemas are compiled with them.
+    """
+
+    def __init__(self, handoffs: Iterable[Agent[Any] | Handoff] = ()) -> None:
+        super().__init__(
+            (h if isinstance(h, Handoff) else handoff(h) for h in handoffs), operator.attrgetter("tool_name")
+        )
+        for item in self:
+            _compile(item)
+
+    def drop(self, *names: str) -> HandoffRegistry:
+        """A new registry without the handoffs to (or with tool name) ``names``."""
+        return self._derive(h for h in self if h.agent_name not in names and h.tool_name not in names)
+
+    def add(self, *handoffs: Agent[Any] | Handoff) -> HandoffRegistry:
+        """A new registry with ``handoffs`` appended."""
+        return self._derive([*self, *handoffs])
+
+    def replace(self, *handoffs: Agent[Any] | Handoff) -> HandoffRegistry:
+        """A new registry where each of ``handoffs`` takes the place of the one with its tool name."""
+        new = HandoffRegistry(handoffs)
+        by_name = {h.tool_name: h for h in new}
+        return self._derive(by_name.get(h.tool_name, h) for h in self)
@@ -0,0 +1,268 @@
+"""Chat-completions request bodies built incrementally from already-encoded history.
+
+Every turn of a run sends the whole conversation again: the tool loop of lesson 03, the handoff
+continuation of lesson 10. The SDK converts every input item to a chat message, the OpenAI
+client walks the messages again to transform them and httpx JSON-encodes the lot, so the CPU
+spent per request grows with the history although only the last few items are new.
+
+``BodyEncoder`` keeps the encoded messages of recent conversations in segments, one per chat
+message (tool calls belong to the assistant message before them). On the next turn the
+unchanged prefix of the history is matched item by item and its segments are reused; only the
+new items are converted and encoded. The system prompt and registry tool fragments are encoded
+once. ``orjson`` is used when installed (``pip install agent-runtime[orjson]``).
+
+``PooledChatCompletionsModel`` (``get_model()``) builds its request bodies this way when asked
+to (``ClientSettings(encode_bodies=True)`` or ``AGENT_ENCODE_BODIES=1``); the bodies are the same
+bytes the SDK would send.
+"""
+
+from __future__ import annotations
+
+import functools
+import inspect
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from types import SimpleNamespace
+from typing import Any, NamedTuple
+
+from agents.items import ItemHelpers, TResponseInputItem
+from agents.models.chatcmpl_converter import Converter
+from openai import NOT_GIVEN, AsyncOpenAI, AsyncStream, NotGiven, Omit
+from openai.resources.chat import AsyncCompletions
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+
+from ._internal import to_plain
+
+try:
+    import orjson
+except ImportError:  # optional: ``pip install agent-runtime[orjson]``
+    orjson = None
+
+if orjson is not None:
+    dumps = orjson.dumps
+else:
+
+    def dumps(value: Any) -> bytes:
+        """Compact JSON bytes, as httpx sends them (``orjson.dumps`` when installed)."""
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode()
+
+
+# Conversations kept per first item: runs that start with the same prompt share a key.
+_PER_KEY = 8
+
+
+class _Segment(NamedTuple):
+    end: int  # index after its last item
+    messages: list[dict[str, Any]]
+    encoded: bytes  # the messages, comma separated
+
+
+class _History(NamedTuple):
+    items: list[TResponseInputItem]
+    segments: list[_Segment]
+
+
+class EncodedMessages(NamedTuple):
+    """A request's ``messages``: the JSON array and the messages it encodes."""
+
+    json: bytes
+    messages: list[dict[str, Any]]
+
+
+def _starts_message(item: TResponseInputItem) -> bool:
+    # Tool calls and reasoning attach to the assistant message before them; messages and tool
+    # outputs always start a new chat message, whatever came before.
+    return isinstance(item, dict) and item.get("type", "message") in ("message", "function_call_output")
+
+
+def _head(item: TResponseInputItem) -> Hashable:
+    # A string input becomes a new (but equal) user message on every turn.
+    if isinstance(item, dict) and isinstance(item.get("content"), str):
+        return item.get("role"), item["content"]
+    return id(item)
+
+
+def _common_prefix(old: list[TResponseInputItem], new: list[TResponseInputItem]) -> int:
+    count = 0
+    for a, b in zip(old, new):
+        if a is not b and a != b:
+            break
+        count += 1
+    return count
+
+
+@functools.lru_cache(maxsize=256)
+def _system_message(instructions: str) -> tuple[dict[str, Any], bytes]:
+    message = {"content": instructions, "role": "system"}
+    return message, dumps(message)
+
+
+class BodyEncoder:
+    """Encodes the ``messages`` of chat-completions requests, reusing unchanged history.
+
+    Args:
+        maxsize: Conversations remembered (least recently used are forgotten).
+
+    ``reused`` and ``converted`` count the input items taken from earlier turns and the ones
+    converted and encoded afresh.
+    """
+
+    def __init__(self, maxsize: int = 256) -> None:
+        self.maxsize = maxsize
+        self.reused = 0
+        self.converted = 0
+        self._histories: OrderedDict[Hashable, list[_History]] = OrderedDict()
+        self._tools: OrderedDict[int, tuple[Any, bytes]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def encode(
+        self, system_instructions: str | None, input: str | list[TResponseInputItem]
+    ) -> EncodedMessages:
+        """The ``messages`` the SDK would send for ``system_instructions`` and ``input``."""
+        items = ItemHelpers.input_to_new_input_list(input) if isinstance(input, str) else input
+        messages: list[dict[str, Any]] = []
+        parts: list[bytes] = []
+        if system_instructions:
+            message, encoded = _system_message(system_instructions)
+            messages.append(message)
+            parts.append(encoded)
+        for segment in self._segments(items):
+            if segment.messages:
+                messages += segment.messages
+                parts.append(segment.encoded)
+        return EncodedMessages(b"[" + b",".join(parts) + b"]", messages)
+
+    def tools(self, tools: list[dict[str, Any]]) -> bytes:
+        """``tools`` encoded; kept for as long as the same list (a registry fragment) is sent."""
+        with self._lock:
+            entry = self._tools.get(id(tools))
+            if entry is not None and entry[0] is tools:
+                self._tools.move_to_end(id(tools))
+                return entry[1]
+        encoded = dumps(tools)
+        with self._lock:
+            self._tools[id(tools)] = (tools, encoded)
+            while len(self._tools) > self.maxsize:
+                self._tools.popitem(last=False)
+        return encoded
+
+    def clear(self) -> None:
+        with self._lock:
+            self._histories.clear()
+            self._tools.clear()
+            self.reused = self.converted = 0
+
+    def _segments(self, items: list[TResponseInputItem]) -> list[_Segment]:
+        if not items:
+            return []
+        key = _head(items[0])
+        with self._lock:
+            best, matched = None, 0
+            for history in self._histories.get(key, ()):
+                count = _common_prefix(history.items, items)
+                if count > matched:
+                    best, matched = history, count
+
+        segments: list[_Segment] = []
+        if best is not None:
+            for segment in best.segments:
+                # Reusable when none of its items changed and no new item joins its message.
+                if segment.end > matched or (
+                    segment.end < len(items) and not _starts_message(items[segment.end])
+                ):
+                    break
+                segments.append(segment)
+        start = segments[-1].end if segments else 0
+        segments += _convert(items, start)
+
+        with self._lock:
+            self.reused += start
+            self.converted += len(items) - start
+            histories = self._histories.setdefault(key, [])
+            if best in histories:
+                histories.remove(best)  # that conversation has moved on
+            histories.append(_History(list(items), segments))
+            del histories[:-_PER_KEY]
+            self._histories.move_to_end(key)
+            while len(self._histories) > self.maxsize:
+                self._histories.popitem(last=False)
+        return segments
+
+
+def _convert(items: list[TResponseInputItem], start: int) -> list[_Segment]:
+    segments = []
+    while start < len(items):
+        end = start + 1
+        while end < len(items) and not _starts_message(items[end]):
+            end += 1
+        messages = to_plain(Converter.items_to_messages(items[start:end]))
+        segments.append(_Segment(end, messages, b",".join(map(dumps, messages))))
+        start = end
+    return segments
+
+
+@functools.cache
+def _param_order() -> dict[str, int]:
+    # The client builds the body in the order of ``create``'s parameters.
+    return {name: i for i, name in enumerate(inspect.signature(AsyncCompletions.create).parameters)}
+
+
+class EncodedBodyClient:
+    """The client as the SDK sees it for one request whose ``messages`` are already encoded.
+
+    ``chat.completions.create`` posts the body with them spliced in, keys in the order the
+    OpenAI client would send; everything else is the wrapped client's.
+    """
+
+    def __init__(self, client: AsyncOpenAI, messages: EncodedMessages, encoder: BodyEncoder) -> None:
+        self._wrapped = client
+        self._messages = messages
+        self._encoder = encoder
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._wrapped, name)
+
+    async def _create(
+        self,
+        *,
+        extra_headers: Any = None,
+        extra_query: Any = None,
+        extra_body: Any = None,
+        timeout: Any = NOT_GIVEN,
+        **params: Any,
+    ) -> ChatCompletion | AsyncStream[ChatCompletionChunk]:
+        order = _param_order()
+        body = {
+            name: params[name]
+            for name in sorted(params, key=lambda name: order.get(name, len(order)))
+            if not isinstance(params[name], NotGiven | Omit)
+        }
+        if extra_body:
+            body.update(extra_body)  # as the client merges ``extra_body``: new keys go last
+        fragment = extra_body.get("tools") if extra_body else None
+        parts = []
+        for name, value in body.items():
+            if name == "messages":
+                encoded = self._messages.json
+            elif fragment is not None and value is fragment:
+                encoded = self._encoder.tools(value)
+            else:
+                encoded = dumps(to_plain(value))
+            parts.append(dumps(name) + b":" + encoded)
+
+        options: dict[str, Any] = {"headers": {"Content-Type": "application/json", **(extra_headers or {})}}
+        if extra_query is not None:
+            options["params"] = extra_query
+        if not isinstance(timeout, NotGiven):
+            options["timeout"] = timeout
+        return await self._wrapped.post(
+            "/chat/completions",
+            content=b"{" + b",".join(parts) + b"}",
+            options=options,  # type: ignore[arg-type]
+            cast_to=ChatCompletion,
+            stream=params.get("stream") is True,
+            stream_cls=AsyncStream[ChatCompletionChunk],
+        )
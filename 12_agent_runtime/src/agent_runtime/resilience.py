@@ -0,0 +1,317 @@
+"""Retries, circuit breakers and fallback tools for failing function tools.
+
+Lesson 11 (``part4.py``) sketches ``get_weather`` falling back to another service when it
+fails. Without help every failure waits for the slow dependency, comes back to the model as an
+error message and costs another model turn before anything else is tried. ``ToolResilience``
+wraps function tools so that, within the same tool call:
+
+- failures are retried with jittered exponential backoff, limited by a retry budget (retries
+  may add at most ``retry_ratio`` extra calls per call, so an outage is not amplified),
+- a per-tool circuit breaker opens after ``failure_threshold`` consecutive failures and fails
+  fast until ``reset_timeout`` has passed, then lets one probe call through,
+- declared fallback tools (same arguments) are tried in order, without a round trip through
+  the model::
+
+    resilience = ToolResilience(retries=2, failure_threshold=3)
+
+    @function_tool(failure_error_function=None)
+    def get_weather_alternative(city: str) -> str: ...
+
+    @resilience.tool(fallbacks=[get_weather_alternative])
+    @function_tool(failure_error_function=None)
+    def get_weather(city: str) -> str: ...
+
+Declare wrapped tools with ``failure_error_function=None`` so exceptions reach the wrapper.
+Only dependency failures (``retry_on``: timeouts and connection errors by default) are retried
+and count toward the breaker, once per call however many attempts it took; bad arguments or
+bugs go straight to the fallbacks. The SDK's default error message hides which it was, so it is
+raised as ``ToolFailure`` and only retried when ``retry_on`` includes it. Breaker state,
+retries, fallbacks and failures are exported through a ``MetricsRegistry``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+import weakref
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, replace
+from typing import Any
+
+import httpx
+import openai
+from agents import FunctionTool
+from agents.tool_context import ToolContext
+
+from ._internal import TOOL_ERROR_PREFIX
+from .metrics import MetricsRegistry, default_registry
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class ToolFailure(Exception):
+    """A tool returned the SDK's error message instead of raising."""
+
+
+class CircuitOpen(Exception):
+    """The tool's breaker is open; the call was not attempted."""
+
+
+# Failures of the dependency behind a tool, as opposed to bad arguments or bugs.
+RETRYABLE_ERRORS: tuple[type[BaseException], ...] = (
+    TimeoutError,
+    ConnectionError,
+    httpx.TransportError,
+    openai.APIConnectionError,
+)
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: closed -> open -> half-open (one probe) -> closed."""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+
+    def allow(self) -> bool:
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = HALF_OPEN
+        if self.state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.state, self.failures, self._probing = CLOSED, 0, False
+
+    def release(self) -> None:
+        """End a call without a verdict (cancelled, or not the dependency's fault)."""
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probing = False
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+
+class RetryBudget:
+    """Token bucket: every call deposits ``ratio`` tokens (up to ``burst``), a retry spends one."""
+
+    def __init__(self, ratio: float = 0.2, burst: float = 10.0) -> None:
+        self.ratio = ratio
+        self.burst = burst
+        self.tokens = burst
+
+    def deposit(self) -> None:
+        self.tokens = min(self.burst, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+@dataclass
+class _ToolMetrics:
+    """Metric handles for one tool, resolved once."""
+
+    calls: Any
+    failures: Any
+    retries: Any
+    short_circuits: Any
+    budget_exhausted: Any
+
+
+class ToolResilience:
+    """Retries, breakers and fallbacks for function tools.
+
+    Args:
+        retries: Retries per tool call (on top of the first attempt), budget permitting.
+        backoff: Base delay in seconds; retry ``n`` waits ``uniform(0, backoff * 2**n)``.
+        max_backoff: Upper bound for a single backoff delay.
+        retry_ratio: Retry budget, as extra attempts per call across all calls of a tool.
+        failure_threshold: Consecutive failures that open a tool's breaker.
+        reset_timeout: Seconds an open breaker fails fast before letting a probe through.
+        retry_on: Exception types that mean the dependency failed: they are retried and count
+            toward the breaker. Others go straight to the fallbacks. Defaults to
+            ``RETRYABLE_ERRORS`` (timeouts, connection errors); add ``ToolFailure`` to retry
+            tools that keep the SDK's default ``failure_error_function``.
+        registry: Where metrics go (``default_registry`` by default).
+        seed: Seed for the backoff jitter, for reproducible runs.
+
+    Metrics: ``tool_breaker_state{tool}`` (0 closed, 1 half-open, 2 open),
+    ``tool_calls_total{tool}``, ``tool_failures_total{tool}``, ``tool_retries_total{tool}``,
+    ``tool_short_circuits_total{tool}``, ``tool_retry_budget_exhausted_total{tool}`` and
+    ``tool_fallbacks_total{tool,fallback}``.
+    """
+
+    def __init__(
+        self,
+        retries: int = 2,
+        backoff: float = 0.1,
+        max_backoff: float = 2.0,
+        retry_ratio: float = 0.2,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        retry_on: tuple[type[BaseException], ...] = RETRYABLE_ERRORS,
+        registry: MetricsRegistry | None = None,
+        seed: int | None = None,
+    ) -> None:
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.retry_ratio = retry_ratio
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.retry_on = retry_on
+        self.registry = registry or default_registry
+        self.breakers: dict[str, CircuitBreaker] = {}
+        self.budgets: dict[str, RetryBudget] = {}
+        self._metrics: dict[str, _ToolMetrics] = {}
+        self._rng = random.Random(seed)
+        # Holds the instance weakly, so a discarded ToolResilience drops out of the registry;
+        # ``close()`` unregisters it right away.
+        self_ref = weakref.ref(self)
+
+        def collect(registry: MetricsRegistry) -> None:
+            resilience = self_ref()
+            if resilience is None:
+                registry.remove_collector(collect)
+            else:
+                resilience._collect(registry)
+
+        self._collector = collect
+        self.registry.add_collector(collect)
+
+    def close(self) -> None:
+        """Stop exporting breaker state to the registry."""
+        self.registry.remove_collector(self._collector)
+
+    def _collect(self, registry: MetricsRegistry) -> None:
+        for name, breaker in self.breakers.items():
+            # An open breaker whose timeout has passed is reported as half-open.
+            state = breaker.state
+            if state == OPEN and time.monotonic() - breaker.opened_at >= breaker.reset_timeout:
+                state = HALF_OPEN
+            registry.gauge("tool_breaker_state", tool=name).set(_STATE_VALUES[state])
+
+    def _register(self, name: str) -> tuple[CircuitBreaker, RetryBudget, _ToolMetrics]:
+        if name not in self.breakers:
+            self.breakers[name] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            self.budgets[name] = RetryBudget(self.retry_ratio)
+            self._metrics[name] = _ToolMetrics(
+                *(
+                    self.registry.counter(metric, tool=name)
+                    for metric in (
+                        "tool_calls_total",
+                        "tool_failures_total",
+                        "tool_retries_total",
+                        "tool_short_circuits_total",
+                        "tool_retry_budget_exhausted_total",
+                    )
+                )
+            )
+        return self.breakers[name], self.budgets[name], self._metrics[name]
+
+    async def _attempt(self, tool: FunctionTool, ctx: ToolContext[Any], args: str, retries: int) -> Any:
+        """Call one tool through its breaker, retrying within its budget."""
+        breaker, budget, metrics = self._register(tool.name)
+        metrics.calls.inc()
+        budget.deposit()
+        if not breaker.allow():
+            metrics.short_circuits.inc()
+            raise CircuitOpen(f"{tool.name} is temporarily unavailable (circuit open)")
+        attempt = 0
+        while True:
+            try:
+                result = await tool.on_invoke_tool(ctx, args)
+                if isinstance(result, str) and result.startswith(TOOL_ERROR_PREFIX):
+                    raise ToolFailure(result)
+            except Exception as e:
+                metrics.failures.inc()
+                if not isinstance(e, self.retry_on):
+                    breaker.release()
+                    raise
+                # The breaker gets one verdict per call. Probes (half-open) are not retried, and
+                # neither is a call whose breaker other calls have opened meanwhile.
+                if attempt >= retries or breaker.state != CLOSED:
+                    breaker.record_failure()
+                    raise
+                if not budget.withdraw():
+                    metrics.budget_exhausted.inc()
+                    breaker.record_failure()
+                    raise
+                metrics.retries.inc()
+                await asyncio.sleep(self._rng.uniform(0, min(self.max_backoff, self.backoff * 2**attempt)))
+                attempt += 1
+            except BaseException:
+                # Cancelled: free the half-open probe slot, or the breaker would never close.
+                breaker.release()
+                raise
+            else:
+                breaker.record_success()
+                return result
+
+    def wrap(
+        self,
+        tool: FunctionTool,
+        *,
+        fallbacks: Sequence[FunctionTool] = (),
+        retries: int | None = None,
+    ) -> FunctionTool:
+        """Return a copy of ``tool`` with retries, a breaker and ``fallbacks``.
+
+        Fallbacks receive the same arguments and get their own breakers (no retries). When
+        everything fails the model gets one error message naming the last failure.
+        """
+        retries = self.retries if retries is None else retries
+        name = tool.name
+        self._register(name)
+        for fallback in fallbacks:
+            self._register(fallback.name)
+        fallback_counters = {
+            f.name: self.registry.counter("tool_fallbacks_total", tool=name, fallback=f.name)
+            for f in fallbacks
+        }
+
+        async def on_invoke_tool(ctx: ToolContext[Any], args: str) -> Any:
+            try:
+                return await self._attempt(tool, ctx, args, retries)
+            except Exception as e:
+                error: Exception = e
+            for fallback in fallbacks:
+                fallback_counters[fallback.name].inc()
+                try:
+                    return await self._attempt(fallback, ctx, args, 0)
+                except Exception as e:
+                    error = e
+            if isinstance(error, ToolFailure):
+                return str(error)
+            if isinstance(error, CircuitOpen):
+                return f"{error}. Do not call it again right now."
+            return f"{TOOL_ERROR_PREFIX} Please try again. Error: {error}"
+
+        return replace(tool, on_invoke_tool=on_invoke_tool)
+
+    def tool(
+        self,
+        tool: FunctionTool | None = None,
+        *,
+        fallbacks: Sequence[FunctionTool] = (),
+        retries: int | None = None,
+    ) -> FunctionTool | Callable[[FunctionTool], FunctionTool]:
+        """Decorator form of ``wrap``; use above ``@function_tool``."""
+        if tool is not None:
+            return self.wrap(tool, fallbacks=fallbacks, retries=retries)
+        return lambda t: self.wrap(t, fallbacks=fallbacks, retries=retries)
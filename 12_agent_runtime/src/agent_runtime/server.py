@@ -0,0 +1,538 @@
+"""Multi-process HTTP serving for agents.
+
+The lessons only offer one-shot scripts. ``AgentServer`` serves agents over HTTP from a
+pre-forked pool: the parent binds the socket and forks ``workers`` processes, each running one
+event loop (uvloop when installed) with its own warm pooled model client::
+
+    agent-serve coach=09_agents_as_tool/src/agents_as_tool/main.py:coach \\
+        router=10_basic_handsoff/src/10_basic_handsoff/main.py:pre_router \\
+        --sessions sessions.sqlite3 --workers 4 --port 8000
+
+    curl -s localhost:8000/agents/coach -d '{"input": "Summarize: LLMs help with drafting."}'
+    curl -sN localhost:8000/agents/router -H 'accept: text/event-stream' \\
+        -d '{"input": "I want to run a 5k", "session_id": "user-42"}'
+
+``POST /agents/<name>`` takes ``{"input": ..., "session_id": ..., "stream": ...}`` and answers
+with JSON (``output``, ``agent``, ``usage``) or, when streaming (``"stream": true`` or
+``Accept: text/event-stream``), with server-sent ``delta``, ``agent``, ``tool_call`` and
+``done`` events. ``GET /agents`` lists the agents, ``GET /healthz`` reports the worker.
+
+Each worker runs at most ``max_concurrency`` agent runs and queues ``max_queue`` more; past
+that, requests get ``503`` with ``Retry-After`` instead of piling up. ``SIGTERM`` / ``SIGINT``
+drain the server: workers stop accepting, let in-flight runs finish (up to ``drain_timeout``)
+and close their clients. The parent restarts workers that die.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import dataclasses
+import functools
+import importlib
+import json
+import logging
+import os
+import runpy
+import signal
+import socket
+import sys
+import traceback
+from collections.abc import AsyncIterator, Callable, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from agents import Agent, RunConfig, Runner, RunResult, RunResultStreaming
+from openai.types.responses import ResponseTextDeltaEvent
+
+from .client import aclose_clients, get_client, get_run_config
+from .env import load_env
+from .prerouter import PreRouter
+from .session import LogSession, SessionStore, starting_agent
+
+logger = logging.getLogger("agent_runtime")
+
+Target = Agent[Any] | PreRouter
+# What clients see when a run fails; the exception itself (provider errors, paths) is logged.
+_RUN_FAILED = {"message": "The agent run failed.", "type": "server_error"}
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    411: "Length Required",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str, headers: dict[str, str] | None = None) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers or {}
+
+
+@dataclass
+class ServerStats:
+    """Counters of one worker process."""
+
+    requests: int = 0
+    runs: int = 0
+    streamed: int = 0
+    rejected: int = 0
+    """Requests turned away with ``503`` (over capacity or draining)."""
+    errors: int = 0
+    active: int = 0
+    waiting: int = 0
+
+
+def _loop_factory() -> Callable[[], asyncio.AbstractEventLoop] | None:
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop.new_event_loop
+
+
+def _jsonable(value: Any) -> Any:
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    return value
+
+
+def _result_payload(result: RunResult | RunResultStreaming) -> dict[str, Any]:
+    usage = result.context_wrapper.usage
+    return {
+        "output": _jsonable(result.final_output),
+        "agent": result.last_agent.name,
+        "usage": {
+            "requests": usage.requests,
+            "input_tokens": usage.input_tokens,
+            "output_tokens": usage.output_tokens,
+            "total_tokens": usage.total_tokens,
+        },
+    }
+
+
+class AgentServer:
+    """Serves agents (or ``PreRouter``s) over HTTP from ``workers`` pre-forked processes.
+
+    Args:
+        agents: Agents by URL name.
+        host: Interface to bind.
+        port: Port to bind (``0`` picks a free one).
+        workers: Worker processes; ``1`` serves from the current process (no fork).
+        max_concurrency: Agent runs per worker at the same time.
+        max_queue: Requests per worker waiting for a run slot (default ``max_concurrency``).
+        drain_timeout: Seconds in-flight runs get to finish on shutdown.
+        run_config: Run configuration (default ``get_run_config()``: the shared pooled model).
+        sessions: Store for requests with a ``session_id`` (conversations any worker resumes).
+        max_turns: ``max_turns`` of every run.
+        warmup: Open the model client's connection when a worker starts.
+    """
+
+    def __init__(
+        self,
+        agents: Mapping[str, Target],
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        workers: int = 1,
+        max_concurrency: int = 64,
+        max_queue: int | None = None,
+        drain_timeout: float = 30.0,
+        run_config: RunConfig | None = None,
+        sessions: SessionStore | None = None,
+        max_turns: int = 10,
+        warmup: bool = True,
+        backlog: int = 1024,
+    ) -> None:
+        self.agents = dict(agents)
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_concurrency if max_queue is None else max_queue
+        self.drain_timeout = drain_timeout
+        self.run_config = run_config or get_run_config()
+        self.sessions = sessions
+        self.max_turns = max_turns
+        self.warmup = warmup
+        self.backlog = backlog
+        self.stats = ServerStats()
+        self._server: asyncio.Server | None = None
+        self._gate: asyncio.Semaphore | None = None
+        self._idle: asyncio.Event | None = None
+        self._connections: set[asyncio.Task[Any]] = set()
+        self._draining = False
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    # -- one worker ---------------------------------------------------------------------
+
+    async def start(self, sock: socket.socket | None = None) -> AgentServer:
+        """Start serving on the running loop (on ``sock`` when given, else ``host:port``)."""
+        self._gate = asyncio.Semaphore(self.max_concurrency)
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._draining = False
+        if sock is not None:
+            self._server = await asyncio.start_server(self._handle, sock=sock)
+        else:
+            self._server = await asyncio.start_server(self._handle, self.host, self.port, backlog=self.backlog)
+            self.port = self._server.sockets[0].getsockname()[1]
+        if self.warmup:
+            await self._warm()
+        return self
+
+    async def _warm(self) -> None:
+        # Any answer (even an error) leaves a connection in the client's keep-alive pool.
+        with contextlib.suppress(Exception):
+            await asyncio.wait_for(get_client().models.list(), timeout=5)
+
+    async def close(self) -> None:
+        """Drain: stop accepting, wait for in-flight runs, then close connections and clients."""
+        if self._server is None:
+            return
+        self._draining = True
+        self._server.close()
+        assert self._idle is not None
+        with contextlib.suppress(TimeoutError):
+            await asyncio.wait_for(self._idle.wait(), timeout=self.drain_timeout)
+        for task in list(self._connections):
+            task.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        await self._server.wait_closed()
+        await aclose_clients()
+        self._server = None
+
+    async def __aenter__(self) -> AgentServer:
+        return await self.start()
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    @contextlib.asynccontextmanager
+    async def _slot(self) -> AsyncIterator[None]:
+        """Admission control: a run slot, a place in the queue, or ``503``."""
+        assert self._gate is not None and self._idle is not None
+        if self._draining:
+            self.stats.rejected += 1
+            raise HTTPError(503, "Server is shutting down", {"retry-after": "1"})
+        if self._gate.locked() and self.stats.waiting >= self.max_queue:
+            self.stats.rejected += 1
+            raise HTTPError(503, "Too many requests in flight", {"retry-after": "1"})
+        self.stats.waiting += 1
+        try:
+            await self._gate.acquire()
+        finally:
+            self.stats.waiting -= 1
+        self.stats.active += 1
+        self._idle.clear()
+        try:
+            yield
+        finally:
+            self.stats.active -= 1
+            self._gate.release()
+            if not self.stats.active:
+                self._idle.set()
+
+    # -- HTTP ---------------------------------------------------------------------------
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        assert task is not None
+        self._connections.add(task)
+        try:
+            while not self._draining:
+                head = await reader.readuntil(b"\r\n\r\n")
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                headers = {
+                    k.strip().lower(): v.strip()
+                    for k, _, v in (line.partition(":") for line in header_lines if line)
+                }
+                try:
+                    method, path, _ = request_line.split(" ", 2)
+                    length = int(headers.get("content-length", 0))
+                    if length < 0:
+                        raise ValueError(length)
+                except ValueError:
+                    # The rest of the stream cannot be framed: answer and drop the connection.
+                    await self._send_json(
+                        writer, 400, {"error": {"message": "Malformed request"}}, {"connection": "close"}
+                    )
+                    break
+                if "chunked" in headers.get("transfer-encoding", "").lower():
+                    await self._send_json(writer, 411, {"error": {"message": "Send a content-length"}})
+                    break
+                body = await reader.readexactly(length)
+                self.stats.requests += 1
+                try:
+                    await self._dispatch(method, path, headers, body, writer)
+                except HTTPError as e:
+                    await self._send_json(writer, e.status, {"error": {"message": e.message}}, e.headers)
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    async def _dispatch(
+        self, method: str, path: str, headers: dict[str, str], body: bytes, writer: asyncio.StreamWriter
+    ) -> None:
+        path = path.partition("?")[0].rstrip("/")
+        if path == "/healthz" and method == "GET":
+            status = "draining" if self._draining else "ok"
+            await self._send_json(writer, 200, {"status": status, "pid": os.getpid(), **dataclasses.asdict(self.stats)})
+            return
+        if path == "/agents" and method == "GET":
+            await self._send_json(writer, 200, {"agents": list(self.agents)})
+            return
+        name = path.removeprefix("/agents/")
+        if name == path or name not in self.agents:
+            raise HTTPError(404, f"No route for {method} {path}")
+        if method != "POST":
+            raise HTTPError(405, "Use POST")
+
+        try:
+            request = json.loads(body or b"{}")
+        except ValueError:
+            raise HTTPError(400, "Body must be JSON") from None
+        input = request.get("input") if isinstance(request, dict) else None
+        if not input or not isinstance(input, str | list):
+            raise HTTPError(400, '"input" must be a string or a list of input items')
+        session_id = request.get("session_id")
+        if session_id is not None and (self.sessions is None or not isinstance(input, str)):
+            raise HTTPError(400, "session_id needs a server started with sessions and a string input")
+        stream = bool(request.get("stream")) or "text/event-stream" in headers.get("accept", "")
+
+        async with self._slot():
+            target = self.agents[name]
+            session = self.sessions.session(str(session_id)) if session_id is not None else None
+            if stream:
+                await self._stream(target, input, session, writer)
+            else:
+                await self._run(target, input, session, writer)
+
+    async def _starting_agent(self, target: Target, input: Any, session: LogSession | None) -> Agent[Any]:
+        if session is not None:
+            return await starting_agent(session, target, input)
+        if isinstance(target, PreRouter):
+            return target.classify(input).agent
+        return target
+
+    async def _run(self, target: Target, input: Any, session: LogSession | None, writer: asyncio.StreamWriter) -> None:
+        self.stats.runs += 1
+        try:
+            agent = await self._starting_agent(target, input, session)
+            result = await Runner.run(
+                agent, input, session=session, run_config=self.run_config, max_turns=self.max_turns
+            )
+            if session is not None:
+                await session.set_last_agent(result.last_agent.name)
+        except Exception:
+            self.stats.errors += 1
+            logger.exception("Run failed")
+            await self._send_json(writer, 500, {"error": _RUN_FAILED})
+            return
+        await self._send_json(writer, 200, _result_payload(result))
+
+    async def _stream(
+        self, target: Target, input: Any, session: LogSession | None, writer: asyncio.StreamWriter
+    ) -> None:
+        self.stats.runs += 1
+        self.stats.streamed += 1
+        writer.write(
+            b"HTTP/1.1 200 OK\r\ncontent-type: text/event-stream\r\ncache-control: no-cache\r\n"
+            b"transfer-encoding: chunked\r\n\r\n"
+        )
+
+        def send(event: str, payload: dict[str, Any]) -> None:
+            data = f"event: {event}\ndata: {json.dumps(payload, default=str)}\n\n".encode()
+            writer.write(b"%x\r\n%s\r\n" % (len(data), data))
+
+        result: RunResultStreaming | None = None
+        try:
+            agent = await self._starting_agent(target, input, session)
+            result = Runner.run_streamed(
+                agent, input, session=session, run_config=self.run_config, max_turns=self.max_turns
+            )
+            async for event in result.stream_events():
+                if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
+                    send("delta", {"text": event.data.delta})
+                elif event.type == "agent_updated_stream_event":
+                    send("agent", {"name": event.new_agent.name})
+                elif event.type == "run_item_stream_event" and event.name == "tool_called":
+                    send("tool_call", {"name": getattr(event.item.raw_item, "name", None)})
+                else:
+                    continue
+                await writer.drain()  # back-pressure; raises once the client has gone
+            if session is not None:
+                await session.set_last_agent(result.last_agent.name)
+            send("done", _result_payload(result))
+        except (ConnectionError, asyncio.CancelledError):
+            raise
+        except Exception:
+            self.stats.errors += 1
+            logger.exception("Streamed run failed")
+            send("error", _RUN_FAILED)
+        finally:
+            if result is not None and not result.is_complete:
+                result.cancel()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    async def _send_json(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        payload: dict[str, Any],
+        extra_headers: dict[str, str] | None = None,
+    ) -> None:
+        body = json.dumps(payload, default=str).encode()
+        headers = dict(extra_headers or {})
+        if self._draining:
+            headers["connection"] = "close"
+        head = "".join(f"{k}: {v}\r\n" for k, v in headers.items())
+        writer.write(
+            f"HTTP/1.1 {status} {_REASONS.get(status, 'Error')}\r\ncontent-type: application/json\r\n"
+            f"content-length: {len(body)}\r\n{head}\r\n".encode()
+            + body
+        )
+        await writer.drain()
+
+    # -- processes ----------------------------------------------------------------------
+
+    async def _serve_worker(self, sock: socket.socket) -> None:
+        await self.start(sock)
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(signum, stop.set)
+        await stop.wait()
+        await self.close()
+
+    def _run_worker(self, sock: socket.socket) -> None:
+        with asyncio.Runner(loop_factory=_loop_factory()) as runner:
+            runner.run(self._serve_worker(sock))
+
+    def serve(self) -> None:
+        """Bind, fork the workers and supervise them until ``SIGTERM`` / ``SIGINT`` (blocking)."""
+        sock = socket.create_server((self.host, self.port), backlog=self.backlog)
+        sock.setblocking(False)
+        self.port = sock.getsockname()[1]
+        print(f"Serving {', '.join(self.agents)} on {self.url} with {self.workers} worker(s)", flush=True)
+        if self.workers <= 1 or not hasattr(os, "fork"):
+            try:
+                self._run_worker(sock)
+            finally:
+                sock.close()
+            return
+
+        children: set[int] = set()
+        stopping = False
+
+        def stop(signum: int, frame: Any) -> None:
+            nonlocal stopping
+            stopping = True
+            for pid in list(children):
+                with contextlib.suppress(ProcessLookupError):
+                    os.kill(pid, signal.SIGTERM)
+
+        def spawn() -> None:
+            pid = os.fork()
+            if pid == 0:
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                signal.signal(signal.SIGINT, signal.SIG_DFL)
+                code = 0
+                try:
+                    self._run_worker(sock)
+                except BaseException:
+                    traceback.print_exc()
+                    code = 1
+                finally:
+                    os._exit(code)
+            children.add(pid)
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+        for _ in range(self.workers):
+            spawn()
+        try:
+            while children:
+                try:
+                    pid, status = os.wait()
+                except ChildProcessError:
+                    break
+                children.discard(pid)
+                if not stopping:
+                    print(f"Worker {pid} exited ({status}), starting a new one", file=sys.stderr, flush=True)
+                    spawn()
+        finally:
+            sock.close()
+
+
+@functools.cache
+def _load_file(path: str) -> dict[str, Any]:
+    load_env(path)
+    sys.path.insert(0, str(Path(path).resolve().parent))
+    return runpy.run_path(path, run_name="__agent_serve__")
+
+
+def load_target(spec: str) -> tuple[str, Target]:
+    """``[name=]module:attr`` or ``[name=]path/to/file.py:attr`` -> ``(name, agent)``."""
+    name, _, ref = spec.rpartition("=")
+    location, _, attr = ref.rpartition(":")
+    if not location or not attr:
+        raise ValueError(f"Expected [name=]module:attr or [name=]file.py:attr, got {spec!r}")
+    if location.endswith(".py"):
+        target = _load_file(location).get(attr)
+    else:
+        target = getattr(importlib.import_module(location), attr, None)
+    if not isinstance(target, Agent | PreRouter):
+        raise TypeError(f"{ref} is not an Agent or PreRouter")
+    return name or attr, target
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="agent-serve", description="Serve agents over HTTP")
+    parser.add_argument("agents", nargs="+", metavar="[NAME=]TARGET", help="module:attr or file.py:attr")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--max-concurrency", type=int, default=64, help="agent runs per worker")
+    parser.add_argument("--max-queue", type=int, help="requests waiting per worker (default: max-concurrency)")
+    parser.add_argument("--drain-timeout", type=float, default=30.0)
+    parser.add_argument("--sessions", help="SQLite file for requests with a session_id")
+    parser.add_argument("--max-turns", type=int, default=10)
+    parser.add_argument("--no-warmup", action="store_true")
+    args = parser.parse_args()
+
+    load_env()
+    server = AgentServer(
+        dict(load_target(spec) for spec in args.agents),
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        max_concurrency=args.max_concurrency,
+        max_queue=args.max_queue,
+        drain_timeout=args.drain_timeout,
+        sessions=SessionStore(args.sessions) if args.sessions else None,
+        max_turns=args.max_turns,
+        warmup=not args.no_warmup,
+    )
+    server.serve()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+"""Append-only SQLite session store for multi-turn runs.
+
+Lesson 10 continues a conversation by holding ``r1.to_input_list()`` in memory and passing
+the whole list back, and it has to remember which specialist owns the conversation. With
+``SessionStore`` every turn is appended to one SQLite log (WAL, so readers never block the
+writer) keyed by session id, together with the agent that answered last. Any worker can
+pick the conversation up::
+
+    sessions = SessionStore("sessions.sqlite3")
+    session = sessions.session("user-42")
+    result = await run_in_session(session, router, "I want to run a 5Km", run_config=run_config)
+    result = await run_in_session(session, router, "I can jog 2 km")  # resumes with the coach
+
+A ``LogSession`` (the SDK ``Session`` protocol) loads lazily and then only reads the rows
+appended since its last read.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from pathlib import Path
+from typing import Any
+
+from agents import Agent, Handoff, Runner, RunResult
+from agents.items import TResponseInputItem
+
+from .prerouter import PreRouter
+
+
+class SessionStore:
+    """One SQLite file holding many sessions; share a single store per process.
+
+    Connections are per thread and calls run in ``asyncio.to_thread``, so the event loop
+    never waits on disk.
+    """
+
+    def __init__(self, path: str | Path = "sessions.sqlite3") -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        # SQLite connections must not cross a fork (pre-forked server workers).
+        ref = weakref.ref(self)
+
+        def reset_in_child() -> None:
+            if (store := ref()) is not None:
+                store._local = threading.local()
+
+        if hasattr(os, "register_at_fork"):  # not on Windows
+            os.register_at_fork(after_in_child=reset_in_child)
+        db = self._connection()
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            " session_id TEXT PRIMARY KEY, last_agent TEXT,"
+            " start_seq INTEGER NOT NULL DEFAULT 0, generation INTEGER NOT NULL DEFAULT 0,"
+            " updated_at REAL NOT NULL)"
+        )
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS session_items ("
+            " session_id TEXT NOT NULL, seq INTEGER NOT NULL, item TEXT NOT NULL,"
+            " PRIMARY KEY (session_id, seq)) WITHOUT ROWID"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, isolation_level=None, timeout=30)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def session(self, session_id: str) -> LogSession:
+        return LogSession(self, session_id)
+
+    # -- synchronous operations, run in worker threads ----------------------------------
+
+    def _state(self, db: sqlite3.Connection, session_id: str) -> tuple[int, int, str | None]:
+        row = db.execute(
+            "SELECT start_seq, generation, last_agent FROM sessions WHERE session_id = ?",
+            (session_id,),
+        ).fetchone()
+        return row if row is not None else (0, 0, None)
+
+    def read(
+        self, session_id: str, after_seq: int, limit: int | None
+    ) -> tuple[int, int, list[tuple[int, str]]]:
+        """Rows newer than ``after_seq`` (or the last ``limit`` rows) plus the session state."""
+        db = self._connection()
+        db.execute("BEGIN")  # one snapshot for the state and the rows
+        try:
+            start_seq, generation, _ = self._state(db, session_id)
+            floor = max(after_seq, start_seq)
+            if limit is None:
+                rows = db.execute(
+                    "SELECT seq, item FROM session_items WHERE session_id = ? AND seq > ? ORDER BY seq",
+                    (session_id, floor),
+                ).fetchall()
+            else:
+                rows = db.execute(
+                    "SELECT seq, item FROM session_items WHERE session_id = ? AND seq > ?"
+                    " ORDER BY seq DESC LIMIT ?",
+                    (session_id, floor, limit),
+                ).fetchall()[::-1]
+        finally:
+            db.execute("COMMIT")
+        return start_seq, generation, rows
+
+    def append(self, session_id: str, items: list[str], last_agent: str | None = None) -> None:
+        db = self._connection()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            (last_seq,) = db.execute(
+                "SELECT COALESCE(MAX(seq), 0) FROM session_items WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            db.executemany(
+                "INSERT INTO session_items VALUES (?, ?, ?)",
+                [(session_id, last_seq + i, item) for i, item in enumerate(items, 1)],
+            )
+            db.execute(
+                "INSERT INTO sessions (session_id, last_agent, updated_at) VALUES (?, ?, ?)"
+                " ON CONFLICT(session_id) DO UPDATE SET"
+                " last_agent = COALESCE(excluded.last_agent, last_agent), updated_at = excluded.updated_at",
+                (session_id, last_agent, time.time()),
+            )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    def pop(self, session_id: str) -> str | None:
+        """Delete the newest row; the only operation that rewrites the log."""
+        db = self._connection()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            start_seq, _, _ = self._state(db, session_id)
+            row = db.execute(
+                "DELETE FROM session_items WHERE session_id = ? AND seq = "
+                " (SELECT MAX(seq) FROM session_items WHERE session_id = ?) AND seq > ?"
+                " RETURNING item",
+                (session_id, session_id, start_seq),
+            ).fetchone()
+            self._bump(db, session_id, "start_seq")
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return row[0] if row else None
+
+    def clear(self, session_id: str) -> None:
+        """Hide every row so far by moving the session's start past them (nothing is deleted)."""
+        db = self._connection()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            self._bump(
+                db,
+                session_id,
+                "(SELECT COALESCE(MAX(seq), 0) FROM session_items WHERE session_id = :id)",
+            )
+            db.execute("UPDATE sessions SET last_agent = NULL WHERE session_id = ?", (session_id,))
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    def _bump(self, db: sqlite3.Connection, session_id: str, start_seq_sql: str) -> None:
+        db.execute(
+            "INSERT INTO sessions (session_id, updated_at) VALUES (:id, :now)"
+            " ON CONFLICT(session_id) DO NOTHING",
+            {"id": session_id, "now": time.time()},
+        )
+        db.execute(
+            f"UPDATE sessions SET start_seq = {start_seq_sql}, generation = generation + 1,"
+            " updated_at = :now WHERE session_id = :id",
+            {"id": session_id, "now": time.time()},
+        )
+
+    def last_agent(self, session_id: str) -> str | None:
+        return self._state(self._connection(), session_id)[2]
+
+    def set_last_agent(self, session_id: str, name: str) -> None:
+        self.append(session_id, [], last_agent=name)
+
+
+class LogSession:
+    """SDK ``Session`` backed by a ``SessionStore``.
+
+    Items read once are kept on the object, and later ``get_items()`` calls only fetch rows
+    appended since (by this or any other worker). ``pop_item`` / ``clear_session`` on any
+    worker bump the session generation, which drops the local copy.
+    """
+
+    def __init__(self, store: SessionStore, session_id: str) -> None:
+        self.store = store
+        self.session_id = session_id
+        self._items: list[TResponseInputItem] = []
+        self._seq = 0
+        self._generation: int | None = None
+
+    async def get_items(self, limit: int | None = None) -> list[TResponseInputItem]:
+        if limit is not None and self._generation is None:
+            # Not loaded yet: fetch just the tail instead of the whole log.
+            _, _, rows = await asyncio.to_thread(self.store.read, self.session_id, 0, limit)
+            return [json.loads(item) for _, item in rows]
+
+        start_seq, generation, rows = await asyncio.to_thread(
+            self.store.read, self.session_id, self._seq, None
+        )
+        if generation != self._generation:
+            if self._generation is not None:
+                # Popped or cleared elsewhere: reload from the session start.
+                self._items, self._seq = [], start_seq
+                start_seq, generation, rows = await asyncio.to_thread(
+                    self.store.read, self.session_id, 0, None
+                )
+            self._generation = generation
+        self._items.extend(json.loads(item) for _, item in rows)
+        if rows:
+            self._seq = rows[-1][0]
+        return list(self._items[-limit:] if limit else self._items)
+
+    async def add_items(self, items: list[TResponseInputItem]) -> None:
+        if items:
+            encoded = [json.dumps(item, default=str) for item in items]
+            await asyncio.to_thread(self.store.append, self.session_id, encoded)
+
+    async def pop_item(self) -> TResponseInputItem | None:
+        item = await asyncio.to_thread(self.store.pop, self.session_id)
+        self._generation = None
+        self._items, self._seq = [], 0
+        return json.loads(item) if item is not None else None
+
+    async def clear_session(self) -> None:
+        await asyncio.to_thread(self.store.clear, self.session_id)
+        self._generation = None
+        self._items, self._seq = [], 0
+
+    async def get_last_agent(self) -> str | None:
+        return await asyncio.to_thread(self.store.last_agent, self.session_id)
+
+    async def set_last_agent(self, name: str) -> None:
+        await asyncio.to_thread(self.store.set_last_agent, self.session_id, name)
+
+
+def _agents_by_name(entry: Agent[Any]) -> dict[str, Agent[Any]]:
+    """``entry`` and every agent reachable through its handoffs."""
+    found: dict[str, Agent[Any]] = {}
+    pending: list[Agent[Any]] = [entry]
+    while pending:
+        agent = pending.pop()
+        if agent.name in found:
+            continue
+        found[agent.name] = agent
+        for target in agent.handoffs:
+            if isinstance(target, Agent):
+                pending.append(target)
+            elif isinstance(target, Handoff):
+                # Handoff objects only keep the target's name; resolve through the closure.
+                invoke = target.on_invoke_handoff
+                for cell in getattr(invoke, "__closure__", None) or ():
+                    if isinstance(cell.cell_contents, Agent):
+                        pending.append(cell.cell_contents)
+    return found
+
+
+async def run_in_session(
+    session: LogSession,
+    entry_agent: Agent[Any] | PreRouter,
+    input: str,
+    agents: dict[str, Agent[Any]] | None = None,
+    **run_kwargs: Any,
+) -> RunResult:
+    """Run one user turn, starting with the agent that owned the conversation last.
+
+    ``agents`` maps names to agents; by default it is ``entry_agent`` plus everything reachable
+    through handoffs. The agent that answers is recorded for the next turn. With a
+    ``PreRouter`` as ``entry_agent``, a conversation nobody owns yet starts with its pick.
+    """
+    agent = await starting_agent(session, entry_agent, input, agents)
+    result = await Runner.run(agent, input, session=session, **run_kwargs)
+    await session.set_last_agent(result.last_agent.name)
+    return result
+
+
+async def starting_agent(
+    session: LogSession,
+    entry_agent: Agent[Any] | PreRouter,
+    input: str,
+    agents: dict[str, Agent[Any]] | None = None,
+) -> Agent[Any]:
+    """The conversation's owner, else the pre-router's pick, else ``entry_agent``."""
+    if isinstance(entry_agent, PreRouter):
+        pre_router, entry_agent = entry_agent, entry_agent.fallback
+        agents = agents or {**_agents_by_name(entry_agent), **pre_router.agents()}
+    else:
+        pre_router = None
+    agents = agents or _agents_by_name(entry_agent)
+    owner = await session.get_last_agent()
+    if owner:
+        return agents.get(owner, entry_agent)
+    if pre_router is not None:
+        return pre_router.classify(input).agent
+    return entry_agent
@@ -0,0 +1,132 @@
+"""Memoization for pure and TTL-cacheable function tools.
+
+Pure tools like ``multiply`` (lesson 03) or ``calculate_area`` (lessons 04 and 08) run again
+every time the model calls them, and models often repeat the same call within a run and
+across runs. ``ToolCache`` memoizes results by tool name and canonicalized arguments in a
+bounded LRU, and identical calls that arrive while the first is still running wait for it
+instead of running again::
+
+    tool_cache = ToolCache(maxsize=1024)
+
+    @tool_cache.tool                 # pure: cached until evicted
+    @function_tool
+    def multiply(a: int, b: int) -> int: ...
+
+    @tool_cache.tool(ttl=600)        # slow upstream lookup, fresh for ten minutes
+    @function_tool
+    def get_weather(city: str) -> str: ...
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import json
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from agents import FunctionTool
+from agents.tool_context import ToolContext
+
+from ._internal import TOOL_ERROR_PREFIX, LRUCache, PerLoop
+
+
+def canonical_arguments(args: str) -> str:
+    """Arguments JSON with sorted keys and no whitespace, so equal calls get equal keys."""
+    try:
+        return json.dumps(json.loads(args or "{}"), sort_keys=True, separators=(",", ":"))
+    except ValueError:
+        return args
+
+
+@dataclass
+class ToolCacheStats:
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    """Calls that waited for an identical call already in flight."""
+
+    @property
+    def hit_rate(self) -> float:
+        calls = self.hits + self.misses + self.coalesced
+        return (self.hits + self.coalesced) / calls if calls else 0.0
+
+
+class ToolCache:
+    """Shared LRU of tool results.
+
+    Args:
+        maxsize: Results kept across all tools; least recently used are evicted.
+        ttl: Default lifetime in seconds; ``None`` caches pure tools until evicted.
+
+    Only memoize tools whose result depends on nothing but their arguments (no run
+    context, no side effects). Failures are not cached, whether raised or turned into the
+    SDK's default error message.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float | None = None) -> None:
+        self.ttl = ttl
+        self.stats: dict[str, ToolCacheStats] = {}
+        self._caches: dict[float | None, LRUCache] = {}
+        self._maxsize = maxsize
+        # Futures bind to their loop; tools also run on pool threads with loops of their own.
+        self._pending: PerLoop[dict[tuple[str, str], asyncio.Future[Any]]] = PerLoop(dict)
+
+    def _cache(self, ttl: float | None) -> LRUCache:
+        # One LRU per distinct TTL (usually one or two), each bounded by ``maxsize``.
+        cache = self._caches.get(ttl)
+        if cache is None:
+            cache = self._caches[ttl] = LRUCache(self._maxsize, ttl)
+        return cache
+
+    def wrap(self, tool: FunctionTool, *, ttl: float | None = None) -> FunctionTool:
+        """Return a copy of ``tool`` whose results are memoized."""
+        invoke = tool.on_invoke_tool
+        name = tool.name
+        cache = self._cache(ttl if ttl is not None else self.ttl)
+        stats = self.stats.setdefault(name, ToolCacheStats())
+
+        async def on_invoke_tool(ctx: ToolContext[Any], args: str) -> Any:
+            key = (name, canonical_arguments(args))
+            cached = cache.get(key)
+            if cached is not None:
+                stats.hits += 1
+                return cached[0]
+            in_flight = self._pending.get()
+            pending = in_flight.get(key)
+            if pending is not None:
+                stats.coalesced += 1
+                return await asyncio.shield(pending)
+
+            stats.misses += 1
+            future = in_flight[key] = asyncio.get_running_loop().create_future()
+            try:
+                result = await invoke(ctx, args)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except BaseException as e:
+                future.set_exception(e)
+                future.exception()  # mark retrieved when nobody else is waiting
+                raise
+            finally:
+                del in_flight[key]
+            if not (isinstance(result, str) and result.startswith(TOOL_ERROR_PREFIX)):
+                cache.put(key, (result,))
+            future.set_result(result)
+            return result
+
+        return dataclasses.replace(tool, on_invoke_tool=on_invoke_tool)
+
+    def tool(
+        self, tool: FunctionTool | None = None, *, ttl: float | None = None
+    ) -> FunctionTool | Callable[[FunctionTool], FunctionTool]:
+        """Decorator form of ``wrap``; use above ``@function_tool``."""
+        if tool is not None:
+            return self.wrap(tool, ttl=ttl)
+        return lambda t: self.wrap(t, ttl=ttl)
+
+    def clear(self) -> None:
+        for cache in self._caches.values():
+            cache.clear()
@@ -0,0 +1,646 @@
+"""Non-blocking execution of function tools.
+
+A tool declared ``async`` that calls ``time.sleep`` (like ``search`` in lessons 05 and 07)
+freezes the event loop and every other run sharing it. ``ToolRuntime`` wraps function tools
+so that:
+
+- sync or misbehaving tools run on a bounded thread pool (``offload=True``; plain ``def``
+  tools by default), so the tool calls of one model turn (``calculate_area`` and
+  ``get_weather`` in lesson 08) run side by side and the turn takes as long as the slowest,
+- a loop-stall watchdog notices when an inline tool blocks the loop and sends that tool's
+  later calls to the pool automatically (``offload=None``, the default, for async tools),
+- CPU-bound tools, which hold the GIL even on a thread, run in a warm pool of worker processes
+  (``offload="process"``) and spread across cores,
+- a tool can be marked ``sequential``: it waits for the run's earlier tool calls and later ones
+  wait for it, for tools that depend on (or change) what other tools see,
+- each tool can have its own concurrency limit,
+- each tool (or every tool of an agent, ``wrap_agent``) can have a deadline: async tools are
+  cancelled, thread-pooled ones are abandoned and asked to stop through ``current_deadline()``,
+  and the model gets a structured timeout result so the run can continue.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import importlib
+import inspect
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import weakref
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, replace
+from typing import Any, Literal, TypeVar, overload
+
+from agents import Agent, FunctionTool, ModelBehaviorError, Usage
+from agents.function_schema import FuncSchema, function_schema
+from agents.tool import default_tool_error_function
+from agents.tool_context import ToolContext
+from pydantic import ValidationError
+
+from ._internal import PerLoop, thread_runner
+from .metrics import MetricsRegistry, default_registry
+
+logger = logging.getLogger("agent_runtime")
+
+ToolInvoker = Callable[[ToolContext[Any], str], Awaitable[Any]]
+
+
+class LoopStallWatchdog:
+    """Background thread that reports when an event loop stops turning.
+
+    The loop is asked to run a tiny heartbeat callback every ``interval`` seconds. If no
+    heartbeat lands for ``threshold`` seconds, ``on_stall(duration, frame)`` is called once for
+    that stall from the watchdog thread, with the loop thread's current frame.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.1,
+        interval: float = 0.02,
+        on_stall: Callable[[float, Any], None] | None = None,
+    ) -> None:
+        self.threshold = threshold
+        self.interval = interval
+        self.on_stall = on_stall
+        self.stalls = 0
+        self.longest_stall = 0.0
+        self._loop: weakref.ref[asyncio.AbstractEventLoop] | None = None
+        self._loop_thread_id: int | None = None
+        self._last_beat = time.monotonic()
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    def watch(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Start watching ``loop`` (must be called from the loop's own thread)."""
+        if self._loop is not None and self._loop() is loop:
+            return
+        self._loop = weakref.ref(loop)
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="loop-stall-watchdog", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _beat(self) -> None:
+        self._last_beat = time.monotonic()
+
+    def _run(self) -> None:
+        stalled_since: float | None = None
+        while not self._stop.wait(self.interval):
+            loop = self._loop() if self._loop else None
+            if loop is None or loop.is_closed():
+                continue
+            try:
+                loop.call_soon_threadsafe(self._beat)
+            except RuntimeError:
+                continue
+
+            lag = time.monotonic() - self._last_beat
+            if lag < self.threshold:
+                if stalled_since is not None:
+                    self.longest_stall = max(self.longest_stall, time.monotonic() - stalled_since)
+                    stalled_since = None
+                continue
+            if stalled_since is not None:
+                continue
+
+            stalled_since = self._last_beat
+            self.stalls += 1
+            if self.on_stall is not None and self._loop_thread_id is not None:
+                frame = sys._current_frames().get(self._loop_thread_id)
+                self.on_stall(lag, frame)
+
+
+@dataclass
+class ToolStats:
+    calls: int = 0
+    offloaded: int = 0
+    stalls: int = 0
+    timeouts: int = 0
+    abandoned: int = 0
+    """Timed-out calls whose pool thread was still running (it finishes in the background)."""
+
+
+class ToolTimeout(TimeoutError):
+    """Raised by ``Deadline.check()`` once the tool call has timed out."""
+
+
+class Deadline:
+    """Deadline of the current tool call, for tools that want to stop early.
+
+    Sync tools on the thread pool cannot be interrupted; long-running ones should call
+    ``check()`` (or sleep with ``wait()``) now and then so their thread is freed soon after
+    the call times out::
+
+        deadline = current_deadline()
+        for page in pages:
+            fetch(page)
+            if deadline:
+                deadline.check()
+    """
+
+    def __init__(self, timeout: float) -> None:
+        self.timeout = timeout
+        self.expires_at = time.monotonic() + timeout
+        self._cancelled = threading.Event()
+
+    @property
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self._cancelled.is_set() or time.monotonic() >= self.expires_at
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    def check(self) -> None:
+        if self.expired:
+            raise ToolTimeout(f"Tool call exceeded its {self.timeout:g} s deadline")
+
+    def wait(self, seconds: float) -> None:
+        """Blocking sleep that ends early (with ``ToolTimeout``) when the deadline passes."""
+        self._cancelled.wait(min(seconds, self.remaining))
+        self.check()
+
+
+_deadline: contextvars.ContextVar[Deadline | None] = contextvars.ContextVar("tool_deadline", default=None)
+
+
+def current_deadline() -> Deadline | None:
+    """The running tool call's deadline, or ``None`` without a timeout."""
+    return _deadline.get()
+
+
+def timeout_result(tool_name: str, timeout: float) -> str:
+    """What the model sees when a tool call times out."""
+    return json.dumps(
+        {
+            "error": "timeout",
+            "tool": tool_name,
+            "timeout_seconds": timeout,
+            "message": (
+                f"{tool_name} did not finish within {timeout:g} seconds. Continue without its "
+                "result, or try again later with a narrower request."
+            ),
+        }
+    )
+
+
+_MISSING = object()
+
+
+def _closure_value(invoke: Callable[..., Any], name: str) -> Any:
+    """Variable ``name`` of the ``@function_tool`` closure behind ``invoke`` (looking through
+    any wrappers around it), or ``_MISSING``."""
+    pending, seen = [invoke], set()
+    while pending:
+        fn = pending.pop()
+        if id(fn) in seen or not hasattr(fn, "__code__"):
+            continue
+        seen.add(id(fn))
+        for free_name, cell in zip(fn.__code__.co_freevars, fn.__closure__ or ()):
+            try:
+                value = cell.cell_contents
+            except ValueError:  # empty cell
+                continue
+            if free_name == name:
+                return value
+            if inspect.isfunction(value):
+                pending.append(value)
+    return _MISSING
+
+
+def _tool_function(invoke: Callable[..., Any]) -> Callable[..., Any] | None:
+    """The function ``@function_tool`` wrapped, or ``None`` for hand-written ``FunctionTool``s."""
+    func = _closure_value(invoke, "the_func")
+    return None if func is _MISSING else func
+
+
+@dataclass(frozen=True)
+class _Wrapping:
+    """How ``ToolRuntime.wrap`` wrapped a tool: its original invoker and the settings asked for."""
+
+    invoke: Callable[..., Any]
+    offload: bool | Literal["process"] | None
+    max_concurrency: int | None
+    timeout: float | None
+    sequential: bool
+
+
+_Limit = TypeVar("_Limit", int, float)
+
+
+def _tighter(a: _Limit | None, b: _Limit | None) -> _Limit | None:
+    return min((value for value in (a, b) if value), default=None)
+
+
+class _TurnGate:
+    """Orders one run's tool calls around its sequential tools.
+
+    Calls enter in the order their tasks start, which is the order the model listed them.
+    Ordinary calls run together; a sequential call starts once every earlier call has finished
+    and holds back every later one until it is done.
+    """
+
+    def __init__(self) -> None:
+        self._exclusive: asyncio.Future[None] | None = None
+        self._shared: list[asyncio.Future[None]] = []
+
+    async def run(self, sequential: bool, call: Callable[[], Awaitable[Any]]) -> Any:
+        done = asyncio.get_running_loop().create_future()
+        if sequential:
+            before = [f for f in (self._exclusive, *self._shared) if f is not None]
+            self._exclusive, self._shared = done, []
+        else:
+            before = [self._exclusive] if self._exclusive is not None else []
+            self._shared.append(done)
+        token = _in_turn_gate.set(True)
+        try:
+            pending = [f for f in before if not f.done()]
+            if pending:
+                await asyncio.wait(pending)
+            return await call()
+        finally:
+            _in_turn_gate.reset(token)
+            done.set_result(None)
+            if done in self._shared:
+                self._shared.remove(done)
+
+
+# Set while a call holds its gate slot, so a tool wrapped twice is ordered only once.
+_in_turn_gate: contextvars.ContextVar[bool] = contextvars.ContextVar("in_turn_gate", default=False)
+
+
+def _run_in_thread_loop(invoke: ToolInvoker, ctx: ToolContext[Any], args: str) -> Any:
+    return thread_runner().run(invoke(ctx, args))
+
+
+# Worker processes: tool functions (and their schemas) resolved so far.
+_process_tools: dict[tuple[str, str], tuple[Callable[..., Any], FuncSchema]] = {}
+
+
+def _resolve_tool_function(ref: tuple[str, str]) -> Callable[..., Any]:
+    module, qualname = ref
+    obj: Any = importlib.import_module(module)
+    for part in qualname.split("."):
+        obj = getattr(obj, part)
+    if isinstance(obj, FunctionTool):  # the module-level name is bound to the decorated tool
+        obj = _tool_function(obj.on_invoke_tool)
+    return obj
+
+
+def _call_in_process(ref: tuple[str, str], args: str) -> Any:
+    """Run a tool function in a worker process: only its reference and the raw arguments JSON
+    cross the process boundary, and the result is all that comes back."""
+    entry = _process_tools.get(ref)
+    if entry is None:
+        func = _resolve_tool_function(ref)
+        entry = _process_tools[ref] = (func, function_schema(func))
+    func, schema = entry
+    try:
+        data = json.loads(args) if args else {}
+    except ValueError:
+        raise ModelBehaviorError(f"Invalid JSON input for tool {schema.name}: {args}") from None
+    try:
+        parsed = schema.params_pydantic_model(**data)
+    except ValidationError as e:
+        raise ModelBehaviorError(f"Invalid JSON input for tool {schema.name}: {e}") from None
+    call_args, call_kwargs = schema.to_call_args(parsed)
+    result = func(*call_args, **call_kwargs)
+    return thread_runner().run(result) if inspect.isawaitable(result) else result
+
+
+def _process_ready() -> int:
+    return os.getpid()
+
+
+class ToolRuntime:
+    """Runs function tools without letting them block the event loop.
+
+    Args:
+        max_workers: Size of the thread pool used for offloaded tools.
+        stall_threshold: Seconds without a loop heartbeat that count as a stall.
+        default_timeout: Deadline in seconds for tools wrapped without ``timeout``.
+        executor: Pool for offloaded tools, instead of a ``ThreadPoolExecutor`` of
+            ``max_workers`` threads created on first use (shut down by ``shutdown()`` either way).
+        max_processes: Worker processes for ``offload="process"`` tools (default: one per CPU).
+        max_tasks_per_process: Recycle a worker process after this many calls, e.g. for tools
+            that leak memory (default: never).
+        registry: Where ``tool_timeouts_total{tool}`` is counted (``default_registry``).
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 32,
+        stall_threshold: float = 0.1,
+        default_timeout: float | None = None,
+        executor: Executor | None = None,
+        max_processes: int | None = None,
+        max_tasks_per_process: int | None = None,
+        registry: MetricsRegistry | None = None,
+    ) -> None:
+        self.max_workers = max_workers
+        self.max_processes = max_processes or os.cpu_count() or 1
+        self.max_tasks_per_process = max_tasks_per_process
+        self.default_timeout = default_timeout
+        self.registry = registry or default_registry
+        self.watchdog = LoopStallWatchdog(stall_threshold, on_stall=self._on_stall)
+        self.blocking_tools: set[str] = set()
+        self.stats: dict[str, ToolStats] = {}
+        self._executor = executor
+        self._process_pool: ProcessPoolExecutor | None = None
+        self._gates: dict[int, _TurnGate] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="tool")
+            return self._executor
+
+    @property
+    def process_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._process_pool is None:
+                # Spawned, not forked: this process has threads (the watchdog, the thread pool).
+                self._process_pool = ProcessPoolExecutor(
+                    self.max_processes,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    max_tasks_per_child=self.max_tasks_per_process,
+                )
+            return self._process_pool
+
+    def warm(self) -> None:
+        """Start every worker process now (blocking), so the first ``offload="process"`` calls
+        do not wait for processes to spawn and import the tools' modules."""
+        pool = self.process_pool
+        for future in [pool.submit(_process_ready) for _ in range(self.max_processes)]:
+            future.result()
+
+    def shutdown(self, wait: bool = True) -> None:
+        self.watchdog.stop()
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=wait)
+            self._process_pool = None
+
+    def wrap(
+        self,
+        tool: FunctionTool,
+        *,
+        offload: bool | Literal["process"] | None = None,
+        max_concurrency: int | None = None,
+        timeout: float | None = None,
+        sequential: bool = False,
+    ) -> FunctionTool:
+        """Return a copy of ``tool`` that runs through this runtime.
+
+        Args:
+            offload: ``True`` always runs the tool on the thread pool, ``False`` always inline,
+                ``None`` on the pool for sync (``def``) tools and, for async ones, inline until
+                the watchdog catches it blocking the loop. ``"process"`` runs it in a worker
+                process; the function must be defined at module level and not take a context.
+            max_concurrency: Maximum simultaneous calls of this tool (on each event loop).
+            timeout: Deadline in seconds for a whole call, waiting for ``max_concurrency``
+                included (default ``default_timeout``).
+            sequential: Run calls of this tool alone: after the run's earlier tool calls and
+                before its later ones (waiting for them is not part of ``timeout``).
+        """
+        invoke = tool.on_invoke_tool
+        previous: _Wrapping | None = getattr(invoke, "runtime_wrapping", None)
+        if previous is not None:
+            # Already wrapped (``@tool_runtime.tool``, then ``wrap_agent``): going through the
+            # runtime twice would hold a pool thread while it waits for another one and count
+            # every call twice. Wrap the original once, with both settings, tighter limits winning.
+            invoke = previous.invoke
+            offload = previous.offload if offload is None else offload
+            max_concurrency = _tighter(max_concurrency, previous.max_concurrency)
+            timeout = _tighter(timeout, previous.timeout)
+            sequential = sequential or previous.sequential
+        wrapping = _Wrapping(invoke, offload, max_concurrency, timeout, sequential)
+        name = tool.name
+        func = _tool_function(invoke)
+        if offload is None and func is not None and not inspect.iscoroutinefunction(func):
+            offload = True
+        if offload == "process":
+            ref = self._process_ref(tool, func)
+            on_error = _closure_value(invoke, "failure_error_function")
+            if on_error is _MISSING:
+                on_error = default_tool_error_function
+        limits = PerLoop(lambda: asyncio.Semaphore(max_concurrency)) if max_concurrency else None
+        timeout = self.default_timeout if timeout is None else timeout
+        stats = self.stats.setdefault(name, ToolStats())
+        timeouts = self.registry.counter("tool_timeouts_total", tool=name)
+
+        async def run(ctx: ToolContext[Any], args: str) -> Any:
+            stats.calls += 1
+            if offload == "process":
+                stats.offloaded += 1
+                return await self._run_in_process(stats, ref, on_error, ctx, args)
+            if offload or (offload is None and name in self.blocking_tools):
+                stats.offloaded += 1
+                return await self._run_offloaded(stats, invoke, ctx, args)
+            self.watchdog.watch(asyncio.get_running_loop())
+            return await self._run_inline(name, invoke, ctx, args)
+
+        async def limited(ctx: ToolContext[Any], args: str) -> Any:
+            if limits is None:
+                return await run(ctx, args)
+            async with limits.get():
+                return await run(ctx, args)
+
+        async def timed(ctx: ToolContext[Any], args: str) -> Any:
+            if timeout is None:
+                return await limited(ctx, args)
+            deadline = Deadline(timeout)
+            token = _deadline.set(deadline)
+            scope = asyncio.timeout(timeout)
+            try:
+                async with scope:
+                    return await limited(ctx, args)
+            except TimeoutError:
+                if not scope.expired():
+                    raise  # the tool's own TimeoutError
+                stats.timeouts += 1
+                timeouts.inc()
+                return timeout_result(name, timeout)
+            finally:
+                deadline.cancel()
+                _deadline.reset(token)
+
+        async def on_invoke_tool(ctx: ToolContext[Any], args: str) -> Any:
+            if _in_turn_gate.get():
+                return await timed(ctx, args)
+            return await self._gate(ctx.usage).run(sequential, lambda: timed(ctx, args))
+
+        on_invoke_tool.runtime_wrapping = wrapping  # type: ignore[attr-defined]
+        return replace(tool, on_invoke_tool=on_invoke_tool)
+
+    def wrap_agent(
+        self,
+        agent: Agent[Any],
+        *,
+        offload: bool | Literal["process"] | None = None,
+        max_concurrency: int | None = None,
+        timeout: float | None = None,
+        sequential: bool = False,
+    ) -> Agent[Any]:
+        """Clone of ``agent`` with every function tool wrapped, e.g. to give all its tools one
+        deadline. Tools already wrapped are rewrapped once with both settings; the tighter
+        deadline and concurrency limit win.
+        """
+        tools = [
+            self.wrap(
+                t, offload=offload, max_concurrency=max_concurrency, timeout=timeout, sequential=sequential
+            )
+            if isinstance(t, FunctionTool)
+            else t
+            for t in agent.tools
+        ]
+        return agent.clone(tools=tools)
+
+    @overload
+    def tool(self, tool: FunctionTool, /) -> FunctionTool: ...
+
+    @overload
+    def tool(
+        self,
+        *,
+        offload: bool | Literal["process"] | None = None,
+        max_concurrency: int | None = None,
+        timeout: float | None = None,
+        sequential: bool = False,
+    ) -> Callable[[FunctionTool], FunctionTool]: ...
+
+    def tool(
+        self,
+        tool: FunctionTool | None = None,
+        /,
+        *,
+        offload: bool | Literal["process"] | None = None,
+        max_concurrency: int | None = None,
+        timeout: float | None = None,
+        sequential: bool = False,
+    ) -> FunctionTool | Callable[[FunctionTool], FunctionTool]:
+        """Decorator form of ``wrap``, placed above ``@function_tool``."""
+        if tool is not None:
+            return self.wrap(tool)
+
+        def decorator(real_tool: FunctionTool) -> FunctionTool:
+            return self.wrap(
+                real_tool,
+                offload=offload,
+                max_concurrency=max_concurrency,
+                timeout=timeout,
+                sequential=sequential,
+            )
+
+        return decorator
+
+    def _gate(self, usage: Usage) -> _TurnGate:
+        # Every ToolContext of a run shares the run's Usage object, so it identifies the run.
+        gate = self._gates.get(id(usage))
+        if gate is None:
+            gate = self._gates[id(usage)] = _TurnGate()
+            weakref.finalize(usage, self._gates.pop, id(usage), None)
+        return gate
+
+    async def run_in_thread(self, invoke: ToolInvoker, ctx: ToolContext[Any], args: str) -> Any:
+        """Run a tool invocation on the pool, on the worker thread's own event loop."""
+        return await self._run_offloaded(None, invoke, ctx, args)
+
+    async def _run_offloaded(
+        self, stats: ToolStats | None, invoke: ToolInvoker, ctx: ToolContext[Any], args: str
+    ) -> Any:
+        # The caller's context carries the tool deadline and the current tracing span.
+        context = contextvars.copy_context()
+        future = self.executor.submit(context.run, _run_in_thread_loop, invoke, ctx, args)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # A running thread cannot be stopped; it is abandoned and, through its deadline,
+            # asked to stop at its next ``check()``.
+            if not future.cancel() and stats is not None:
+                stats.abandoned += 1
+            raise
+
+    @staticmethod
+    def _process_ref(tool: FunctionTool, func: Callable[..., Any] | None) -> tuple[str, str]:
+        if func is None or "<locals>" in func.__qualname__:
+            raise ValueError(
+                f"Tool {tool.name!r} cannot run in a process: it needs a module-level @function_tool function"
+            )
+        if function_schema(func).takes_context:
+            raise ValueError(f"Tool {tool.name!r} cannot run in a process: it takes a run context")
+        return func.__module__, func.__qualname__
+
+    async def _run_in_process(
+        self,
+        stats: ToolStats,
+        ref: tuple[str, str],
+        on_error: Callable[[ToolContext[Any], Exception], Any] | None,
+        ctx: ToolContext[Any],
+        args: str,
+    ) -> Any:
+        pool = self.process_pool
+        future = pool.submit(_call_in_process, ref, args)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # As with threads, a running worker is abandoned (it finishes in the background).
+            if not future.cancel():
+                stats.abandoned += 1
+            raise
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):  # a worker died; start over with a new pool
+                with self._lock:
+                    if self._process_pool is pool:
+                        self._process_pool = None
+                pool.shutdown(wait=False)
+            if on_error is None:
+                raise
+            logger.error("Tool %s failed in a worker process: %s", ref[1], e)
+            result = on_error(ctx, e)
+            return await result if inspect.isawaitable(result) else result
+
+    async def _run_inline(
+        self, tool_name: str, invoke: ToolInvoker, ctx: ToolContext[Any], args: str
+    ) -> Any:
+        # ``tool_name`` is read back from this frame by ``_on_stall``.
+        return await invoke(ctx, args)
+
+    def _on_stall(self, duration: float, frame: Any) -> None:
+        while frame is not None:
+            if frame.f_code is ToolRuntime._run_inline.__code__:
+                name = frame.f_locals.get("tool_name")
+                if name and name not in self.blocking_tools:
+                    logger.warning(
+                        "Tool %r blocked the event loop for %.0f ms; running it on the "
+                        "thread pool from now on.",
+                        name,
+                        duration * 1000,
+                    )
+                    self.blocking_tools.add(name)
+                if name:
+                    self.stats.setdefault(name, ToolStats()).stalls += 1
+                return
+            frame = frame.f_back
@@ -0,0 +1,3 @@
+from agents import set_tracing_disabled
+
+set_tracing_disabled(disabled=True)
@@ -0,0 +1,103 @@
+"""In-process models for the tests."""
+
+import asyncio
+
+from agents import Model, ModelResponse, Usage
+from openai.types.responses import (
+    Response,
+    ResponseCompletedEvent,
+    ResponseFunctionToolCall,
+    ResponseOutputMessage,
+    ResponseOutputText,
+    ResponseUsage,
+)
+
+
+def text_message(text: str) -> ResponseOutputMessage:
+    return ResponseOutputMessage(
+        id="msg", type="message", role="assistant", status="completed",
+        content=[ResponseOutputText(type="output_text", text=text, annotations=[])],
+    )
+
+
+class TextModel(Model):
+    """Answers ``text`` after ``delay`` seconds, reporting ``tokens`` total tokens per call."""
+
+    def __init__(self, text: str = "done", delay: float = 0.0, tokens: int = 0) -> None:
+        self.text = text
+        self.delay = delay
+        self.tokens = tokens
+        self.calls = 0
+
+    async def get_response(self, *args, **kwargs) -> ModelResponse:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        usage = Usage(requests=1, input_tokens=self.tokens, output_tokens=0, total_tokens=self.tokens)
+        return ModelResponse(output=[text_message(self.text)], usage=usage, response_id=None)
+
+    async def stream_response(self, *args, **kwargs):
+        """The ``get_response`` answer as a single ``response.completed`` event."""
+        response = await self.get_response(*args, **kwargs)
+        tokens = response.usage
+        yield ResponseCompletedEvent(
+            type="response.completed",
+            sequence_number=0,
+            response=Response(
+                id="resp",
+                created_at=0,
+                model="fake",
+                object="response",
+                output=response.output,
+                parallel_tool_calls=True,
+                tool_choice="auto",
+                tools=[],
+                usage=ResponseUsage(
+                    input_tokens=tokens.input_tokens,
+                    output_tokens=tokens.output_tokens,
+                    total_tokens=tokens.total_tokens,
+                    input_tokens_details={"cached_tokens": 0},
+                    output_tokens_details={"reasoning_tokens": 0},
+                ),
+            ),
+        )
+
+
+class FailingModel(TextModel):
+    """Raises a copy of ``error`` on every call (a shared instance would pin old tracebacks)."""
+
+    def __init__(self, error: Exception) -> None:
+        super().__init__()
+        self.error = error
+
+    async def get_response(self, *args, **kwargs) -> ModelResponse:
+        self.calls += 1
+        raise type(self.error)(*self.error.args)
+
+    def stream_response(self, *args, **kwargs):
+        self.calls += 1
+        raise type(self.error)(*self.error.args)
+
+
+class CallingModel(TextModel):
+    """Calls the tool (or handoff) ``name`` on its first ``turns`` calls, then answers.
+
+    ``name`` may be a list of tools to call in parallel in each of those turns. Answers straight away when there is nothing to call or ``tool_choice`` is ``"none"``.
+    """
+
+    def __init__(self, name: str | list[str], turns: int = 1, tokens: int = 0, text: str = "done") -> None:
+        super().__init__(text, tokens=tokens)
+        self.names = [name] if isinstance(name, str) else name
+        self.turns = turns
+
+    async def get_response(
+        self, system_instructions, input, model_settings, tools, output_schema, handoffs, *args, **kwargs
+    ) -> ModelResponse:
+        response = await super().get_response()
+        if self.calls <= self.turns and (tools or handoffs) and model_settings.tool_choice != "none":
+            response.output = [
+                ResponseFunctionToolCall(
+                    type="function_call", name=name, call_id=f"call_{self.calls}_{i}", arguments="{}"
+                )
+                for i, name in enumerate(self.names)
+            ]
+        return response
@@ -0,0 +1,24 @@
+import asyncio
+
+from agents import Agent
+from agents.tool_context import ToolContext
+from fakes import TextModel
+
+from agent_runtime import AgentToolGroup
+
+
+def test_group_limit_works_on_every_loop():
+    group = AgentToolGroup(max_concurrency=1)
+    tool = group.as_tool(Agent(name="Helper", model=TextModel(delay=0.01)), "helper", "Helps.")
+
+    async def burst() -> list[str]:
+        calls = []
+        for i in range(3):
+            args = '{"input": "hi %d"}' % i
+            context = ToolContext(context=None, tool_name="helper", tool_call_id=str(i), tool_arguments=args)
+            calls.append(tool.on_invoke_tool(context, args))
+        return await asyncio.gather(*calls)
+
+    # The limit was one semaphore created at construction, bound to the first loop.
+    assert asyncio.run(burst()) == ["done"] * 3
+    assert asyncio.run(burst()) == ["done"] * 3
@@ -0,0 +1,75 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from agents import Agent
+from fakes import TextModel
+
+from agent_runtime import BackgroundLoop
+
+
+async def loop_id() -> int:
+    return id(asyncio.get_running_loop())
+
+
+def test_every_thread_shares_one_loop():
+    background = BackgroundLoop()
+    try:
+        with ThreadPoolExecutor(4) as pool:
+            loops = set(pool.map(lambda _: background.call(loop_id()), range(8)))
+        assert len(loops) == 1
+        result = background.run_sync(Agent(name="Echo", model=TextModel("hi")), "hello")
+        assert result.final_output == "hi"
+    finally:
+        background.close()
+    assert background._thread is None
+
+
+def test_timeout_cancels_the_run():
+    background = BackgroundLoop(timeout=0.05)
+    cancelled = threading.Event()
+
+    async def hang() -> None:
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    try:
+        with pytest.raises(TimeoutError, match="0.05 seconds"):
+            background.call(hang())
+        assert cancelled.wait(5)
+    finally:
+        background.close()
+
+
+def test_call_from_a_running_loop_is_refused():
+    background = BackgroundLoop()
+
+    async def main() -> None:
+        background.call(loop_id())
+
+    try:
+        with pytest.raises(RuntimeError, match="await instead"):
+            asyncio.run(main())
+    finally:
+        background.close()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_forked_child_starts_its_own_loop():
+    background = BackgroundLoop()
+    try:
+        parent_loop = background.call(loop_id())
+        pid = os.fork()
+        if pid == 0:  # child: the parent's loop thread did not come along
+            ok = background._loop is None and background.call(loop_id(), timeout=5) != parent_loop
+            os._exit(0 if ok else 1)
+        _, status = os.waitpid(pid, 0)
+        assert os.waitstatus_to_exitcode(status) == 0
+        assert background.call(loop_id()) == parent_loop
+    finally:
+        background.close()
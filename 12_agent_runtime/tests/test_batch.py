@@ -0,0 +1,92 @@
+import asyncio
+import gc
+import time
+
+import pytest
+from agents import Agent, RunHooks, Runner
+from fakes import FailingModel, TextModel
+
+from agent_runtime import BatchJob, RateLimitHooks, TokenBucket, run_batch
+
+
+def collect(jobs, **kwargs):
+    async def main():
+        return [r async for r in run_batch(jobs, **kwargs)]
+
+    return asyncio.run(asyncio.wait_for(main(), timeout=10))
+
+
+def test_bucket_burst_is_a_second_not_a_minute():
+    async def main() -> float:
+        bucket = TokenBucket(per_minute=6000)  # 100 per second
+        start = time.monotonic()
+        for _ in range(150):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    # A minute-sized burst would let all 150 through at once.
+    assert TokenBucket(per_minute=6000).capacity == 100
+    assert asyncio.run(main()) >= 0.45
+
+
+def test_bucket_request_above_capacity_leaves_debt():
+    async def main() -> float:
+        bucket = TokenBucket(per_minute=60)
+        assert bucket.capacity == 1
+        await bucket.acquire(5)
+        return bucket.tokens
+
+    assert asyncio.run(main()) == pytest.approx(-4, abs=0.01)
+
+
+def test_failed_jobs_are_reported_and_the_batch_goes_on():
+    ok = Agent(name="Ok", model=TextModel("fine"))
+    broken = Agent(name="Broken", model=FailingModel(RuntimeError("boom")))
+    results = collect([BatchJob(ok, "a"), BatchJob(broken, "b"), BatchJob(ok, "c")], max_concurrency=2)
+
+    assert sorted(r.job.id for r in results) == [0, 1, 2]
+    failed = [r for r in results if not r.ok]
+    assert len(failed) == 1 and str(failed[0].error) == "boom"
+
+
+def test_error_in_jobs_iterable_is_raised_not_hung():
+    agent = Agent(name="Ok", model=TextModel())
+
+    def jobs():
+        yield BatchJob(agent, "a")
+        raise ValueError("bad job source")
+
+    with pytest.raises(ValueError, match="bad job source"):
+        collect(jobs(), max_concurrency=3)
+
+
+def test_estimate_of_a_failed_call_does_not_leak():
+    hooks = RateLimitHooks(None, TokenBucket(per_minute=60_000))
+    broken = Agent(name="Broken", model=FailingModel(RuntimeError("boom")))
+
+    async def main() -> bool:
+        try:
+            await Runner.run(broken, "hello", hooks=hooks)
+        except RuntimeError:
+            return True
+        return False
+
+    assert asyncio.run(main())
+    gc.collect()
+    assert len(hooks._estimates) == 0
+
+
+def test_caller_hooks_run_with_the_rate_limits():
+    class Counting(RunHooks):
+        def __init__(self) -> None:
+            self.llm_calls = 0
+
+        async def on_llm_start(self, context, agent, system_prompt, input_items) -> None:
+            self.llm_calls += 1
+
+    counting = Counting()
+    agent = Agent(name="Ok", model=TextModel())
+    results = collect([BatchJob(agent, "a"), BatchJob(agent, "b")], hooks=counting, requests_per_minute=6000)
+    assert all(r.ok for r in results)
+    assert counting.llm_calls == 2
+
@@ -0,0 +1,114 @@
+import asyncio
+
+import pytest
+from agents import Agent, function_tool, handoff
+from agents.model_settings import ModelSettings
+from fakes import CallingModel, TextModel
+
+from agent_runtime import (
+    BudgetedModel,
+    BudgetExceeded,
+    BudgetUsage,
+    RunBudget,
+    run_with_budget,
+    run_with_budget_streamed,
+)
+from agent_runtime import budget as budget_module
+
+
+searches: list[str] = []
+
+
+@function_tool
+def search() -> str:
+    """Search the web."""
+    searches.append("search")
+    return "more results"
+
+
+def researcher(tokens: int = 60, turns: int = 10) -> Agent:
+    return Agent(name="Researcher", tools=[search], model=CallingModel("search", turns=turns, tokens=tokens))
+
+
+def test_token_limit_is_a_hard_cap():
+    # 60 tokens a call: after three calls two more would not fit, so the fourth answers.
+    result = asyncio.run(run_with_budget(researcher(), "go", RunBudget(max_total_tokens=250)))
+    assert result.final_output == "done"
+    assert result.budget.total_tokens == 240
+    assert result.budget.forced_final
+
+
+def test_call_forecast_to_overrun_is_not_made():
+    agent = researcher()
+    with pytest.raises(BudgetExceeded) as exc:
+        asyncio.run(run_with_budget(agent, "go", RunBudget(max_total_tokens=100)))
+    assert exc.value.usage.total_tokens == 60
+    assert agent.model.calls == 1
+
+
+def test_call_that_overruns_raises():
+    agent = Agent(name="Writer", model=TextModel(tokens=300))
+    with pytest.raises(BudgetExceeded, match="total_tokens") as exc:
+        asyncio.run(run_with_budget(agent, "go", RunBudget(max_total_tokens=250)))
+    assert exc.value.usage.total_tokens == 300
+
+
+def test_streamed_call_gets_the_deadline():
+    class HangingStream(TextModel):
+        async def stream_response(self, *args, **kwargs):
+            await asyncio.sleep(60)
+            yield None
+
+    async def main() -> None:
+        token = budget_module._usage.set(BudgetUsage(RunBudget(deadline=0.05)))
+        try:
+            stream = BudgetedModel(HangingStream()).stream_response(
+                None, "hi", ModelSettings(), [], None, [], None
+            )
+            async for _ in stream:
+                pass
+        finally:
+            budget_module._usage.reset(token)
+
+    with pytest.raises(BudgetExceeded, match="deadline"):
+        asyncio.run(asyncio.wait_for(main(), timeout=5))
+
+
+@pytest.mark.parametrize("wrap", [lambda agent: agent, handoff])
+def test_handoff_targets_keep_their_own_budgeted_model(wrap):
+    billing_model = TextModel("billing here", tokens=30)
+    billing = Agent(name="Billing", model=billing_model)
+    triage_model = CallingModel("transfer_to_billing", tokens=10)
+    triage = Agent(name="Triage", model=triage_model, handoffs=[wrap(billing)])
+
+    result = asyncio.run(run_with_budget(triage, "refund", RunBudget(max_total_tokens=1000)))
+    assert result.final_output == "billing here"
+    assert billing_model.calls == 1 and triage_model.calls == 1
+    assert result.budget.total_tokens == 40
+    # The caller's agents are untouched.
+    assert triage.model is triage_model and billing.model is billing_model
+    assert result.last_agent is not billing and result.last_agent.name == "Billing"
+
+
+def test_parallel_tool_calls_are_capped_per_call():
+    agent = Agent(name="Researcher", tools=[search], model=CallingModel(["search"] * 3))
+    searches.clear()
+    result = asyncio.run(run_with_budget(agent, "go", RunBudget(max_tool_calls=2)))
+    assert result.final_output == "done"
+    assert len(searches) == 2
+    assert (result.budget.tool_calls, result.budget.refused_tool_calls) == (2, 1)
+
+
+def test_streamed_run_is_budgeted():
+    async def stream(agent: Agent, budget: RunBudget):
+        result = run_with_budget_streamed(agent, "go", budget)
+        async for _ in result.stream_events():
+            pass
+        return result
+
+    result = asyncio.run(stream(researcher(tokens=60), RunBudget(max_total_tokens=250)))
+    assert result.final_output == "done"
+    assert result.budget.total_tokens == 240 and result.budget.forced_final
+
+    with pytest.raises(BudgetExceeded, match="total_tokens"):
+        asyncio.run(stream(Agent(name="Writer", model=TextModel(tokens=300)), RunBudget(max_total_tokens=250)))
@@ -0,0 +1,96 @@
+import asyncio
+import pickle
+import sqlite3
+
+from agents import ModelResponse, ModelSettings, ModelTracing, Usage
+from fakes import TextModel
+from openai.types.responses import ResponseFunctionToolCall, ResponseOutputMessage, ResponseOutputText
+
+from agent_runtime import CachingModel, ResponseCache
+
+RESPONSE = ModelResponse(
+    output=[
+        ResponseOutputMessage(
+            id="msg", type="message", role="assistant", status="completed",
+            content=[ResponseOutputText(type="output_text", text="Sunny in Lahore ☀️", annotations=[])],
+        ),
+        ResponseFunctionToolCall(type="function_call", name="get_weather", arguments='{"city": "Lahore"}', call_id="c1"),
+    ],
+    usage=Usage(requests=1, input_tokens=12, output_tokens=8, total_tokens=20),
+    response_id="resp_1",
+)
+
+
+def test_hit_after_put_and_miss_otherwise():
+    cache = ResponseCache()
+    assert cache.get("k") is None
+    cache.put("k", RESPONSE)
+    assert cache.get("k") == RESPONSE
+    assert (cache.stats.memory_hits, cache.stats.misses) == (1, 1)
+
+
+def test_disk_tier_survives_reopening(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    cache = ResponseCache(path=path)
+    cache.put("k", RESPONSE)
+    cache.close()
+
+    reopened = ResponseCache(path=path)
+    assert reopened.get("k") == RESPONSE
+    assert reopened.stats.disk_hits == 1
+
+
+def test_expired_entry_is_a_miss():
+    cache = ResponseCache(ttl=-1)
+    cache.put("k", RESPONSE)
+    assert cache.get("k") is None
+    assert cache.stats.expirations == 1
+
+
+def _store_raw(path, key: str, blob: bytes) -> None:
+    db = sqlite3.connect(path)
+    db.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)", (key, blob, len(blob), 1e12, 0))
+    db.commit()
+    db.close()
+
+
+def test_unreadable_disk_entries_are_dropped_as_misses(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    good = ResponseCache(path=path)
+    good.put("good", RESPONSE)
+    good.close()
+    valid = sqlite3.connect(path).execute("SELECT value FROM responses WHERE key='good'").fetchone()[0]
+    _store_raw(path, "pickled", pickle.dumps({"old": "format"}))  # written by an older release
+    _store_raw(path, "truncated", valid[: len(valid) // 2])
+    _store_raw(path, "other-format", valid.replace(b'"format": 1', b'"format": 99'))
+
+    cache = ResponseCache(path=path)
+    for key in ("pickled", "truncated", "other-format"):
+        assert cache.get(key) is None
+    assert cache.stats.misses == 3
+    keys = {row[0] for row in sqlite3.connect(path).execute("SELECT key FROM responses")}
+    assert keys == {"good"}
+    assert cache.get("good") == RESPONSE
+
+
+def test_hits_spend_no_tokens_and_prompts_are_part_of_the_key():
+    model = TextModel(tokens=20)
+    caching = CachingModel(model, ResponseCache())
+
+    def ask(prompt=None) -> ModelResponse:
+        return asyncio.run(
+            caching.get_response(
+                "Be brief.", "hi", ModelSettings(temperature=0), [], None, [], ModelTracing.DISABLED,
+                previous_response_id=None, conversation_id=None, prompt=prompt,
+            )
+        )
+
+    assert ask().usage.total_tokens == 20
+    hit = ask()
+    assert hit.usage.total_tokens == 0 and hit.usage.requests == 0
+    assert hit.output == ask().output
+    assert model.calls == 1
+
+    ask({"id": "pmpt_1", "variables": {"city": "Lahore"}})
+    ask({"id": "pmpt_1", "variables": {"city": "Karachi"}})
+    assert model.calls == 3
@@ -0,0 +1,36 @@
+import asyncio
+
+from agent_runtime import ClientSettings, aclose_clients, get_client, get_model
+from agent_runtime import client as client_module
+
+SETTINGS = ClientSettings(api_key="test", base_url="http://127.0.0.1:9/v1/")
+
+
+def test_one_client_per_loop_closed_with_the_loop():
+    clients = []
+
+    async def use() -> None:
+        clients.append(get_client(SETTINGS))
+        assert get_client(SETTINGS) is clients[-1]
+
+    asyncio.run(use())
+    asyncio.run(use())
+
+    assert clients[0] is not clients[1]
+    assert all(client.is_closed() for client in clients)
+    assert not client_module._clients
+
+
+def test_explicit_close_then_reuse():
+    async def use() -> bool:
+        first = get_client(SETTINGS)
+        await aclose_clients()
+        second = get_client(SETTINGS)
+        return first.is_closed() and second is not first and not second.is_closed()
+
+    assert asyncio.run(use())
+
+
+def test_get_model_is_shared():
+    assert get_model("gemini-test", SETTINGS) is get_model("gemini-test", SETTINGS)
+    assert get_model("gemini-test", SETTINGS) is not get_model("gemini-other", SETTINGS)
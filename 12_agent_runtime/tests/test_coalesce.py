@@ -0,0 +1,67 @@
+import asyncio
+
+from agents import Agent, ModelSettings
+from fakes import TextModel
+
+from agent_runtime import RunCoalescer
+
+
+def faq_agent(coalescer: RunCoalescer, temperature: float | None = 0.0) -> Agent:
+    model = TextModel("Hello!", delay=0.05)
+    return coalescer.agent(Agent(name="FAQ", model=model, model_settings=ModelSettings(temperature=temperature)))
+
+
+def test_identical_runs_share_one_execution():
+    coalescer = RunCoalescer()
+    agent = faq_agent(coalescer)
+
+    async def main() -> list[str]:
+        results = await asyncio.gather(*(coalescer.run(agent, "Hi") for _ in range(3)))
+        return [result.final_output for result in results]
+
+    assert asyncio.run(main()) == ["Hello!"] * 3
+    assert agent.model.calls == 1
+    assert (coalescer.stats.executed, coalescer.stats.coalesced) == (1, 2)
+
+
+def test_hot_agents_are_not_coalesced():
+    coalescer = RunCoalescer()
+    agent = faq_agent(coalescer, temperature=0.9)
+
+    async def main() -> None:
+        await asyncio.gather(coalescer.run(agent, "Hi"), coalescer.run(agent, "Hi"))
+
+    asyncio.run(main())
+    assert agent.model.calls == 2 and coalescer.stats.bypasses == 2
+
+
+def test_run_after_the_last_caller_left_starts_afresh():
+    coalescer = RunCoalescer()
+    agent = faq_agent(coalescer)
+
+    async def main() -> str:
+        first = asyncio.ensure_future(coalescer.run(agent, "Hi"))
+        await asyncio.sleep(0.01)
+        first.cancel()  # the only caller: its run is cancelled
+        await asyncio.gather(first, return_exceptions=True)
+        # The cancelled run has not finished unwinding yet; it must not be joined.
+        return (await coalescer.run(agent, "Hi")).final_output
+
+    assert asyncio.run(main()) == "Hello!"
+    assert coalescer.stats.executed == 2 and not coalescer._runs
+
+
+def test_streamed_callers_each_get_every_event():
+    coalescer = RunCoalescer()
+    agent = faq_agent(coalescer)
+
+    async def collect() -> list[str]:
+        stream = coalescer.run_streamed(agent, "Hi")
+        return [event.type async for event in stream.stream_events()]
+
+    async def main() -> list[list[str]]:
+        return await asyncio.gather(collect(), collect())
+
+    first, second = asyncio.run(main())
+    assert first == second and "raw_response_event" in first
+    assert agent.model.calls == 1
@@ -0,0 +1,72 @@
+import asyncio
+import gc
+import threading
+from types import SimpleNamespace
+
+from agents import Agent, RunContextWrapper
+
+from agent_runtime import EnablementResolver
+
+agent = Agent(name="Assistant")
+checks: list[str] = []
+started = threading.Event()
+
+
+async def is_premium(context: RunContextWrapper, agent: Agent) -> bool:
+    checks.append(context.context.user)
+    started.set()
+    await asyncio.sleep(0.1)
+    return context.context.user == "ada"
+
+
+def run_context(user: str) -> RunContextWrapper:
+    return RunContextWrapper(context=SimpleNamespace(user=user))
+
+
+def test_one_evaluation_per_run():
+    resolver = EnablementResolver()
+    premium = resolver.cached(is_premium)
+    checks.clear()
+    context = run_context("ada")
+
+    async def main() -> list[bool]:
+        # The SDK checks an agent's tools concurrently: the misses share one evaluation.
+        first = await asyncio.gather(premium(context, agent), premium(context, agent))
+        return [*first, await premium(context, agent), await premium(run_context("bob"), agent)]
+
+    assert asyncio.run(main()) == [True, True, True, False]
+    assert checks == ["ada", "bob"]
+
+
+def test_run_entries_go_away_with_the_run():
+    resolver = EnablementResolver()
+    asyncio.run(resolver.resolve(is_premium, run_context("ada"), agent))
+    gc.collect()
+    assert not len(resolver._runs)
+
+
+def test_identity_results_are_shared_until_invalidated():
+    resolver = EnablementResolver(identity=lambda context: context.context.user)
+    premium = resolver.cached(is_premium)
+    checks.clear()
+    assert asyncio.run(premium(run_context("ada"), agent))
+    assert asyncio.run(premium(run_context("ada"), agent))
+    resolver.invalidate("ada", premium)
+    assert asyncio.run(premium(run_context("ada"), agent))
+    assert checks == ["ada", "ada"]
+
+
+def test_concurrent_misses_on_another_loop():
+    resolver = EnablementResolver(identity=lambda context: context.context.user)
+    started.clear()
+    results: list[bool] = []
+
+    def resolve() -> bool:
+        return asyncio.run(resolver.resolve(is_premium, run_context("ada"), agent))
+
+    thread = threading.Thread(target=lambda: results.append(resolve()))
+    thread.start()
+    started.wait()
+    results.append(resolve())
+    thread.join()
+    assert results == [True, True]
@@ -0,0 +1,73 @@
+import asyncio
+
+from agents import ModelResponse, Usage
+from fakes import TextModel, text_message
+
+from agent_runtime import HedgedModel
+
+
+class SlowThenFast(TextModel):
+    """Answers each call after the next of ``delays`` seconds, with the call's number."""
+
+    def __init__(self, *delays: float) -> None:
+        super().__init__()
+        self.delays = list(delays)
+        self.cancelled: list[int] = []
+
+    async def get_response(self, *args, **kwargs) -> ModelResponse:
+        self.calls += 1
+        call = self.calls
+        try:
+            await asyncio.sleep(self.delays[call - 1])
+        except asyncio.CancelledError:
+            self.cancelled.append(call)
+            raise
+        return ModelResponse(output=[text_message(f"call {call}")], usage=Usage(), response_id=None)
+
+
+def ask(model: HedgedModel) -> str:
+    response = asyncio.run(model.get_response())
+    return response.output[0].content[0].text
+
+
+def test_duplicate_wins_and_the_slow_attempt_is_cancelled():
+    inner = SlowThenFast(1.0, 0.01)
+    model = HedgedModel(inner, delay=0.05)
+    assert ask(model) == "call 2"
+    assert inner.cancelled == [1]
+    assert (model.stats.hedged, model.stats.hedge_wins) == (1, 1)
+
+
+def test_fast_response_is_not_hedged():
+    inner = SlowThenFast(0.0)
+    model = HedgedModel(inner, delay=0.05)
+    assert ask(model) == "call 1"
+    assert inner.calls == 1 and model.stats.hedged == 0
+
+
+def test_max_extra_caps_duplicates():
+    # One duplicate of burst budget and none accruing: the second slow request just waits.
+    inner = SlowThenFast(0.5, 0.01, 0.1)
+    model = HedgedModel(inner, delay=0.05, max_extra=0.0, burst=1.0)
+    assert ask(model) == "call 2"
+    assert ask(model) == "call 3"
+    assert inner.calls == 3
+    assert (model.stats.hedged, model.stats.over_budget) == (1, 1)
+
+
+def test_streams_race_on_the_first_event():
+    inner = SlowThenFast(1.0, 0.01)
+    model = HedgedModel(inner, delay=0.05)
+
+    async def main() -> list[str]:
+        return [event.response.output[0].content[0].text async for event in model.stream_response()]
+
+    assert asyncio.run(main()) == ["call 2"]
+    assert inner.cancelled == [1]
+
+
+def test_adaptive_delay_follows_the_quantile():
+    model = HedgedModel(TextModel(), quantile=0.5, min_samples=4, initial_delay=2.0, min_delay=0.0)
+    assert model.delay == 2.0
+    model._samples.extend([0.1, 0.2, 0.3, 0.4])
+    assert model.delay == 0.2
@@ -0,0 +1,73 @@
+import asyncio
+
+from agent_runtime import HistoryManager
+from agent_runtime.history import PER_CALL_KEPT
+
+
+def message(role: str, text: str) -> dict:
+    return {"role": role, "content": text}
+
+
+def call(call_id: str) -> dict:
+    return {"type": "function_call", "call_id": call_id, "name": "lookup", "arguments": "{}"}
+
+
+def output(call_id: str) -> dict:
+    return {"type": "function_call_output", "call_id": call_id, "output": "x" * 400}
+
+
+def assert_pairs_intact(items: list) -> None:
+    calls = {item["call_id"] for item in items if item.get("type") == "function_call"}
+    for item in items:
+        if item.get("type") == "function_call_output":
+            assert item["call_id"] in calls, f"output {item['call_id']} lost its call"
+
+
+def test_boundary_keeps_sequential_call_with_output():
+    items = [message("user", "hi"), call("a"), output("a"), message("assistant", "done")]
+    assert HistoryManager._safe_boundary(items, 2) == 1
+
+
+def test_boundary_keeps_parallel_calls_with_outputs():
+    items = [message("user", "hi"), call("a"), call("b"), output("a"), output("b"), message("assistant", "ok")]
+    # Between the calls and between the outputs both split a pair.
+    assert HistoryManager._safe_boundary(items, 2) == 1
+    assert HistoryManager._safe_boundary(items, 3) == 1
+    assert HistoryManager._safe_boundary(items, 4) == 1
+    assert HistoryManager._safe_boundary(items, 5) == 5
+
+
+def test_boundary_follows_outputs_pulled_into_the_recent_window():
+    items = [call("a"), call("b"), output("b"), call("c"), output("a"), output("c")]
+    # out_c pulls the boundary to call_c, which brings out_a (call at 0) along with it.
+    assert HistoryManager._safe_boundary(items, 5) == 0
+
+
+def test_summarized_history_never_orphans_parallel_outputs():
+    history = HistoryManager(max_tokens=50, keep_recent=3)
+    items = [message("user", "Question one. Details.")]
+    items += [message("assistant", "Answer one. More."), call("a"), call("b"), output("a"), output("b")]
+    compacted = asyncio.run(history.compact(items))
+    assert compacted[0]["content"].startswith("Summary of the earlier conversation:")
+    assert_pairs_intact(compacted)
+    assert history.stats.summaries == 1
+
+
+def test_summary_is_reused_and_extended_for_a_growing_conversation():
+    history = HistoryManager(max_tokens=40, keep_recent=2)
+    items = [message("user" if i % 2 else "assistant", f"Turn {i}. " + "words " * 20) for i in range(6)]
+    asyncio.run(history.compact(items))
+    # Fresh dicts with the same content, as the SDK builds them for each call.
+    grown = [dict(item) for item in items] + [message("user", "Turn 6. " + "words " * 20)]
+    asyncio.run(history.compact(grown))
+    assert history.stats.summary_cache_hits == 1
+    assert history.stats.summaries == 2
+    assert len(history._summaries) == 1  # the longer prefix replaced the one it extended
+
+
+def test_per_call_stats_are_capped():
+    history = HistoryManager()
+    for _ in range(PER_CALL_KEPT + 5):
+        asyncio.run(history.compact([message("user", "hi")]))
+    assert len(history.stats.per_call) == PER_CALL_KEPT
+    assert history.stats.calls == PER_CALL_KEPT + 5
@@ -0,0 +1,61 @@
+import asyncio
+import threading
+
+from agents import Agent, RunContextWrapper
+
+from agent_runtime import cached_instructions
+
+renders: list[str] = []
+started = threading.Event()
+context = RunContextWrapper(context=None)
+
+
+@cached_instructions
+def greeting(context: RunContextWrapper, agent: Agent) -> str:
+    renders.append(agent.name)
+    return f"You are {agent.name}."
+
+
+@cached_instructions(key=lambda context, agent: agent.name)
+async def slow_greeting(context: RunContextWrapper, agent: Agent) -> str:
+    renders.append(agent.name)
+    started.set()
+    await asyncio.sleep(0.1)
+    return f"You are {agent.name}."
+
+
+def test_sync_provider_is_rendered_once_per_key():
+    greeting.cache_clear()
+    renders.clear()
+    for name in ["Ada", "Ada", "Bob"]:
+        assert greeting(context, Agent(name=name)) == f"You are {name}."
+    assert renders == ["Ada", "Bob"]
+    assert greeting.cache_info()[:2] == (1, 2)
+
+
+def test_concurrent_misses_share_one_call():
+    slow_greeting.cache_clear()
+    renders.clear()
+
+    async def main() -> list[str]:
+        agent = Agent(name="Ada")
+        return await asyncio.gather(slow_greeting(context, agent), slow_greeting(context, agent))
+
+    assert asyncio.run(main()) == ["You are Ada."] * 2
+    assert renders == ["Ada"]
+
+
+def test_concurrent_misses_on_another_loop():
+    slow_greeting.cache_clear()
+    started.clear()
+    results: list[str] = []
+
+    def render() -> str:
+        return asyncio.run(slow_greeting(context, Agent(name="Bob")))
+
+    thread = threading.Thread(target=lambda: results.append(render()))
+    thread.start()
+    started.wait()
+    results.append(render())
+    thread.join()
+    assert results == ["You are Bob."] * 2
@@ -0,0 +1,97 @@
+import json
+import os
+import sys
+
+import pytest
+
+from agent_runtime import launcher
+
+SCRIPT = """\
+import json, os, sys
+from pathlib import Path
+Path(__file__).with_name("ran.json").write_text(json.dumps([__name__, sys.argv[1:], os.environ.get("LESSON_KEY")]))
+"""
+
+
+@pytest.fixture
+def root(tmp_path, monkeypatch):
+    for lesson, package, scripts in [
+        ("01_hello_agent", "hello_agent", ["main", "_helpers"]),
+        ("11_advanced_tool", "11_advanced_tool", ["part1", "part2"]),
+        ("12_agent_runtime", "agent_runtime", ["main"]),
+    ]:
+        package_dir = tmp_path / lesson / "src" / package
+        package_dir.mkdir(parents=True)
+        for script in scripts:
+            (package_dir / f"{script}.py").write_text(SCRIPT)
+    (tmp_path / "02_no_sources").mkdir()
+    (tmp_path / "notes").mkdir()
+    (tmp_path / "01_hello_agent" / ".env").write_text("LESSON_KEY=from-dotenv\n")
+    monkeypatch.delenv("AGENT_LESSONS_ROOT", raising=False)
+    monkeypatch.delenv("DOTENV_PATH", raising=False)
+    monkeypatch.delenv("LESSON_KEY", raising=False)
+    monkeypatch.setattr(sys, "argv", list(sys.argv))
+    monkeypatch.setattr(sys, "path", list(sys.path))
+    return tmp_path
+
+
+def test_root_from_the_environment_or_a_parent_directory(root, monkeypatch):
+    monkeypatch.chdir(root / "11_advanced_tool" / "src")
+    assert launcher.lessons_root() == root
+    monkeypatch.setenv("AGENT_LESSONS_ROOT", str(root / "elsewhere"))
+    assert launcher.lessons_root() == root / "elsewhere"
+
+
+def test_find_lessons_skips_the_runtime_and_non_lessons(root):
+    assert [lesson.name for lesson in launcher.find_lessons(root)] == ["01_hello_agent", "11_advanced_tool"]
+
+
+@pytest.mark.parametrize("key", ["01_hello_agent", "hello-agent", "hello_agent", "01", "1"])
+def test_lesson_keys(root, key):
+    assert launcher.find_lesson(key, root).name == "01_hello_agent"
+
+
+def test_unknown_lesson(root):
+    with pytest.raises(LookupError, match="No lesson 'goodbye'"):
+        launcher.find_lesson("goodbye", root)
+
+
+def test_script_defaults_to_main_or_must_be_named(root):
+    hello = launcher.find_lesson("1", root)
+    assert list(hello.scripts()) == ["main"]
+    assert hello.script().name == "main.py"
+
+    advanced = launcher.find_lesson("advanced-tool", root)
+    assert advanced.script("PART2").name == "part2.py"
+    with pytest.raises(LookupError, match="several scripts"):
+        advanced.script()
+    with pytest.raises(LookupError, match="no script 'part3'"):
+        advanced.script("part3")
+
+
+def ran(root, lesson):
+    ran_file = next((root / lesson).glob("src/*/ran.json"))
+    return json.loads(ran_file.read_text())
+
+
+def test_main_runs_the_script_with_its_env_and_args(root, monkeypatch):
+    monkeypatch.setenv("AGENT_LESSONS_ROOT", str(root))
+    launcher.main(["hello-agent", "main", "--verbose"])
+    loaded = os.environ.pop("LESSON_KEY", None)
+    assert ran(root, "01_hello_agent") == ["__main__", ["--verbose"], "from-dotenv"]
+    assert loaded == "from-dotenv"
+
+
+def test_console_script_implies_the_lesson(root, monkeypatch):
+    monkeypatch.setenv("AGENT_LESSONS_ROOT", str(root))
+    monkeypatch.setattr(sys, "argv", ["/venv/bin/advanced-tool", "part1", "x"])
+    launcher.main()
+    assert ran(root, "11_advanced_tool") == ["__main__", ["x"], None]
+
+
+def test_lookup_errors_exit_with_usage(root, monkeypatch, capsys):
+    monkeypatch.setenv("AGENT_LESSONS_ROOT", str(root))
+    with pytest.raises(SystemExit) as exit:
+        launcher.main(["advanced_tool"])
+    assert exit.value.code == 2
+    assert "several scripts" in capsys.readouterr().err
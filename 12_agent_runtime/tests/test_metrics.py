@@ -0,0 +1,67 @@
+import asyncio
+import gc
+
+from agents import Agent, Runner, function_tool
+from fakes import CallingModel, FailingModel, TextModel
+
+from agent_runtime import MetricsHooks, MetricsRegistry
+
+
+def run(agent: Agent, hooks: MetricsHooks) -> bool:
+    async def main() -> bool:
+        try:
+            await Runner.run(agent, "hello", hooks=hooks)
+        except RuntimeError:
+            return False
+        return True
+
+    return asyncio.run(main())
+
+
+def test_records_model_calls_and_runs():
+    registry = MetricsRegistry()
+    hooks = MetricsHooks(registry)
+    assert run(Agent(name="Ok", model=TextModel(tokens=7)), hooks)
+
+    data = registry.to_prometheus()
+    assert 'agent_model_calls_total{agent="Ok"} 1' in data
+    assert 'agent_run_latency_seconds_count{agent="Ok"} 1' in data
+    assert not len(hooks._states) and not hooks._llm_inputs
+
+
+def test_failed_run_leaves_no_state():
+    registry = MetricsRegistry()
+    hooks = MetricsHooks(registry)
+    assert not run(Agent(name="Broken", model=FailingModel(RuntimeError("boom"))), hooks)
+    gc.collect()
+    assert not len(hooks._states) and not hooks._llm_inputs
+
+    # The next run is timed from its own start, not from the failed one's.
+    assert run(Agent(name="Ok", model=TextModel()), hooks)
+    assert registry.histogram("run_latency_seconds", agent="Ok").count == 1
+    assert registry.histogram("run_latency_seconds", agent="Broken").count == 0
+
+
+@function_tool
+async def slow() -> str:
+    """Takes a while."""
+    await asyncio.sleep(0.2)
+    return "slow"
+
+
+@function_tool
+async def fast() -> str:
+    """Answers at once."""
+    return "fast"
+
+
+def test_concurrent_tool_calls_are_timed_separately():
+    registry = MetricsRegistry()
+    hooks = MetricsHooks(registry)
+    model = CallingModel(["slow", "fast"])
+    assert run(Agent(name="Tools", tools=[slow, fast], model=model), hooks)
+
+    slow_hist = registry.histogram("tool_latency_seconds", agent="Tools", tool="slow")
+    fast_hist = registry.histogram("tool_latency_seconds", agent="Tools", tool="fast")
+    assert slow_hist.count == 1 and fast_hist.count == 1
+    assert slow_hist.sum >= 0.2 > fast_hist.sum
@@ -0,0 +1,107 @@
+import asyncio
+import random
+import statistics
+import time
+
+import openai
+import pytest
+from openai import AsyncOpenAI
+
+from agent_runtime.mock_server import MockServer, Rule, parse_latency
+
+
+def samples(spec, n=2000, seed=0):
+    rng = random.Random(seed)
+    model = parse_latency(spec)
+    return [model(rng) for _ in range(n)]
+
+
+def test_fixed_and_uniform_latency():
+    assert set(samples("fixed:0.25", n=10)) == {0.25}
+    assert set(samples("fixed", n=10)) == {0.0}
+    values = samples("uniform:0.1,0.3")
+    assert min(values) >= 0.1 and max(values) <= 0.3
+
+
+def test_lognormal_latency_is_centred_on_the_median():
+    assert statistics.median(samples("lognormal:0.4,0.5")) == pytest.approx(0.4, rel=0.1)
+
+
+def test_heavytail_latency_hits_the_tail_with_probability_p():
+    median = 0.2
+    values = samples(f"heavytail:{median},1.5,0.1")
+    tail = sum(v >= 4 * median for v in values) / len(values)
+    assert 0.07 <= tail <= 0.13
+    assert statistics.median(values) == pytest.approx(median, rel=0.2)
+
+
+def test_seeded_latency_is_reproducible():
+    assert samples("heavytail:0.2,1.5,0.1", seed=3) == samples("heavytail:0.2,1.5,0.1", seed=3)
+
+
+def test_unknown_latency_model():
+    with pytest.raises(ValueError, match="Unknown latency model"):
+        parse_latency("gaussian:1,2")
+
+
+async def complete(client, text, **kwargs):
+    start = time.perf_counter()
+    response = await client.chat.completions.create(
+        model="gemini-2.5-flash", messages=[{"role": "user", "content": text}], **kwargs
+    )
+    return response, time.perf_counter() - start
+
+
+def test_server_waits_for_the_sampled_latency():
+    async def main():
+        rules = [Rule.from_dict({"match": "slow", "content": "late", "latency": "fixed:0.3"})]
+        async with MockServer(rules, latency="fixed:0.1") as server:
+            async with AsyncOpenAI(base_url=server.base_url, api_key="mock", max_retries=0) as client:
+                await complete(client, "warm up")
+                return await complete(client, "hello"), await complete(client, "be slow")
+
+    (fast, fast_elapsed), (slow, slow_elapsed) = asyncio.run(main())
+    assert fast.choices[0].message.content == "Mock reply to: hello"
+    assert 0.1 <= fast_elapsed < 0.3
+    assert slow.choices[0].message.content == "late"
+    assert slow_elapsed >= 0.3
+
+
+def test_streaming_adds_the_token_delay_per_chunk():
+    async def main():
+        rules = [Rule.from_dict({"content": "one two three four five"})]
+        async with MockServer(rules, latency="fixed:0.05", token_delay=0.05) as server:
+            async with AsyncOpenAI(base_url=server.base_url, api_key="mock", max_retries=0) as client:
+                start = time.perf_counter()
+                stream = await client.chat.completions.create(
+                    model="gemini-2.5-flash", messages=[{"role": "user", "content": "hi"}], stream=True
+                )
+                arrivals, text = [], ""
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        arrivals.append(time.perf_counter() - start)
+                        text += chunk.choices[0].delta.content
+        return arrivals, text
+
+    arrivals, text = asyncio.run(main())
+    assert text == "one two three four five"
+    assert arrivals[0] >= 0.05
+    assert arrivals[-1] >= 0.05 + 4 * 0.05
+
+
+def test_error_rate_and_scripted_errors():
+    async def main():
+        async with MockServer(error_rate=1.0, seed=1) as server:
+            async with AsyncOpenAI(base_url=server.base_url, api_key="mock", max_retries=0) as client:
+                with pytest.raises(openai.RateLimitError) as throttled:
+                    await complete(client, "hello")
+        async with MockServer([Rule.from_dict({"match": "fail", "error": 503})]) as server:
+            async with AsyncOpenAI(base_url=server.base_url, api_key="mock", max_retries=0) as client:
+                with pytest.raises(openai.InternalServerError):
+                    await complete(client, "please fail")
+                await complete(client, "succeed")
+            return throttled.value, server.statuses
+
+    throttled, statuses = asyncio.run(main())
+    assert throttled.response.headers["retry-after"] == "1"
+    assert statuses == {503: 1, 200: 1}
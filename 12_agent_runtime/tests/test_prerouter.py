@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+from agents import Agent
+from fakes import FailingModel, TextModel
+
+from agent_runtime import PreRouter, Route
+from agent_runtime import prerouter as prerouter_module
+
+fitness = Agent(name="Fitness Coach", model=TextModel("Start with easy runs."))
+study = Agent(name="Study Coach", model=TextModel("Make a study plan."))
+router = Agent(name="Router", model=FailingModel(RuntimeError("the router was called")))
+ROUTES = [
+    Route(fitness, keywords=["run", "workout", "stamina"], examples=["train for a 5k race", "build endurance"]),
+    Route(study, keywords=["exam", "study plan", "focus", "notes"], examples=["prepare for my finals"]),
+]
+
+
+def test_single_route_keyword_skips_the_router():
+    decision = PreRouter(router, ROUTES).classify("I want to run a 5Km in 8 weeks")
+    assert (decision.route, decision.rule, decision.confidence) == ("Fitness Coach", "keyword", 1.0)
+
+
+def test_keywords_of_several_routes_fall_back():
+    decision = PreRouter(router, ROUTES).classify("help me focus on my workout")
+    assert decision.agent is router and decision.rule == "fallback"
+
+
+def test_tfidf_threshold_and_margin():
+    text = "how do I build endurance"
+    decision = PreRouter(router, ROUTES).classify(text)
+    assert (decision.route, decision.rule) == ("Fitness Coach", "tfidf")
+    assert 0.2 <= decision.confidence < 1.0
+
+    assert PreRouter(router, ROUTES, threshold=decision.confidence + 0.01).classify(text).route is None
+    assert PreRouter(router, ROUTES, margin=decision.confidence + 0.01).classify(text).route is None
+    assert PreRouter(router, ROUTES).classify("tell me a joke").rule == "fallback"
+
+
+def test_stats_count_skips_and_fallbacks():
+    pre_router = PreRouter(router, ROUTES)
+    pre_router.classify_many(["study for my exam", "tell me a joke", [{"role": "user", "content": "go for a run"}]])
+    stats = pre_router.stats
+    assert (stats.decisions, stats.skipped, stats.fallbacks) == (3, 2, 1)
+    assert stats.by_route == {"Study Coach": 1, "Fitness Coach": 1}
+
+
+def test_run_starts_with_the_specialist():
+    result = asyncio.run(PreRouter(router, ROUTES).run("I need more stamina"))
+    assert result.final_output == "Start with easy runs."
+    assert result.last_agent is fitness
+
+
+def test_numpy_and_plain_scores_agree(monkeypatch):
+    pytest.importorskip("numpy")
+    texts = ["how do I build endurance", "prepare for finals", "tell me a joke"]
+    pre_router = PreRouter(router, ROUTES)
+    vectorized = pre_router.scores(texts)
+    monkeypatch.setattr(prerouter_module, "np", None)
+    for row, expected in zip(vectorized, pre_router.scores(texts)):
+        assert row == pytest.approx(expected)
@@ -0,0 +1,45 @@
+import pytest
+from agents import Agent, function_tool
+from agents.handoffs import handoff
+
+from agent_runtime import HandoffRegistry, ToolRegistry
+from agent_runtime.registry import compiled_tools
+
+
+@function_tool
+def add(a: int, b: int) -> int:
+    """Add two numbers."""
+    return a + b
+
+
+@function_tool
+def echo(text: str) -> str:
+    """Echo the text."""
+    return text
+
+
+def test_registry_is_copy_on_write():
+    tools = ToolRegistry([add, echo])
+    smaller = tools.drop("echo")
+    assert [t.name for t in tools] == ["add", "echo"]
+    assert [t.name for t in smaller] == ["add"]
+    assert smaller.version != tools.version
+    with pytest.raises(TypeError):
+        tools.append(add)
+    with pytest.raises(ValueError):
+        tools.add(add)
+
+
+def test_clones_share_the_compiled_fragment():
+    billing = Agent(name="Billing")
+    base = Agent(name="Base", tools=ToolRegistry([add]), handoffs=HandoffRegistry([billing]))
+    tenant = base.clone(name="Tenant")
+    assert tenant.tools is base.tools
+
+    handoffs = list(base.handoffs)
+    fragment = compiled_tools(list(tenant.tools), handoffs)
+    assert [param["function"]["name"] for param in fragment] == ["add", handoff(billing).tool_name]
+    assert compiled_tools(list(base.tools), handoffs) is fragment
+    # A tool that was never in a registry has no compiled schema.
+    unregistered = function_tool(lambda text: text, name_override="unregistered")
+    assert compiled_tools([unregistered], []) is None
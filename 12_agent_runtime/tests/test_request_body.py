@@ -0,0 +1,126 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from agents import Agent, ModelSettings, ModelTracing, function_tool, handoff
+from openai import AsyncOpenAI
+
+from agent_runtime import BodyEncoder, PooledChatCompletionsModel, ToolRegistry
+from agent_runtime import client as client_module
+
+COMPLETION = {
+    "id": "chatcmpl-1",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gemini-test",
+    "choices": [{"index": 0, "message": {"role": "assistant", "content": "ok"}, "finish_reason": "stop"}],
+    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+}
+
+
+@function_tool
+def multiply(a: int, b: int) -> int:
+    """Multiply two numbers."""
+    return a * b
+
+
+@function_tool
+def divide(a: int, b: int) -> float:
+    """Divide two numbers."""
+    return a / b
+
+
+billing = Agent(name="Billing", handoff_description="Refunds and invoices")
+
+HISTORY = [
+    {"role": "user", "content": "What is 6 * 7? Then divide by 2 — ünïcode too."},
+    {
+        "type": "reasoning",
+        "id": "rs_1",
+        "summary": [{"type": "summary_text", "text": "Multiply first."}],
+    },
+    {"type": "function_call", "call_id": "call_1", "id": "call_1", "name": "multiply", "arguments": '{"a": 6, "b": 7}'},
+    {"type": "function_call", "call_id": "call_2", "id": "call_2", "name": "divide", "arguments": '{"a": 42, "b": 2}'},
+    {"type": "function_call_output", "call_id": "call_1", "output": "42"},
+    {"type": "function_call_output", "call_id": "call_2", "output": "21.0"},
+    {
+        "type": "message",
+        "role": "assistant",
+        "id": "msg_1",
+        "status": "completed",
+        "content": [{"type": "output_text", "text": "It is 42, and 21 halved.", "annotations": []}],
+    },
+    {"role": "user", "content": "Now refund my last invoice."},
+]
+
+CASES = {
+    "string input": dict(input="Hello there"),
+    "tool calls": dict(input=HISTORY[:6], tools=[multiply, divide]),
+    "handoffs": dict(input=HISTORY, tools=[multiply], handoffs=[handoff(billing)]),
+    "registry tools": dict(input=HISTORY, tools=list(ToolRegistry([multiply, divide]))),
+    "settings": dict(
+        input=HISTORY,
+        tools=[multiply],
+        settings=ModelSettings(temperature=0.2, parallel_tool_calls=True, extra_body={"seed": 7}),
+    ),
+}
+
+
+def request_bodies(monkeypatch, body_encoder, calls) -> list[bytes]:
+    bodies: list[bytes] = []
+
+    def reply(request: httpx.Request) -> httpx.Response:
+        bodies.append(request.content)
+        return httpx.Response(200, json=COMPLETION)
+
+    openai_client = AsyncOpenAI(
+        api_key="test",
+        base_url="http://mock.test/v1/",
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(reply)),
+    )
+    monkeypatch.setattr(client_module, "get_client", lambda settings=None: openai_client)
+    model = PooledChatCompletionsModel("gemini-test", body_encoder=body_encoder)
+
+    async def main() -> None:
+        for case in calls:
+            await model.get_response(
+                "You are a helpful assistant.",
+                case["input"],
+                case.get("settings", ModelSettings()),
+                case.get("tools", []),
+                None,
+                case.get("handoffs", []),
+                ModelTracing.DISABLED,
+                previous_response_id=None,
+                conversation_id=None,
+                prompt=None,
+            )
+
+    asyncio.run(main())
+    return bodies
+
+
+@pytest.mark.parametrize("case", CASES.values(), ids=CASES.keys())
+def test_encoded_body_is_the_sdk_body(monkeypatch, case):
+    (sdk,) = request_bodies(monkeypatch, None, [case])
+    (encoded,) = request_bodies(monkeypatch, BodyEncoder(), [case])
+    assert encoded == sdk
+    assert json.loads(encoded)["messages"][0] == {"content": "You are a helpful assistant.", "role": "system"}
+
+
+def test_growing_history_reuses_segments_and_keeps_the_bytes(monkeypatch):
+    turns = [
+        dict(input=HISTORY[:n], tools=[multiply, divide], handoffs=[handoff(billing)])
+        for n in (1, 4, 6, 8)
+    ]
+    # Earlier items arrive as fresh but equal dicts on every turn, as the SDK rebuilds them.
+    turns = [dict(turn, input=[dict(item) for item in turn["input"]]) for turn in turns]
+    encoder = BodyEncoder()
+    assert request_bodies(monkeypatch, encoder, turns) == request_bodies(monkeypatch, None, turns)
+    assert encoder.reused > 0
+
+
+def test_fast_path_is_opt_in():
+    assert PooledChatCompletionsModel("gemini-test").body_encoder is None
+    assert not client_module.ClientSettings().encode_bodies
@@ -0,0 +1,145 @@
+import asyncio
+import gc
+
+from agents import ModelBehaviorError, function_tool
+from agents.tool_context import ToolContext
+
+from agent_runtime import CircuitBreaker, MetricsRegistry, ToolResilience
+from agent_runtime.resilience import CLOSED, HALF_OPEN, OPEN, RETRYABLE_ERRORS, ToolFailure
+
+calls: list[str] = []
+
+
+@function_tool(failure_error_function=None)
+def timing_out(city: str) -> str:
+    """Always times out."""
+    calls.append("timing_out")
+    raise TimeoutError("slow")
+
+
+@function_tool(failure_error_function=None)
+def bad_arguments(city: str) -> str:
+    """Fails the way a bad model call does."""
+    calls.append("bad_arguments")
+    raise ModelBehaviorError("bad arguments")
+
+
+@function_tool
+def default_errors(city: str) -> str:
+    """Fails, but keeps the SDK's default error message."""
+    calls.append("default_errors")
+    raise RuntimeError("bug")
+
+
+@function_tool(failure_error_function=None)
+def backup(city: str) -> str:
+    """Backup service."""
+    calls.append("backup")
+    return f"sunny in {city}"
+
+
+@function_tool(failure_error_function=None)
+async def hanging(city: str) -> str:
+    """Never answers."""
+    await asyncio.sleep(60)
+    return "late"
+
+
+def call(tool, args: str = '{"city": "Lahore"}'):
+    context = ToolContext(context=None, tool_name=tool.name, tool_call_id="1", tool_arguments=args)
+    return tool.on_invoke_tool(context, args)
+
+
+def test_breaker_opens_probes_and_closes():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.0)
+    breaker.record_failure()
+    assert breaker.state == CLOSED and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    assert breaker.allow()  # the timeout has passed: one probe
+    assert breaker.state == HALF_OPEN and not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.failures == 0
+
+
+def test_open_breaker_fails_fast_until_timeout():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60.0)
+    breaker.record_failure()
+    assert not breaker.allow() and breaker.state == OPEN
+
+
+def test_cancelled_probe_frees_the_breaker():
+    resilience = ToolResilience(registry=MetricsRegistry(), failure_threshold=1, reset_timeout=0.0)
+    tool = resilience.wrap(hanging)
+    breaker = resilience.breakers["hanging"]
+    breaker.record_failure()
+
+    async def cancel_probe() -> None:
+        task = asyncio.ensure_future(call(tool))
+        await asyncio.sleep(0.01)
+        assert breaker.state == HALF_OPEN
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(cancel_probe())
+    assert breaker.allow()  # a stuck probe flag would reject every later call
+
+
+def test_timeouts_are_retried_then_fall_back():
+    resilience = ToolResilience(registry=MetricsRegistry(), retries=2, backoff=0.0)
+    tool = resilience.wrap(timing_out, fallbacks=[backup])
+    calls.clear()
+    assert asyncio.run(call(tool)) == "sunny in Lahore"
+    assert calls == ["timing_out"] * 3 + ["backup"]
+    assert resilience.breakers["timing_out"].failures == 1  # one call, one breaker failure
+
+
+def test_retried_call_counts_once_toward_the_breaker():
+    resilience = ToolResilience(registry=MetricsRegistry(), retries=2, backoff=0.0, failure_threshold=3)
+    tool = resilience.wrap(timing_out)
+    for expected in (CLOSED, CLOSED, OPEN):
+        asyncio.run(call(tool))
+        assert resilience.breakers["timing_out"].state == expected
+
+
+def test_sdk_error_messages_are_retried_only_on_request():
+    resilience = ToolResilience(registry=MetricsRegistry(), retries=2, backoff=0.0)
+    tool = resilience.wrap(default_errors)
+    calls.clear()
+    assert asyncio.run(call(tool)).startswith("An error occurred")
+    assert calls == ["default_errors"]
+    assert resilience.breakers["default_errors"].failures == 0
+
+    resilience = ToolResilience(
+        registry=MetricsRegistry(), retries=2, backoff=0.0, retry_on=(*RETRYABLE_ERRORS, ToolFailure)
+    )
+    tool = resilience.wrap(default_errors)
+    calls.clear()
+    asyncio.run(call(tool))
+    assert calls == ["default_errors"] * 3
+
+
+def test_model_errors_are_not_retried_or_counted():
+    resilience = ToolResilience(registry=MetricsRegistry(), retries=2, backoff=0.0)
+    tool = resilience.wrap(bad_arguments, fallbacks=[backup])
+    calls.clear()
+    assert asyncio.run(call(tool)) == "sunny in Lahore"
+    assert calls == ["bad_arguments", "backup"]
+    assert resilience.breakers["bad_arguments"].failures == 0
+
+
+def test_collector_is_unregistered():
+    registry = MetricsRegistry()
+    resilience = ToolResilience(registry=registry)
+    resilience.close()
+    assert not registry._collectors
+
+    ToolResilience(registry=registry)
+    gc.collect()
+    registry.to_prometheus()
+    assert not registry._collectors
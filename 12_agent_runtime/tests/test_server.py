@@ -0,0 +1,76 @@
+import asyncio
+import json
+
+import pytest
+from agents import Agent, RunConfig
+from fakes import FailingModel, TextModel
+
+from agent_runtime import AgentServer
+
+
+async def exchange(server: AgentServer, raw: bytes) -> tuple[str, bytes, bool]:
+    """Send ``raw``; return the status line, the rest of the response and whether it closed."""
+    reader, writer = await asyncio.open_connection(server.host, server.port)
+    writer.write(raw)
+    await writer.drain()
+    try:
+        data = await asyncio.wait_for(reader.read(), timeout=5)  # until the server closes
+        closed = True
+    except TimeoutError:
+        data, closed = b"", False
+    writer.close()
+    status, _, rest = data.partition(b"\r\n")
+    return status.decode(), rest, closed
+
+
+def serve(raw: bytes) -> tuple[str, bytes, bool]:
+    async def main() -> tuple[str, bytes, bool]:
+        agents = {
+            "echo": Agent(name="Echo", model=TextModel("hi")),
+            "broken": Agent(name="Broken", model=FailingModel(RuntimeError("key sk-secret in /etc/app"))),
+        }
+        async with AgentServer(agents, port=0, run_config=RunConfig(), warmup=False) as server:
+            return await exchange(server, raw)
+
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        b"GARBAGE\r\n\r\n",
+        b"POST /agents/echo HTTP/1.1\r\ncontent-length: ten\r\n\r\n",
+        b"POST /agents/echo HTTP/1.1\r\ncontent-length: -1\r\n\r\n",
+    ],
+)
+def test_malformed_request_gets_400_and_closes(raw):
+    status, rest, closed = serve(raw)
+    assert status == "HTTP/1.1 400 Bad Request"
+    assert b"connection: close" in rest
+    assert closed
+
+
+def test_well_formed_request_runs():
+    body = json.dumps({"input": "hello"}).encode()
+    raw = (
+        b"POST /agents/echo HTTP/1.1\r\nconnection: close\r\n"
+        + f"content-length: {len(body)}\r\n\r\n".encode()
+        + body
+    )
+    status, rest, _ = serve(raw)
+    assert status == "HTTP/1.1 200 OK"
+    assert b'"hi"' in rest
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_failed_run_hides_the_exception(stream):
+    body = json.dumps({"input": "hello", "stream": stream}).encode()
+    raw = (
+        b"POST /agents/broken HTTP/1.1\r\nconnection: close\r\n"
+        + f"content-length: {len(body)}\r\n\r\n".encode()
+        + body
+    )
+    status, rest, _ = serve(raw)
+    assert status == ("HTTP/1.1 200 OK" if stream else "HTTP/1.1 500 Internal Server Error")
+    assert b"server_error" in rest
+    assert b"secret" not in rest and b"RuntimeError" not in rest
@@ -0,0 +1,68 @@
+import asyncio
+import threading
+
+from agents import function_tool
+from agents.tool_context import ToolContext
+
+from agent_runtime import ToolCache
+
+calls: list[int] = []
+started = threading.Event()
+
+
+@function_tool(failure_error_function=None)
+async def square(n: int) -> int:
+    """Square a number, slowly."""
+    calls.append(n)
+    started.set()
+    await asyncio.sleep(0.1)
+    if n < 0:
+        raise ValueError("negative")
+    return n * n
+
+
+def call(tool, args: str):
+    context = ToolContext(context=None, tool_name=tool.name, tool_call_id="1", tool_arguments=args)
+    return tool.on_invoke_tool(context, args)
+
+
+def test_hits_and_coalesced_calls():
+    cache = ToolCache()
+    tool = cache.wrap(square)
+    calls.clear()
+
+    async def main() -> list[int]:
+        return await asyncio.gather(call(tool, '{"n": 3}'), call(tool, '{ "n" : 3 }'))
+
+    assert asyncio.run(main()) == [9, 9]
+    assert asyncio.run(call(tool, '{"n":3}')) == 9
+    assert calls == [3]
+    stats = cache.stats["square"]
+    assert (stats.misses, stats.coalesced, stats.hits) == (1, 1, 1)
+
+
+def test_failures_are_not_cached():
+    cache = ToolCache()
+    tool = cache.wrap(square)
+    calls.clear()
+    for _ in range(2):
+        try:
+            asyncio.run(call(tool, '{"n": -1}'))
+        except ValueError:
+            pass
+    assert calls == [-1, -1]
+
+
+def test_identical_calls_on_another_loop():
+    # Tools run on pool threads with their own loops: an in-flight call there must not be
+    # awaited from here.
+    cache = ToolCache()
+    tool = cache.wrap(square)
+    started.clear()
+    results: list[int] = []
+    thread = threading.Thread(target=lambda: results.append(asyncio.run(call(tool, '{"n": 4}'))))
+    thread.start()
+    started.wait()
+    results.append(asyncio.run(call(tool, '{"n": 4}')))
+    thread.join()
+    assert results == [16, 16]
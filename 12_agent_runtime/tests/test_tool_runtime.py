@@ -0,0 +1,86 @@
+import asyncio
+import threading
+
+from agents import Agent, function_tool
+from agents.tool_context import ToolContext
+
+from agent_runtime import ToolRuntime
+
+loops: list[int] = []
+threads: list[int] = []
+
+
+@function_tool
+async def where() -> str:
+    """Record the loop and thread the tool ran on."""
+    loops.append(id(asyncio.get_running_loop()))
+    threads.append(threading.get_ident())
+    return "ok"
+
+
+@function_tool
+def blocking() -> str:
+    """A sync tool, run on the pool."""
+    threads.append(threading.get_ident())
+    return "ok"
+
+
+@function_tool
+async def slow() -> str:
+    """Hold the concurrency slot for a moment."""
+    await asyncio.sleep(0.01)
+    return "ok"
+
+
+def call(tool, args: str = "{}"):
+    context = ToolContext(context=None, tool_name=tool.name, tool_call_id="1", tool_arguments=args)
+    return tool.on_invoke_tool(context, args)
+
+
+def test_concurrency_limit_works_on_every_loop():
+    runtime = ToolRuntime(max_workers=2)
+    tool = runtime.wrap(slow, offload=False, max_concurrency=1)
+
+    async def burst() -> list[str]:
+        return await asyncio.gather(*(call(tool) for _ in range(3)))
+
+    try:
+        # A semaphore bound to the first loop would fail on the second one.
+        assert asyncio.run(burst()) == ["ok"] * 3
+        assert asyncio.run(burst()) == ["ok"] * 3
+    finally:
+        runtime.shutdown()
+
+
+def test_offloaded_async_tool_reuses_the_thread_loop():
+    runtime = ToolRuntime(max_workers=1)
+    tool = runtime.wrap(where, offload=True)
+    loops.clear()
+    threads.clear()
+
+    async def twice() -> None:
+        await call(tool)
+        await call(tool)
+
+    try:
+        asyncio.run(twice())
+    finally:
+        runtime.shutdown()
+    assert len(set(threads)) == 1 and threads[0] != threading.get_ident()
+    assert len(set(loops)) == 1
+
+
+def test_wrapping_twice_goes_through_the_runtime_once():
+    runtime = ToolRuntime(max_workers=2)
+    tool = runtime.wrap(runtime.wrap(blocking, timeout=5), timeout=10)
+    agent_tool = runtime.wrap_agent(Agent(name="Tools", tools=[tool]), timeout=1).tools[0]
+    threads.clear()
+    try:
+        assert asyncio.run(call(agent_tool)) == "ok"
+    finally:
+        runtime.shutdown()
+    stats = runtime.stats["blocking"]
+    assert (stats.calls, stats.offloaded) == (1, 1)
+    assert len(threads) == 1
+    assert agent_tool.on_invoke_tool.runtime_wrapping.timeout == 1
+    assert tool.on_invoke_tool.runtime_wrapping.timeout == 5